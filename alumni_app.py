@@ -1,22 +1,39 @@
 import datetime
+import os
+import shlex
+import tempfile
+import time
+import threading
+import uuid
+from pathlib import Path
 
 import pandas as pd
 import streamlit as st
 
+import panels
+import profiling
+import query_stats
+import snapshots
 from db import (
-    init_db,
-    get_alumni,
-    get_alumni_by_id,
-    get_degrees_for_alumni,
-    get_employment_for_alumni,
-    get_memberships_for_alumni,
-    get_contributions_for_alumni,
+    bootstrap,
+    engine,
+    alumni_names,
+    suggest_alumni,
+    get_alumni_page,
+    get_alumni_grad_years,
+    load_alumni_profile,
     get_summary_stats,
     get_employer_summary,
-    get_campaigns,
+    get_campaign_progress,
     get_all_contributions,
+    get_contribution_trend,
+    get_mailing_list_preview,
+    export_mailing_list,
+    get_query_cache_stats,
+    sync_table_versions,
     update_alumni_contact,
     create_contribution,
+    IdempotencyConflict,
 )
 
 # ---------------------------------------------------------
@@ -28,7 +45,20 @@ st.set_page_config(
     initial_sidebar_state="expanded",
 )
 
-init_db()
+# Schema migrations and demo seeding run once per process; reruns only
+# get the recorded startup timings back.
+DB_BOOTSTRAP = bootstrap()
+
+# Drop cached results (and the shared alumni frame) made stale by writes
+# from other processes, e.g. the importer; one small query per rerun.
+sync_table_versions()
+
+# Wall/DB/render timings for this rerun; slow reruns go to a rotating log.
+profiling.instrument(engine)
+PROFILER = profiling.RerunProfiler()
+
+# Statements recorded after this point belong to the current rerun.
+RERUN_QUERY_MARK = query_stats.mark()
 
 # ---------------------------------------------------------
 # DEMO USERS
@@ -49,6 +79,30 @@ VALID_USERS = {
     },
 }
 
+DIRECTORY_PAGE_SIZE = 50
+
+# Mailing list exports are written to one file per session, overwritten by
+# its next export. Streamlit has no session-end hook, so files older than
+# EXPORT_MAX_AGE seconds are swept whenever any session exports.
+EXPORT_DIR = Path(tempfile.gettempdir()) / "alumni_exports"
+EXPORT_MAX_AGE = 3600
+# st.download_button keeps the file in the server's memory while the button
+# is shown, so larger exports are not offered in the browser.
+EXPORT_DOWNLOAD_MAX_BYTES = int(os.environ.get("ALUMNI_EXPORT_DOWNLOAD_MB", "50")) * 1024 * 1024
+PROFILE_SUGGESTIONS = 25
+
+# Helpers return contribution dates as datetimes; show them as plain dates.
+DATE_COLUMNS = {"CONTRIBUTIONDATE": st.column_config.DateColumn(format="YYYY-MM-DD")}
+
+PROGRESS_COLUMNS = {
+    "GOALAMOUNT": st.column_config.NumberColumn("Goal", format="$%.0f"),
+    "RAISED": st.column_config.NumberColumn("Raised", format="$%.2f"),
+    "PERCENT_OF_GOAL": st.column_config.ProgressColumn(
+        "% of Goal", format="%.0f%%", min_value=0, max_value=100
+    ),
+    "LAST_GIFT_DATE": st.column_config.DateColumn("Last Gift", format="YYYY-MM-DD"),
+}
+
 # ---------------------------------------------------------
 # CUSTOM STYLING
 # ---------------------------------------------------------
@@ -357,6 +411,8 @@ if "username" not in st.session_state:
     st.session_state.username = ""
 if "alumni_id" not in st.session_state:
     st.session_state.alumni_id = None
+if "contribution_key" not in st.session_state:
+    st.session_state.contribution_key = uuid.uuid4().hex
 
 # ---------------------------------------------------------
 # HELPERS
@@ -384,9 +440,43 @@ def render_section_close():
     st.markdown("</div>", unsafe_allow_html=True)
 
 
-def alumni_name_from_df(df: pd.DataFrame, alumni_id: int) -> str:
-    row = df[df["ALUMNIID"] == alumni_id].iloc[0]
-    return f"{row['FIRSTNAME']} {row['LASTNAME']}"
+def or_na(value) -> str:
+    """``value`` for display, or "N/A" when it is missing or empty."""
+    return "N/A" if pd.isna(value) or value == "" else str(value)
+
+
+def yes_no(flag: bool) -> str:
+    return "Yes" if flag else "No"
+
+
+def session_export_path() -> Path:
+    """This session's mailing list export file, overwritten by each export."""
+    token = st.session_state.setdefault("export_token", uuid.uuid4().hex)
+    EXPORT_DIR.mkdir(parents=True, exist_ok=True)
+    return EXPORT_DIR / f"mailing_list_{token}.csv"
+
+
+def sweep_exports() -> None:
+    """Remove export files left behind by sessions that have ended."""
+    cutoff = time.time() - EXPORT_MAX_AGE
+    for path in EXPORT_DIR.glob("mailing_list_*.csv"):
+        try:
+            if path.stat().st_mtime < cutoff:
+                path.unlink()
+        except FileNotFoundError:
+            pass
+
+
+def export_command(filters: dict) -> str:
+    """The db.py command that writes the same mailing list to a file."""
+    command = "python db.py export-mailing-list --out mailing_list.csv"
+    if filters["major"]:
+        command += f" --major {shlex.quote(filters['major'])}"
+    if filters["grad_year"] is not None:
+        command += f" --grad-year {filters['grad_year']}"
+    if not filters["opted_in_only"]:
+        command += " --all"
+    return command
 
 
 def render_top_brand():
@@ -416,10 +506,10 @@ def render_alumni_summary(alum: pd.Series):
                 Howard University School of Business Alumni Profile
             </div>
             <span class="profile-chip">Email: {alum['PRIMARYEMAIL']}</span>
-            <span class="profile-chip">Phone: {alum['PHONE'] or 'N/A'}</span>
-            <span class="profile-chip">Major: {alum['GRAD_MAJOR'] or 'N/A'}</span>
-            <span class="profile-chip">Grad Year: {alum['ALUM_GRADYEAR'] or 'N/A'}</span>
-            <span class="profile-chip">Mailing List: {alum['MAILING_LIST']}</span>
+            <span class="profile-chip">Phone: {or_na(alum['PHONE'])}</span>
+            <span class="profile-chip">Major: {or_na(alum['GRAD_MAJOR'])}</span>
+            <span class="profile-chip">Grad Year: {or_na(alum['ALUM_GRADYEAR'])}</span>
+            <span class="profile-chip">Mailing List: {yes_no(alum['MAILING_LIST'])}</span>
         </div>
         """,
         unsafe_allow_html=True,
@@ -429,8 +519,10 @@ def render_alumni_summary(alum: pd.Series):
         st.markdown(f"[View LinkedIn Profile]({alum['LINKEDIN']})")
 
 
-def render_alumni_profile(alumni_id: int):
-    alum_df = get_alumni_by_id(alumni_id)
+def render_alumni_profile(alumni_id: int, profile: dict | None = None):
+    if profile is None:
+        profile = load_alumni_profile(alumni_id)
+    alum_df = profile["alumni"]
     if alum_df.empty:
         st.error("Alumni not found.")
         return
@@ -442,24 +534,24 @@ def render_alumni_profile(alumni_id: int):
         ["Overview", "Degrees", "Employment", "Memberships", "Contributions"]
     )
 
-    with tab_overview:
+    with tab_overview, PROFILER.section("Profile: Overview"):
         c1, c2 = st.columns(2)
         with c1:
             render_section_open("Contact Information")
             st.write(f"**Primary Email:** {alum['PRIMARYEMAIL']}")
-            st.write(f"**Phone:** {alum['PHONE'] or 'N/A'}")
-            st.write(f"**Mailing List Opt-In:** {alum['MAILING_LIST']}")
+            st.write(f"**Phone:** {or_na(alum['PHONE'])}")
+            st.write(f"**Mailing List Opt-In:** {yes_no(alum['MAILING_LIST'])}")
             render_section_close()
 
         with c2:
             render_section_open("Academic Snapshot")
-            st.write(f"**Major:** {alum['GRAD_MAJOR'] or 'N/A'}")
-            st.write(f"**Graduation Year:** {alum['ALUM_GRADYEAR'] or 'N/A'}")
+            st.write(f"**Major:** {or_na(alum['GRAD_MAJOR'])}")
+            st.write(f"**Graduation Year:** {or_na(alum['ALUM_GRADYEAR'])}")
             render_section_close()
 
-    with tab_degrees:
+    with tab_degrees, PROFILER.section("Profile: Degrees"):
         render_section_open("Academic Degrees")
-        deg_df = get_degrees_for_alumni(alumni_id)
+        deg_df = profile["degrees"]
         if deg_df.empty:
             st.info("No degree records available.")
         else:
@@ -470,9 +562,9 @@ def render_alumni_profile(alumni_id: int):
             st.dataframe(deg_df[display_cols], use_container_width=True, hide_index=True)
         render_section_close()
 
-    with tab_employment:
+    with tab_employment, PROFILER.section("Profile: Employment"):
         render_section_open("Employment History")
-        emp_df = get_employment_for_alumni(alumni_id)
+        emp_df = profile["employment"]
         if emp_df.empty:
             st.info("No employment records available.")
         else:
@@ -480,22 +572,24 @@ def render_alumni_profile(alumni_id: int):
             st.caption("This supports employer tracking, networking, and alumni career analytics.")
         render_section_close()
 
-    with tab_memberships:
+    with tab_memberships, PROFILER.section("Profile: Memberships"):
         render_section_open("Association Memberships")
-        mem_df = get_memberships_for_alumni(alumni_id)
+        mem_df = profile["memberships"]
         if mem_df.empty:
             st.info("No membership records available.")
         else:
             st.dataframe(mem_df, use_container_width=True, hide_index=True)
         render_section_close()
 
-    with tab_contributions:
+    with tab_contributions, PROFILER.section("Profile: Contributions"):
         render_section_open("Contribution History")
-        cont_df = get_contributions_for_alumni(alumni_id)
+        cont_df = profile["contributions"]
         if cont_df.empty:
             st.info("No contribution history available.")
         else:
-            st.dataframe(cont_df, use_container_width=True, hide_index=True)
+            st.dataframe(
+                cont_df, use_container_width=True, hide_index=True, column_config=DATE_COLUMNS
+            )
             if "AMOUNT" in cont_df.columns:
                 total = float(cont_df["AMOUNT"].sum())
                 st.success(f"Total Contributions: ${total:,.2f}")
@@ -582,6 +676,12 @@ st.sidebar.markdown(
     unsafe_allow_html=True,
 )
 
+if st.session_state.user_role == "Admin":
+    st.sidebar.caption(
+        f"DB bootstrap: {DB_BOOTSTRAP['total_ms']:,.0f} ms at process start "
+        f"(schema v{DB_BOOTSTRAP['schema_version']})"
+    )
+
 if st.sidebar.button("Log Out", use_container_width=True):
     st.session_state.user_role = None
     st.session_state.username = ""
@@ -593,7 +693,7 @@ st.sidebar.markdown('<div class="sidebar-header">Navigate</div>', unsafe_allow_h
 if st.session_state.user_role == "Admin":
     page = st.sidebar.radio(
         "Menu",
-        ["Dashboard", "Alumni Directory", "Alumni Profile", "Reports"],
+        ["Dashboard", "Alumni Directory", "Alumni Profile", "Reports", "Performance"],
     )
 elif st.session_state.user_role == "Alumni":
     page = st.sidebar.radio(
@@ -614,47 +714,71 @@ render_top_brand()
 # ---------------------------------------------------------
 # PAGES
 # ---------------------------------------------------------
+PROFILER.start_page(page)
+
 if page == "Dashboard":
     st.subheader("Administrative Dashboard")
 
-    stats = get_summary_stats()
-    c1, c2, c3, c4 = st.columns(4)
-    with c1:
-        render_kpi_card("Total Alumni", f"{stats['total_alumni']:,}")
-    with c2:
-        render_kpi_card("Employers Represented", f"{stats['total_employers']:,}")
-    with c3:
-        render_kpi_card("Active Campaigns", f"{stats['total_campaigns']:,}")
-    with c4:
-        render_kpi_card("Total Contributions", f"${stats['total_contributions']:,.0f}")
+    # The panels' reads are independent: start them all at once so the
+    # page waits for the slowest one, not the sum, and render each panel
+    # as its data arrives. The trend interval is read from the radio's
+    # state from the previous run.
+    trend_grain = st.session_state.get("trend_grain", "Daily")
+    dashboard = panels.PanelLoad(
+        {
+            "stats": get_summary_stats,
+            "trend": lambda: get_contribution_trend(trend_grain.lower()),
+            "contributions": get_all_contributions,
+            "employers": get_employer_summary,
+        },
+        timeouts={"stats": 5},
+    )
+
+    with PROFILER.section("KPIs"):
+        stats, error = dashboard.result("stats")
+        if error:
+            st.warning(f"Dashboard totals {error}; refresh to try again.")
+        else:
+            c1, c2, c3, c4 = st.columns(4)
+            with c1:
+                render_kpi_card("Total Alumni", f"{stats['total_alumni']:,}")
+            with c2:
+                render_kpi_card("Employers Represented", f"{stats['total_employers']:,}")
+            with c3:
+                render_kpi_card("Active Campaigns", f"{stats['total_campaigns']:,}")
+            with c4:
+                render_kpi_card("Total Contributions", f"${stats['total_contributions']:,.0f}")
 
     st.markdown("<hr class='info-divider'>", unsafe_allow_html=True)
 
     left, right = st.columns([1.2, 1])
 
-    with left:
+    with left, PROFILER.section("Contribution Trends"):
         render_section_open("Contribution Trends")
-        contrib_df = get_all_contributions()
-        if contrib_df.empty:
+        st.radio("Trend interval", ["Daily", "Monthly"], horizontal=True, key="trend_grain")
+        trend, trend_error = dashboard.result("trend")
+        contrib_df, contrib_error = dashboard.result("contributions")
+        if trend_error:
+            st.warning(f"The contribution trend {trend_error}.")
+        elif not trend.empty:
+            st.line_chart(trend.set_index("PERIOD")["AMOUNT"], use_container_width=True)
+
+        if contrib_error:
+            st.warning(f"The contribution list {contrib_error}.")
+        elif contrib_df.empty:
             st.info("No contribution data available yet.")
         else:
-            if "CONTRIBUTIONDATE" in contrib_df.columns:
-                contrib_df["CONTRIBUTIONDATE"] = pd.to_datetime(contrib_df["CONTRIBUTIONDATE"])
-                trend = (
-                    contrib_df.groupby("CONTRIBUTIONDATE", as_index=False)["AMOUNT"]
-                    .sum()
-                    .sort_values("CONTRIBUTIONDATE")
-                )
-                trend = trend.set_index("CONTRIBUTIONDATE")
-                st.line_chart(trend["AMOUNT"], use_container_width=True)
-
-            st.dataframe(contrib_df, use_container_width=True, hide_index=True)
+            st.dataframe(
+                contrib_df, use_container_width=True, hide_index=True, column_config=DATE_COLUMNS
+            )
         render_section_close()
 
-    with right:
+    with right, PROFILER.section("Employer Summary"):
         render_section_open("Employer Summary")
-        emp_summary = get_employer_summary()
-        if emp_summary.empty:
+        emp_summary, error = dashboard.result("employers")
+        if error:
+            st.warning(f"The employer summary {error}.")
+        elif emp_summary.empty:
             st.info("No employer summary available.")
         else:
             st.dataframe(emp_summary, use_container_width=True, hide_index=True)
@@ -669,132 +793,300 @@ if page == "Dashboard":
 elif page == "Alumni Directory":
     st.subheader("Alumni Directory")
 
-    alumni_df = get_alumni()
-    if alumni_df.empty:
-        st.warning("No alumni records available.")
-    else:
-        render_section_open("Search and Filter")
-        c1, c2, c3 = st.columns(3)
-
-        with c1:
-            search_name = st.text_input("Search by first or last name")
-        with c2:
-            search_major = st.text_input("Search by major")
-        with c3:
-            grad_years = ["All"] + sorted(
-                alumni_df["ALUM_GRADYEAR"].dropna().astype(int).unique().tolist()
-            )
-            selected_grad_year = st.selectbox("Graduation year", grad_years)
-
-        filtered = alumni_df.copy()
-
-        if search_name:
-            filtered = filtered[
-                filtered["LASTNAME"].str.contains(search_name, case=False, na=False)
-                | filtered["FIRSTNAME"].str.contains(search_name, case=False, na=False)
-            ]
-
-        if search_major:
-            filtered = filtered[
-                filtered["GRAD_MAJOR"].str.contains(search_major, case=False, na=False)
-            ]
+    render_section_open("Search and Filter")
+    c1, c2, c3 = st.columns(3)
 
-        if selected_grad_year != "All":
-            filtered = filtered[filtered["ALUM_GRADYEAR"] == selected_grad_year]
+    with c1:
+        search_name = st.text_input("Search by first or last name")
+    with c2:
+        search_major = st.text_input("Search by major")
+    with c3:
+        grad_years = ["All"] + get_alumni_grad_years()
+        selected_grad_year = st.selectbox("Graduation year", grad_years)
+
+    year_value = None if selected_grad_year == "All" else int(selected_grad_year)
+
+    # Keyset cursors for the pages visited so far; reset whenever the
+    # filters change.
+    dir_filters = (search_name, search_major, year_value)
+    if st.session_state.get("dir_filters") != dir_filters:
+        st.session_state.dir_filters = dir_filters
+        st.session_state.dir_cursors = [None]
+
+    with PROFILER.section("Directory Query"):
+        filtered, total_matches = get_alumni_page(
+            name=search_name or None,
+            major=search_major or None,
+            grad_year=year_value,
+            after_id=st.session_state.dir_cursors[-1],
+            page_size=DIRECTORY_PAGE_SIZE,
+        )
 
-        display_cols = [
-            c for c in
-            ["ALUMNIID", "FIRSTNAME", "LASTNAME", "PRIMARYEMAIL", "ALUM_GRADYEAR", "GRAD_MAJOR"]
-            if c in filtered.columns
-        ]
-        st.dataframe(filtered[display_cols], use_container_width=True, hide_index=True)
-        render_section_close()
+    st.dataframe(filtered, use_container_width=True, hide_index=True)
+
+    page_number = len(st.session_state.dir_cursors)
+    page_count = max(1, -(-total_matches // DIRECTORY_PAGE_SIZE))
+    p1, p2, p3 = st.columns([1, 2, 1])
+    with p1:
+        st.button(
+            "Previous",
+            use_container_width=True,
+            disabled=page_number == 1,
+            on_click=lambda: st.session_state.dir_cursors.pop(),
+        )
+    with p2:
+        st.caption(f"Page {page_number} of {page_count} · {total_matches:,} matching alumni")
+    with p3:
+        st.button(
+            "Next",
+            use_container_width=True,
+            disabled=page_number >= page_count or filtered.empty,
+            on_click=lambda last_id=(
+                int(filtered["ALUMNIID"].iloc[-1]) if not filtered.empty else None
+            ): st.session_state.dir_cursors.append(last_id),
+        )
+    render_section_close()
 
-        if filtered.empty:
+    if filtered.empty:
+        if any(v for v in dir_filters):
             st.warning("No alumni matched your search.")
         else:
-            selected_id = st.selectbox(
-                "Select an alumni profile to view",
+            st.warning("No alumni records available.")
+    else:
+        # Label the page's own rows; every alumni name is not needed here.
+        names = dict(
+            zip(
                 filtered["ALUMNIID"].tolist(),
-                format_func=lambda x: f"{x} - {alumni_name_from_df(filtered, x)}",
+                (filtered["FIRSTNAME"].fillna("") + " " + filtered["LASTNAME"].fillna(""))
+                .str.strip()
+                .tolist(),
             )
-            render_alumni_profile(int(selected_id))
+        )
+        selected_id = st.selectbox(
+            "Select an alumni profile to view",
+            filtered["ALUMNIID"].tolist(),
+            format_func=lambda x: f"{x} - {names.get(x, '')}",
+        )
+        render_alumni_profile(int(selected_id))
 
 elif page == "Alumni Profile":
     st.subheader("Alumni Profile Viewer")
 
-    alumni_df = get_alumni().sort_values("ALUMNIID")
-    if alumni_df.empty:
-        st.warning("No alumni records available.")
+    # Typeahead: only the best PROFILE_SUGGESTIONS matches become options,
+    # labelled from the shared id -> name index.
+    query = st.text_input("Search by name or alumni ID", key="profile_query")
+    suggestions = suggest_alumni(query, PROFILE_SUGGESTIONS)
+    if not suggestions:
+        st.warning("No alumni matched your search." if query else "No alumni records available.")
     else:
+        names = alumni_names()
         selected_id = st.selectbox(
             "Select an alumni",
-            alumni_df["ALUMNIID"].tolist(),
-            format_func=lambda x: f"{x} - {alumni_name_from_df(alumni_df, x)}",
+            suggestions,
+            format_func=lambda x: f"{x} - {names.get(x, '')}",
         )
         render_alumni_profile(int(selected_id))
 
 elif page == "Reports":
     st.subheader("Reports and Mailing List Support")
 
-    alumni_df = get_alumni()
-    contrib_df = get_all_contributions()
-    campaigns_df = get_campaigns()
+    # Analytic tabs read the Parquet snapshot when one has been exported,
+    # which keeps full-table scans off the transactional database.
+    snapshot = snapshots.snapshot_info() if snapshots.available() else None
 
     tab1, tab2, tab3 = st.tabs(["Mailing List", "Contribution Report", "Campaign Report"])
 
-    with tab1:
+    with tab1, PROFILER.section("Mailing List"):
         render_section_open("Generate Mailing List")
         major_filter = st.text_input("Filter by major", key="mail_major")
-        year_options = ["All"]
-        if not alumni_df.empty and "ALUM_GRADYEAR" in alumni_df.columns:
-            year_options += sorted(alumni_df["ALUM_GRADYEAR"].dropna().astype(int).unique().tolist())
+        year_options = ["All"] + get_alumni_grad_years()
         year_filter = st.selectbox("Filter by graduation year", year_options, key="mail_year")
+        opted_in_only = st.checkbox(
+            "Only alumni who opted in to the mailing list", value=True, key="mail_opt_in"
+        )
 
-        mail_df = alumni_df.copy()
-        if major_filter:
-            mail_df = mail_df[
-                mail_df["GRAD_MAJOR"].str.contains(major_filter, case=False, na=False)
-            ]
-        if year_filter != "All":
-            mail_df = mail_df[mail_df["ALUM_GRADYEAR"] == year_filter]
+        mail_filters = {
+            "major": major_filter or None,
+            "grad_year": None if year_filter == "All" else int(year_filter),
+            "opted_in_only": opted_in_only,
+        }
+        mail_df, mail_total = get_mailing_list_preview(**mail_filters)
 
         if mail_df.empty:
             st.info("No mailing list results for the selected filters.")
         else:
-            export_cols = [
-                c for c in
-                ["FIRSTNAME", "LASTNAME", "PRIMARYEMAIL", "ALUM_GRADYEAR", "GRAD_MAJOR", "MAILING_LIST"]
-                if c in mail_df.columns
-            ]
-            st.dataframe(mail_df[export_cols], use_container_width=True, hide_index=True)
-            csv = mail_df[export_cols].to_csv(index=False).encode("utf-8")
-            st.download_button(
-                "Download Mailing List CSV",
-                data=csv,
-                file_name="mailing_list.csv",
-                mime="text/csv",
-            )
+            st.dataframe(mail_df, use_container_width=True, hide_index=True)
+            if mail_total > len(mail_df):
+                st.caption(f"Showing the first {len(mail_df):,} of {mail_total:,} addresses.")
+
+            # The export is streamed from SQL to this session's file, so the
+            # list is never built up as a DataFrame or one big CSV string.
+            # Offering it for download does load it into Streamlit's memory,
+            # hence the EXPORT_DOWNLOAD_MAX_BYTES cap.
+            export = st.session_state.get("mail_export")
+            if export and export["filters"] != mail_filters:
+                Path(export["path"]).unlink(missing_ok=True)
+                export = st.session_state.mail_export = None
+            if export is None:
+                if st.button("Prepare Mailing List CSV"):
+                    sweep_exports()
+                    export_path = session_export_path()
+                    try:
+                        size = export_mailing_list(export_path, **mail_filters)
+                    except Exception:
+                        export_path.unlink(missing_ok=True)
+                        raise
+                    if size > EXPORT_DOWNLOAD_MAX_BYTES:
+                        export_path.unlink(missing_ok=True)
+                    st.session_state.mail_export = {
+                        "filters": mail_filters,
+                        "path": str(export_path),
+                        "size": size,
+                    }
+                    st.rerun()
+            elif export["size"] > EXPORT_DOWNLOAD_MAX_BYTES:
+                st.warning(
+                    f"This list is {export['size'] / 1024 / 1024:,.0f} MB, too large to "
+                    "download here. Export it on the server instead:"
+                )
+                st.code(export_command(mail_filters), language="bash")
+            elif not Path(export["path"]).exists():
+                # Swept after EXPORT_MAX_AGE; prepare it again.
+                st.session_state.mail_export = None
+                st.rerun()
+            else:
+                st.download_button(
+                    "Download Mailing List CSV",
+                    data=Path(export["path"]).read_bytes(),
+                    file_name="mailing_list.csv",
+                    mime="text/csv",
+                )
         render_section_close()
 
-    with tab2:
+    with tab2, PROFILER.section("Contribution Report"):
         render_section_open("Contribution Report")
+        if snapshot:
+            report_year = st.selectbox(
+                "Year", ["All"] + snapshots.contribution_years(), key="report_year"
+            )
+            contrib_df = snapshots.contribution_report(
+                None if report_year == "All" else int(report_year)
+            )
+            st.caption(f"From the snapshot taken {snapshot['created'].replace('T', ' ')}.")
+        else:
+            contrib_df = get_all_contributions()
         if contrib_df.empty:
             st.info("No contribution report available.")
         else:
-            st.dataframe(contrib_df, use_container_width=True, hide_index=True)
+            st.dataframe(
+                contrib_df, use_container_width=True, hide_index=True, column_config=DATE_COLUMNS
+            )
             total = contrib_df["AMOUNT"].sum() if "AMOUNT" in contrib_df.columns else 0
             st.success(f"Total Contributions Across All Campaigns: ${total:,.2f}")
         render_section_close()
 
-    with tab3:
+    with tab3, PROFILER.section("Campaign Report"):
         render_section_open("Campaign Report")
+        campaign_year = "All"
+        if snapshot:
+            campaign_year = st.selectbox(
+                "Year", ["All"] + snapshots.contribution_years(), key="campaign_year"
+            )
+        if campaign_year == "All":
+            campaigns_df = get_campaign_progress()
+        else:
+            campaigns_df = snapshots.campaign_totals(int(campaign_year))
+            st.caption(
+                f"Raised in {campaign_year}, from the snapshot taken "
+                f"{snapshot['created'].replace('T', ' ')}."
+            )
         if campaigns_df.empty:
             st.info("No campaign records available.")
         else:
-            st.dataframe(campaigns_df, use_container_width=True, hide_index=True)
+            st.dataframe(
+                campaigns_df,
+                use_container_width=True,
+                hide_index=True,
+                column_config=PROGRESS_COLUMNS,
+            )
         render_section_close()
 
+elif page == "Performance" and st.session_state.user_role == "Admin":
+    st.subheader("Query Performance")
+
+    cache_stats = get_query_cache_stats()
+    c1, c2, c3, c4 = st.columns(4)
+    with c1:
+        render_kpi_card("DB Bootstrap", f"{DB_BOOTSTRAP['total_ms']:,.0f} ms")
+    with c2:
+        render_kpi_card("Cache Hits", f"{cache_stats['hits']:,}")
+    with c3:
+        render_kpi_card("Cache Misses", f"{cache_stats['misses']:,}")
+    with c4:
+        render_kpi_card("Cached Results", f"{cache_stats['entries']:,}")
+
+    render_section_open("Slow Reruns")
+    slow_reruns = profiling.recent_slow_reruns()
+    if not slow_reruns:
+        st.info(f"No rerun has taken longer than {profiling.SLOW_RERUN_MS:,.0f} ms yet.")
+    else:
+        slow_df = pd.DataFrame(slow_reruns)
+        slow_df["sections"] = slow_df["sections"].apply(
+            lambda secs: ", ".join(f"{s['name']} {s['wall_ms']:,.0f} ms" for s in secs)
+        )
+        st.dataframe(slow_df, use_container_width=True, hide_index=True)
+        st.caption(f"Also written to {profiling.SLOW_RERUN_LOG}.")
+    render_section_close()
+
+    if not query_stats.ENABLED:
+        st.info(
+            "Per-query instrumentation is off. Start the app with "
+            "ALUMNI_QUERY_STATS=1 to record statement timings."
+        )
+    else:
+        render_section_open("Previous Rerun in This Session")
+        last_rerun = st.session_state.get("last_rerun_queries") or []
+        if not last_rerun:
+            st.info("Open another page first; its queries will be listed here.")
+        else:
+            rerun_df = pd.DataFrame(last_rerun)
+            per_helper = (
+                rerun_df.groupby("helper")
+                .agg(CALLS=("seq", "count"), TOTAL_MS=("duration_ms", "sum"))
+                .sort_values("TOTAL_MS", ascending=False)
+                .reset_index()
+            )
+            st.caption(
+                f"{len(rerun_df)} statements, {rerun_df['duration_ms'].sum():,.1f} ms in the database"
+            )
+            st.dataframe(per_helper, use_container_width=True, hide_index=True)
+        render_section_close()
+
+        render_section_open("Slowest Statements")
+        summary = pd.DataFrame(query_stats.statement_summary())
+        if summary.empty:
+            st.info("No statements recorded yet.")
+        else:
+            st.dataframe(summary.head(25), use_container_width=True, hide_index=True)
+        render_section_close()
+
+        render_section_open("Slowest Recent Executions")
+        recent = pd.DataFrame(query_stats.records_since(0))
+        if recent.empty:
+            st.info("No statements recorded yet.")
+        else:
+            st.dataframe(
+                recent.sort_values("duration_ms", ascending=False)
+                .head(25)[["helper", "duration_ms", "rows", "fingerprint"]],
+                use_container_width=True,
+                hide_index=True,
+            )
+        render_section_close()
+
+        if st.button("Reset Query Statistics"):
+            query_stats.reset()
+            st.rerun()
+
 elif page == "My Profile & Updates" and st.session_state.user_role == "Alumni":
     st.subheader("My Profile and Updates")
 
@@ -802,7 +1094,8 @@ elif page == "My Profile & Updates" and st.session_state.user_role == "Alumni":
     if not aid:
         st.error("No alumni record is linked to this account.")
     else:
-        alum_df = get_alumni_by_id(aid)
+        profile = load_alumni_profile(int(aid))
+        alum_df = profile["alumni"]
         if alum_df.empty:
             st.error("No alumni data found for this account.")
         else:
@@ -819,7 +1112,7 @@ elif page == "My Profile & Updates" and st.session_state.user_role == "Alumni":
                     mailing = st.selectbox(
                         "Mailing List Preference",
                         ["Yes", "No"],
-                        index=0 if str(alum["MAILING_LIST"]) == "Yes" else 1,
+                        index=0 if alum["MAILING_LIST"] else 1,
                     )
                     submitted = st.form_submit_button("Save Changes", use_container_width=True)
 
@@ -836,7 +1129,7 @@ elif page == "My Profile & Updates" and st.session_state.user_role == "Alumni":
                 )
                 render_section_close()
 
-            render_alumni_profile(int(aid))
+            render_alumni_profile(int(aid), profile)
 
 elif page == "Make a Contribution" and st.session_state.user_role == "Alumni":
     st.subheader("Make a Contribution")
@@ -845,12 +1138,13 @@ elif page == "Make a Contribution" and st.session_state.user_role == "Alumni":
     if not aid:
         st.error("No alumni record is linked to this account.")
     else:
-        alum_df = get_alumni_by_id(aid)
+        profile = load_alumni_profile(int(aid))
+        alum_df = profile["alumni"]
         if not alum_df.empty:
             alum = alum_df.iloc[0]
             render_alumni_summary(alum)
 
-        campaigns = get_campaigns()
+        campaigns = get_campaign_progress()
 
         render_section_open("Give Back to Howard University")
         st.write(
@@ -876,12 +1170,26 @@ elif page == "Make a Contribution" and st.session_state.user_role == "Alumni":
                 selected_campaign_label = None
                 selected_campaign_id = None
             else:
-                camp_lookup = {
-                    f"{row['CAMPAIGNNAME']} (Goal ${row['GOALAMOUNT']:,.0f})": int(row["CAMPAIGNID"])
-                    for _, row in campaigns.iterrows()
-                }
-                selected_campaign_label = st.selectbox("Select a campaign", list(camp_lookup.keys()))
-                selected_campaign_id = camp_lookup[selected_campaign_label]
+                progress = campaigns.set_index("CAMPAIGNID")
+                selected_campaign_id = st.selectbox(
+                    "Select a campaign",
+                    progress.index.tolist(),
+                    format_func=lambda cid: (
+                        f"{progress.at[cid, 'CAMPAIGNNAME']} "
+                        f"(${progress.at[cid, 'RAISED']:,.0f} of "
+                        f"${progress.at[cid, 'GOALAMOUNT']:,.0f})"
+                    ),
+                )
+                camp = progress.loc[selected_campaign_id]
+                selected_campaign_label = f"{camp['CAMPAIGNNAME']} (Goal ${camp['GOALAMOUNT']:,.0f})"
+                percent = camp["PERCENT_OF_GOAL"]
+                if pd.notna(percent):
+                    st.progress(min(percent, 100.0) / 100, text=f"{percent:,.0f}% of goal")
+                last_gift = camp["LAST_GIFT_DATE"]
+                st.caption(
+                    f"{camp['DONORS']:,} donors, {camp['GIFTS']:,} gifts"
+                    + (f", last gift {last_gift:%Y-%m-%d}" if pd.notna(last_gift) else "")
+                )
         else:
             selected_campaign_label = donation_type
             selected_campaign_id = None
@@ -952,23 +1260,51 @@ elif page == "Make a Contribution" and st.session_state.user_role == "Alumni":
                     st.error("No campaign exists in the database to attach this contribution to.")
                     st.stop()
 
-            create_contribution(
-                int(aid),
-                int(selected_campaign_id),
-                float(amount),
-                date_str,
-            )
-            st.success("Thank you. Your contribution has been recorded successfully.")
-            st.balloons()
+            try:
+                create_contribution(
+                    int(aid),
+                    int(selected_campaign_id),
+                    float(amount),
+                    date_str,
+                    idempotency_key=st.session_state.contribution_key,
+                )
+            except IdempotencyConflict:
+                # An interrupted recording went through with other details;
+                # the next click records these as a new gift.
+                st.session_state.contribution_key = uuid.uuid4().hex
+                st.error(
+                    "A contribution with different details was already recorded "
+                    "for this submission. Check your history below, then record "
+                    "this one again if it is a separate gift."
+                )
+            else:
+                # Only a completed recording starts a new submission; an
+                # interrupted rerun retries with the same key.
+                st.session_state.contribution_key = uuid.uuid4().hex
+                st.success("Thank you. Your contribution has been recorded successfully.")
+                st.balloons()
 
         render_section_close()
 
         render_section_open("My Contribution History")
-        cont_df = get_contributions_for_alumni(int(aid))
+        # Reload after a possible recording above; unchanged tables are
+        # served from the query cache.
+        cont_df = load_alumni_profile(int(aid))["contributions"]
         if cont_df.empty:
             st.info("No contribution history available yet.")
         else:
-            st.dataframe(cont_df, use_container_width=True, hide_index=True)
+            st.dataframe(
+                cont_df, use_container_width=True, hide_index=True, column_config=DATE_COLUMNS
+            )
             total = float(cont_df["AMOUNT"].sum()) if "AMOUNT" in cont_df.columns else 0.0
             st.success(f"Total Contributions: ${total:,.2f}")
         render_section_close()
+
+# Keep this rerun's statements for the Performance page; st.stop() and
+# st.rerun() skip this, which only means that rerun is not recorded.
+if query_stats.ENABLED and page != "Performance":
+    st.session_state.last_rerun_queries = query_stats.records_since(
+        RERUN_QUERY_MARK, thread=threading.get_ident()
+    )
+
+PROFILER.finish(role=st.session_state.user_role)
@@ -0,0 +1,299 @@
+"""
+Read-only JSON HTTP API over the db.py helpers, for other campus systems.
+
+    ALUMNI_API_TOKEN=... python api.py --port 8600
+
+Endpoints (GET or HEAD):
+
+    /alumni?name=&major=&grad_year=&limit=&cursor=   directory page
+    /alumni/<id>                                     alumni, degrees, employment
+    /campaigns                                       all campaigns
+    /campaigns/progress                              raised vs goal per campaign
+    /contributions/trend?grain=daily|monthly         totals per period
+    /stats                                           dashboard totals
+
+Alumni contact details (email, phone, LinkedIn) are only served when
+ALUMNI_API_TOKEN is set, and then every request must send it as
+``Authorization: Bearer <token>``. Without a token the API is open but
+leaves those columns out, as the Streamlit app keeps them behind a login.
+
+Every response carries an ETag built from the TABLE_VERSIONS change
+counters of the tables the endpoint reads, so it changes exactly when
+that data does. A request whose If-None-Match still matches gets an
+empty 304 without running the query. The directory is paged by an
+opaque ``cursor`` taken from the previous page's ``next_cursor``.
+
+Runs in its own process, so scrapers never trigger Streamlit reruns;
+db.py's query cache is shared by all request threads and is invalidated
+from the same counters when the app or an import writes.
+"""
+
+import argparse
+import base64
+import hashlib
+import hmac
+import json
+import logging
+import os
+import re
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+import pandas as pd
+
+import db
+
+MAX_PAGE_SIZE = 200
+DEFAULT_PAGE_SIZE = 50
+# Larger integers cannot be bound as query parameters.
+MAX_INT = 2**63 - 1
+
+API_TOKEN = os.environ.get("ALUMNI_API_TOKEN") or None
+CONTACT_COLUMNS = ["PRIMARYEMAIL", "PHONE", "LINKEDIN"]
+
+logger = logging.getLogger("alumni_portal.api")
+
+
+class ApiError(Exception):
+    def __init__(self, status: int, message: str) -> None:
+        super().__init__(message)
+        self.status = status
+
+
+def _records(df: pd.DataFrame) -> list[dict]:
+    """
+    Frame rows as JSON-ready dicts (NaN as null, dates as ISO strings),
+    without contact columns unless the API requires a token.
+    """
+    if API_TOKEN is None:
+        df = df.drop(columns=CONTACT_COLUMNS, errors="ignore")
+    return json.loads(df.to_json(orient="records", date_format="iso"))
+
+
+def _encode_cursor(after_id: int) -> str:
+    return base64.urlsafe_b64encode(json.dumps({"after": after_id}).encode()).decode()
+
+
+def _decode_cursor(cursor: str) -> int:
+    try:
+        after = json.loads(base64.urlsafe_b64decode(cursor.encode()))["after"]
+    except (ValueError, KeyError, TypeError, OverflowError):
+        raise ApiError(400, "invalid cursor") from None
+    if not isinstance(after, int) or isinstance(after, bool) or abs(after) > MAX_INT:
+        raise ApiError(400, "invalid cursor")
+    return after
+
+
+def _int_param(params: dict, name: str, default: int | None = None) -> int | None:
+    value = params.get(name)
+    if value in (None, ""):
+        return default
+    try:
+        number = int(value)
+    except ValueError:
+        raise ApiError(400, f"{name} must be an integer") from None
+    if abs(number) > MAX_INT:
+        raise ApiError(400, f"{name} is out of range")
+    return number
+
+
+def _alumni_page(params: dict, match) -> dict:
+    limit = _int_param(params, "limit", DEFAULT_PAGE_SIZE)
+    if not 1 <= limit <= MAX_PAGE_SIZE:
+        raise ApiError(400, f"limit must be between 1 and {MAX_PAGE_SIZE}")
+    cursor = params.get("cursor")
+    page, total = db.get_alumni_page(
+        name=params.get("name") or None,
+        major=params.get("major") or None,
+        grad_year=_int_param(params, "grad_year"),
+        after_id=_decode_cursor(cursor) if cursor else None,
+        page_size=limit,
+    )
+    next_cursor = None
+    if len(page) == limit:
+        next_cursor = _encode_cursor(int(page["ALUMNIID"].iloc[-1]))
+    return {"items": _records(page), "total": total, "next_cursor": next_cursor}
+
+
+def _alumni_by_id(params: dict, match) -> dict:
+    # Gifts are left out on purpose; only aggregates are published.
+    alumni_id = int(match.group(1))
+    if alumni_id > MAX_INT:
+        raise ApiError(404, "alumni not found")
+    profile = db.load_alumni_profile(alumni_id)
+    if profile["alumni"].empty:
+        raise ApiError(404, "alumni not found")
+    return {
+        "alumni": _records(profile["alumni"])[0],
+        "degrees": _records(profile["degrees"]),
+        "employment": _records(profile["employment"]),
+        "memberships": _records(profile["memberships"]),
+    }
+
+
+def _campaigns(params: dict, match) -> dict:
+    return {"items": _records(db.get_campaigns())}
+
+
+def _campaign_progress(params: dict, match) -> dict:
+    return {"items": _records(db.get_campaign_progress())}
+
+
+def _contribution_trend(params: dict, match) -> dict:
+    grain = params.get("grain", "monthly")
+    if grain not in db.ROLLUP_GRAINS:
+        raise ApiError(400, f"grain must be one of {', '.join(db.ROLLUP_GRAINS)}")
+    trend = db.get_contribution_trend(grain)
+    trend["PERIOD"] = trend["PERIOD"].dt.strftime("%Y-%m" if grain == "monthly" else "%Y-%m-%d")
+    return {"grain": grain, "items": _records(trend)}
+
+
+def _stats(params: dict, match) -> dict:
+    return db.get_summary_stats()
+
+
+# (path pattern, handler, tables whose versions the ETag covers)
+ROUTES = [
+    (re.compile(r"^/alumni$"), _alumni_page, db.get_alumni_page.tables),
+    (
+        re.compile(r"^/alumni/(\d+)$"),
+        _alumni_by_id,
+        ("ALUMNI", "DEGREE", "EMPLOYMENT", "ALUMNI_MEMBERSHIP"),
+    ),
+    (re.compile(r"^/campaigns$"), _campaigns, db.get_campaigns.tables),
+    (
+        re.compile(r"^/campaigns/progress$"),
+        _campaign_progress,
+        db.get_campaign_progress.tables,
+    ),
+    (
+        re.compile(r"^/contributions/trend$"),
+        _contribution_trend,
+        db.get_contribution_trend.tables,
+    ),
+    (re.compile(r"^/stats$"), _stats, db.get_summary_stats.tables),
+]
+
+
+def etag_for(target: str, tables: tuple, versions: dict) -> str:
+    """Strong ETag for ``target`` (path and query) at the given table versions."""
+    state = ",".join(f"{t}={versions.get(t, 0)}" for t in sorted(tables))
+    digest = hashlib.sha1(f"{target}|{state}".encode()).hexdigest()[:20]
+    return f'"{digest}"'
+
+
+def _authorized(header: str | None) -> bool:
+    if API_TOKEN is None:
+        return True
+    scheme, _, token = (header or "").partition(" ")
+    return scheme.lower() == "bearer" and hmac.compare_digest(
+        token.strip().encode(), API_TOKEN.encode()
+    )
+
+
+def _etag_matches(header: str | None, etag: str) -> bool:
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    candidates = [c.strip() for c in header.split(",")]
+    return any(c.removeprefix("W/") == etag for c in candidates)
+
+
+class ApiHandler(BaseHTTPRequestHandler):
+    server_version = "AlumniPortalAPI/1.0"
+
+    def do_GET(self) -> None:
+        self._handle(send_body=True)
+
+    def do_HEAD(self) -> None:
+        self._handle(send_body=False)
+
+    def _handle(self, send_body: bool) -> None:
+        if not _authorized(self.headers.get("Authorization")):
+            self._send_json(
+                401,
+                {"error": "missing or invalid bearer token"},
+                send_body,
+                headers={"WWW-Authenticate": "Bearer"},
+            )
+            return
+        url = urlsplit(self.path)
+        params = {k: v[-1] for k, v in parse_qs(url.query).items()}
+        for pattern, handler, tables in ROUTES:
+            match = pattern.match(url.path)
+            if match:
+                break
+        else:
+            self._send_json(404, {"error": "not found"}, send_body)
+            return
+
+        # One small query; also drops cached results other processes made stale.
+        versions = db.sync_table_versions()
+        etag = etag_for(self.path, tables, versions) if versions else None
+        if etag and _etag_matches(self.headers.get("If-None-Match"), etag):
+            self.send_response(304)
+            self.send_header("ETag", etag)
+            self.send_header("Cache-Control", "no-cache")
+            self.end_headers()
+            return
+
+        try:
+            body = handler(params, match)
+        except ApiError as exc:
+            self._send_json(exc.status, {"error": str(exc)}, send_body)
+            return
+        except Exception:
+            logger.exception("Request %s failed", self.path)
+            self._send_json(500, {"error": "internal error"}, send_body)
+            return
+        self._send_json(200, body, send_body, etag)
+
+    def _send_json(
+        self,
+        status: int,
+        body,
+        send_body: bool,
+        etag: str | None = None,
+        headers: dict | None = None,
+    ) -> None:
+        payload = json.dumps(body, separators=(",", ":")).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        if etag:
+            self.send_header("ETag", etag)
+            # Clients may keep the body but must revalidate before reuse.
+            self.send_header("Cache-Control", "no-cache")
+        self.end_headers()
+        if send_body:
+            self.wfile.write(payload)
+
+    def log_message(self, format: str, *args) -> None:
+        logger.info("%s %s", self.address_string(), format % args)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Read-only JSON API for the alumni portal")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8600)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(message)s")
+    db.migrate()
+    server = ThreadingHTTPServer((args.host, args.port), ApiHandler)
+    logger.info("Serving on http://%s:%d", args.host, args.port)
+    if API_TOKEN is None:
+        logger.info("ALUMNI_API_TOKEN is not set; contact columns are left out")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,156 @@
+"""
+Requests per second of the sync db.py helpers against db_async under
+many concurrent callers.
+
+The same mix of read requests (profile, directory page, search, KPIs)
+is issued by --callers concurrent callers: threads calling db.py for the
+sync run, asyncio tasks awaiting db_async for the async run. Both share
+the connection pool settings (ALUMNI_DB_POOL_*). The query cache is
+disabled unless --cached is given, so every request reaches the database.
+
+Run from the repository root against a file from generate_data:
+
+    python -m benchmarks.bench_async --db bench_alumni.db --callers 200
+    python -m benchmarks.bench_async --url postgresql+psycopg2:///bench_alumni
+"""
+
+import argparse
+import asyncio
+import itertools
+import os
+import statistics
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+
+def _requests(ids: list[int], total: int) -> list[tuple[str, tuple]]:
+    """A fixed, repeatable request mix of ``total`` (helper name, args)."""
+    mix = [
+        lambda i: ("load_alumni_profile", (ids[i % len(ids)],)),
+        lambda i: ("get_alumni_page", ("jo", None, None, ids[i % len(ids)], 50)),
+        lambda i: ("search_alumni", (("maya fin", "jordan", "smith tech")[i % 3], 20)),
+        lambda i: ("get_summary_stats", ()),
+    ]
+    return [mix[i % len(mix)](i // len(mix)) for i in range(total)]
+
+
+def _report(label: str, wall: float, latencies: list[float], errors: list[str]) -> dict:
+    ordered = sorted(latencies)
+    result = {
+        "requests": len(latencies),
+        "errors": len(errors),
+        "rps": len(latencies) / wall,
+        "p50_ms": statistics.median(ordered) if ordered else 0.0,
+        "p95_ms": ordered[int(len(ordered) * 0.95)] if ordered else 0.0,
+    }
+    print(
+        f"{label:<6} {result['rps']:>10,.0f} req/s  p50 {result['p50_ms']:>8.1f} ms  "
+        f"p95 {result['p95_ms']:>8.1f} ms  errors {len(errors)}",
+        flush=True,
+    )
+    if errors:
+        print(f"       first error: {errors[0][:200]}")
+    return result
+
+
+def run_sync(db, requests: list, callers: int) -> dict:
+    queue = iter(requests)
+    lock = threading.Lock()
+    latencies, errors = [], []
+
+    def caller():
+        while True:
+            with lock:
+                item = next(queue, None)
+            if item is None:
+                return
+            name, args = item
+            started = time.perf_counter()
+            try:
+                getattr(db, name)(*args)
+            except Exception as exc:
+                errors.append(f"{name}: {exc!r}")
+                continue
+            latencies.append((time.perf_counter() - started) * 1000)
+
+    began = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=callers) as pool:
+        for _ in range(callers):
+            pool.submit(caller)
+    return _report("sync", time.perf_counter() - began, latencies, errors)
+
+
+async def run_async(db_async, requests: list, callers: int) -> dict:
+    queue = iter(requests)
+    latencies, errors = [], []
+
+    async def caller():
+        for name, args in queue:
+            started = time.perf_counter()
+            try:
+                await getattr(db_async, name)(*args)
+            except Exception as exc:
+                errors.append(f"{name}: {exc!r}")
+                continue
+            latencies.append((time.perf_counter() - started) * 1000)
+
+    began = time.perf_counter()
+    await asyncio.gather(*(caller() for _ in range(callers)))
+    return _report("async", time.perf_counter() - began, latencies, errors)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Sync vs asyncio helper throughput")
+    parser.add_argument("--db", default="bench_alumni.db", help="generated database file")
+    parser.add_argument("--url", help="generated database as a SQLAlchemy URL, instead of --db")
+    parser.add_argument("--callers", type=int, default=200)
+    parser.add_argument("--requests", type=int, default=4000, help="per run")
+    parser.add_argument("--cached", action="store_true", help="keep the query cache enabled")
+    args = parser.parse_args()
+
+    if args.url:
+        os.environ["ALUMNI_DB_URL"] = args.url
+    elif not os.path.exists(args.db):
+        parser.error(f"{args.db} does not exist; create it with benchmarks.generate_data")
+    else:
+        os.environ["ALUMNI_DB_PATH"] = args.db
+    import db
+    import db_async
+
+    db.migrate()
+    if not args.cached:
+        db.QUERY_CACHE_MAX_ENTRIES = 0
+    with db.engine.connect() as conn:
+        ids = [
+            row[0]
+            for row in conn.exec_driver_sql(
+                "SELECT ALUMNIID FROM ALUMNI ORDER BY ALUMNIID LIMIT 2000"
+            )
+        ]
+    requests = _requests(ids, args.requests)
+    options = db.engine_options()
+    print(
+        f"{args.callers} callers, {args.requests:,} requests per run, "
+        f"pool {options.get('pool_size')}+{options.get('max_overflow')}, "
+        f"cache {'on' if args.cached else 'off'}"
+    )
+
+    # Warm the pool and the OS page cache before timing.
+    for name, call_args in itertools.islice(requests, 20):
+        getattr(db, name)(*call_args)
+    run_sync(db, requests, args.callers)
+
+    async def timed():
+        try:
+            for name, call_args in itertools.islice(requests, 20):
+                await getattr(db_async, name)(*call_args)
+            return await run_async(db_async, requests, args.callers)
+        finally:
+            await db_async.dispose()
+
+    asyncio.run(timed())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+"""
+Sustained create_contribution() throughput with many concurrent writers.
+
+Each writer is a separate process with its own engine, all hitting the
+same SQLite file, which is how several app processes contend on a giving
+day. Every writer also replays a share of its submissions with the same
+idempotency key to check that replays never create extra rows.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_contribution_inserts --writers 50 --inserts 200
+"""
+
+import argparse
+import multiprocessing as mp
+import os
+import tempfile
+import time
+import uuid
+from pathlib import Path
+
+
+def _writer(db_path, writer_id, inserts, replay_every, start, results):
+    os.environ["ALUMNI_DB_PATH"] = db_path
+    import db
+
+    keys, errors = set(), 0
+    start.wait()
+    began = time.perf_counter()
+    for i in range(inserts):
+        key = f"{writer_id}-{i}-{uuid.uuid4().hex}"
+        attempts = 2 if replay_every and i % replay_every == 0 else 1
+        for _ in range(attempts):
+            try:
+                db.create_contribution(1001 + (i % 5), 5001, 25.0, "2024-11-29", key)
+                keys.add(key)
+            except Exception:
+                errors += 1
+    results.put((writer_id, time.perf_counter() - began, len(keys), errors))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--writers", type=int, default=50)
+    parser.add_argument("--inserts", type=int, default=200, help="per writer")
+    parser.add_argument(
+        "--replay-every",
+        type=int,
+        default=10,
+        help="resubmit every Nth gift with the same key (0 disables)",
+    )
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = str(Path(tmp) / "bench_alumni.db")
+        os.environ["ALUMNI_DB_PATH"] = db_path
+        import db
+
+        db.bootstrap()
+        before = db.get_summary_stats()
+
+        ctx = mp.get_context("spawn")
+        start, results = ctx.Event(), ctx.Queue()
+        procs = [
+            ctx.Process(
+                target=_writer,
+                args=(db_path, w, args.inserts, args.replay_every, start, results),
+            )
+            for w in range(args.writers)
+        ]
+        for p in procs:
+            p.start()
+        # Give every writer time to import pandas/SQLAlchemy before the gate opens.
+        time.sleep(max(2.0, args.writers * 0.05))
+
+        began = time.perf_counter()
+        start.set()
+        rows = [results.get() for _ in procs]
+        wall = time.perf_counter() - began
+        for p in procs:
+            p.join()
+
+        recorded = sum(r[2] for r in rows)
+        errors = sum(r[3] for r in rows)
+        db.clear_query_cache()
+        with db.engine.connect() as conn:
+            stored = conn.exec_driver_sql(
+                "SELECT COUNT(*) FROM CONTRIBUTION WHERE IDEMPOTENCY_KEY IS NOT NULL"
+            ).scalar()
+        after = db.get_summary_stats()
+
+    print(f"writers:            {args.writers}")
+    print(f"gifts recorded:     {recorded:,}")
+    print(f"rows stored:        {stored:,}")
+    print(f"errors:             {errors:,}")
+    print(f"wall time:          {wall:.2f} s")
+    print(f"inserts per second: {recorded / wall:,.0f}")
+    print(
+        "total check:        "
+        f"{after['total_contributions'] - before['total_contributions']:,.2f} "
+        f"(expected {recorded * 25.0:,.2f})"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+"""
+Memory of an alumni frame as pd.read_sql infers it against the same
+frame with db.TABLE_DTYPES applied.
+
+Generates --rows alumni (1M by default) into an in-memory SQLite table,
+reads them back with plain pd.read_sql, applies db.apply_dtypes and
+prints the deep memory usage per column and in total. No database file
+is needed:
+
+    python -m benchmarks.bench_dtypes --rows 1000000
+"""
+
+import argparse
+import sqlite3
+import time
+
+import numpy as np
+import pandas as pd
+
+import db
+from benchmarks.generate_data import generate_chunk
+
+
+def _alumni_table(rows: int) -> sqlite3.Connection:
+    conn = sqlite3.connect(":memory:")
+    rng = np.random.default_rng(42)
+    next_ids = dict.fromkeys(["DEGREE", "EMPLOYMENT", "ALUMNI_MEMBERSHIP", "CONTRIBUTION"], 1)
+    for start in range(0, rows, 100_000):
+        size = min(100_000, rows - start)
+        alumni = generate_chunk(rng, 100_001 + start, size, next_ids)["ALUMNI"]
+        alumni.to_sql("ALUMNI", conn, if_exists="append", index=False)
+    return conn
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Alumni frame memory, inferred vs typed")
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    args = parser.parse_args()
+
+    # Ids and years too wide for int32/int16 must keep their values.
+    wide = pd.DataFrame({"ALUMNIID": [1, 2**31 + 5], "ALUM_GRADYEAR": [1990, 2**15]})
+    if db.apply_dtypes(wide.copy()).astype("int64").ne(wide).any(axis=None):
+        raise SystemExit("apply_dtypes changed an out-of-range id or year")
+
+    conn = _alumni_table(args.rows)
+    inferred = pd.read_sql("SELECT * FROM ALUMNI", conn)
+    started = time.perf_counter()
+    typed = db.apply_dtypes(inferred.copy())
+    elapsed = time.perf_counter() - started
+
+    before = inferred.memory_usage(deep=True, index=False)
+    after = typed.memory_usage(deep=True, index=False)
+    print(f"{args.rows:,} alumni rows; dtypes applied in {elapsed * 1000:,.0f} ms\n")
+    print(f"{'column':<15} {'inferred':>12} {'MB':>8}   {'typed':>12} {'MB':>8}")
+    for column in inferred.columns:
+        print(
+            f"{column:<15} {str(inferred[column].dtype):>12} {before[column] / 1e6:>8.1f}   "
+            f"{str(typed[column].dtype):>12} {after[column] / 1e6:>8.1f}"
+        )
+    print(
+        f"\n{'total':<15} {'':>12} {before.sum() / 1e6:>8.1f}   {'':>12} {after.sum() / 1e6:>8.1f}"
+        f"   ({1 - after.sum() / before.sum():.0%} smaller)"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+"""
+Directory substring filters: trigram index lookups against rescanning
+every string with str.contains.
+
+Builds --rows alumni in memory (1M by default, no database needed),
+indexes FIRSTNAME, LASTNAME and GRAD_MAJOR with trigram.TrigramIndex and
+times a fixed set of name and major filters both ways, checking that the
+two return the same rows. Last names are drawn from generated syllables
+so the column has realistic variety (tens of thousands of values)
+rather than the short list generate_data uses.
+
+    python -m benchmarks.bench_trigram --rows 1000000
+"""
+
+import argparse
+import statistics
+import time
+
+import numpy as np
+import pandas as pd
+
+from benchmarks.generate_data import FIRST_NAMES, MAJORS
+from trigram import TrigramIndex
+
+SYLLABLES = [
+    "ba", "bel", "car", "da", "den", "el", "fer", "gan", "har", "is", "jo", "ken",
+    "la", "lin", "mar", "mo", "na", "ner", "o", "pe", "ra", "ris", "san", "son",
+    "ta", "ton", "u", "van", "wel", "ya", "zi", "ell", "ord", "ing", "ham", "ley",
+]
+QUERIES = [
+    ("name", "jo"), ("name", "son"), ("name", "maya"), ("name", "marton"),
+    ("name", "kenbel"), ("name", "xyz"), ("major", "fin"), ("major", "management"),
+]
+
+
+def _frame(rows: int, seed: int = 42) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    syllables = np.asarray(SYLLABLES, dtype=object)
+    parts = [syllables[rng.integers(0, len(SYLLABLES), rows)] for _ in range(3)]
+    lengths = rng.integers(2, 4, rows)
+    last = [
+        (a + b + (c if n == 3 else "")).capitalize()
+        for a, b, c, n in zip(*parts, lengths)
+    ]
+    first = np.asarray(FIRST_NAMES, dtype=object)[rng.integers(0, len(FIRST_NAMES), rows)]
+    majors = np.asarray(MAJORS, dtype=object)[rng.integers(0, len(MAJORS), rows)]
+    return pd.DataFrame({
+        "FIRSTNAME": pd.Series(first, dtype="str"),
+        "LASTNAME": pd.Series(last, dtype="str"),
+        "GRAD_MAJOR": pd.Categorical(majors),
+    })
+
+
+def _scan(df: pd.DataFrame, kind: str, term: str) -> np.ndarray:
+    if kind == "name":
+        return (
+            df["FIRSTNAME"].str.lower().str.contains(term, regex=False, na=False)
+            | df["LASTNAME"].str.lower().str.contains(term, regex=False, na=False)
+        ).to_numpy()
+    return df["GRAD_MAJOR"].str.lower().str.contains(term, regex=False, na=False).to_numpy()
+
+
+def _lookup(indexes: dict, kind: str, term: str) -> np.ndarray:
+    if kind == "name":
+        return indexes["FIRSTNAME"].match(term) | indexes["LASTNAME"].match(term)
+    return indexes["GRAD_MAJOR"].match(term)
+
+
+def _time(fn, repeat: int) -> tuple[float, object]:
+    timings, result = [], None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = fn()
+        timings.append((time.perf_counter() - started) * 1000)
+    return statistics.median(timings), result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Trigram index vs str.contains")
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    # An empty directory (fresh install) must index and match nothing.
+    empty = _frame(0)
+    for column in ("FIRSTNAME", "GRAD_MAJOR"):
+        for term in ("x", "son"):
+            if TrigramIndex(empty[column]).match(term).shape != (0,):
+                raise SystemExit(f"empty {column} index matched {term!r}")
+
+    df = _frame(args.rows)
+    started = time.perf_counter()
+    indexes = {
+        column: TrigramIndex(df[column]) for column in ("FIRSTNAME", "LASTNAME", "GRAD_MAJOR")
+    }
+    print(
+        f"{args.rows:,} rows, {df['LASTNAME'].nunique():,} distinct last names; "
+        f"indexes built in {time.perf_counter() - started:.2f} s\n"
+    )
+    print(f"{'filter':<20} {'matches':>10} {'str.contains':>14} {'trigram':>10} {'speedup':>9}")
+    for kind, term in QUERIES:
+        scan_ms, expected = _time(lambda: _scan(df, kind, term), args.repeat)
+        index_ms, found = _time(lambda: _lookup(indexes, kind, term), args.repeat)
+        if not np.array_equal(expected, found):
+            raise SystemExit(f"{kind}={term!r}: index and scan disagree")
+        print(
+            f"{kind + '=' + term:<20} {int(found.sum()):>10,} {scan_ms:>11.1f} ms "
+            f"{index_ms:>7.1f} ms {scan_ms / index_ms:>8.0f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
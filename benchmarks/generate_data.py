@@ -0,0 +1,244 @@
+"""
+Deterministic synthetic data for all six portal tables.
+
+The same --alumni and --seed always produce the same database, so
+benchmark runs on different machines or commits compare like with like.
+Fan-out per alumni roughly follows a real advancement office: 1-3
+degrees, 0-5 jobs, a few association memberships and a long-tailed
+number of gifts spread over the campaigns.
+
+Run from the repository root:
+
+    python -m benchmarks.generate_data --alumni 100000 --db bench_alumni.db
+    python -m benchmarks.generate_data --alumni 100000 --url postgresql+psycopg2://localhost/bench
+"""
+
+import argparse
+import os
+import time
+from typing import Iterator
+
+import numpy as np
+import pandas as pd
+from sqlalchemy import text
+
+FIRST_NAMES = [
+    "Maya", "Jordan", "Amira", "Isaiah", "Nia", "Kofi", "Zara", "Malik", "Imani",
+    "Elijah", "Aaliyah", "Xavier", "Jasmine", "Darius", "Naomi", "Andre", "Kiara",
+    "Marcus", "Ebony", "Terrence", "Simone", "Jalen", "Tiana", "Cameron", "Aisha",
+]
+LAST_NAMES = [
+    "Johnson", "Smith", "Patel", "Thompson", "Brown", "Williams", "Jackson", "Davis",
+    "Harris", "Robinson", "Walker", "Young", "King", "Wright", "Scott", "Green",
+    "Baker", "Adams", "Nelson", "Carter", "Mitchell", "Roberts", "Turner", "Phillips",
+]
+MAJORS = [
+    "Finance", "Marketing", "Accounting", "Computer Info Systems", "Supply Chain",
+    "Management", "International Business", "Economics", "Hospitality Management",
+]
+MINORS = ["None", "Math", "Accounting", "Economics", "Spanish", "Psychology"]
+HONORS = [None, None, None, "Cum Laude", "Magna Cum Laude", "Summa Cum Laude"]
+EMPLOYERS = [
+    ("Deloitte", "Consulting"), ("Google", "Technology"), ("Amazon", "E-commerce"),
+    ("Bank of America", "Financial Services"), ("Procter & Gamble", "CPG"),
+    ("JPMorgan Chase", "Financial Services"), ("Accenture", "Consulting"),
+    ("Microsoft", "Technology"), ("Johnson & Johnson", "Healthcare"),
+    ("Lockheed Martin", "Aerospace"), ("Target", "Retail"), ("Capital One", "Financial Services"),
+    ("IBM", "Technology"), ("PwC", "Consulting"), ("Nike", "Apparel"),
+]
+TITLES = ["Analyst", "Consultant", "Manager", "Senior Manager", "Director", "Associate", "VP"]
+CITIES = [
+    ("Washington", "DC"), ("Atlanta", "GA"), ("New York", "NY"), ("Charlotte", "NC"),
+    ("Chicago", "IL"), ("Houston", "TX"), ("Seattle", "WA"), ("Baltimore", "MD"),
+]
+ORGS = [
+    "HU Finance Alumni Network", "Tech Alumni Council", "Marketing Alumni Circle",
+    "Young Alumni Board", "Entrepreneurs Network",
+]
+ROLES = ["Member", "Mentor", "Chair", "Treasurer"]
+
+CAMPAIGNS = 40
+CHUNK = 100_000
+
+
+def _pick(rng, options, size):
+    return np.asarray(options, dtype=object)[rng.integers(0, len(options), size)]
+
+
+def _fan_out(alumni_ids, counts):
+    """Repeat each alumni id by its per-row count."""
+    return np.repeat(alumni_ids, counts)
+
+
+def generate_chunk(rng, start_id, size, next_ids):
+    """Frames for ``size`` alumni starting at ``start_id``."""
+    ids = np.arange(start_id, start_id + size)
+    grad_years = rng.integers(1970, 2026, size)
+    first = _pick(rng, FIRST_NAMES, size)
+    last = _pick(rng, LAST_NAMES, size)
+
+    alumni = pd.DataFrame({
+        "ALUMNIID": ids,
+        "FIRSTNAME": first,
+        "LASTNAME": last,
+        "PRIMARYEMAIL": [
+            f"{f.lower()}.{l.lower()}{i}@alumni.example.edu" for f, l, i in zip(first, last, ids)
+        ],
+        "PHONE": [f"202-555-{i % 10000:04d}" for i in ids],
+        "GRAD_MAJOR": _pick(rng, MAJORS, size),
+        "ALUM_GRADYEAR": grad_years,
+        "MAILING_LIST": np.where(rng.random(size) < 0.8, "Yes", "No"),
+        "LINKEDIN": None,
+    })
+
+    n_deg = rng.choice([1, 2, 3], size, p=[0.7, 0.25, 0.05])
+    deg_alumni = _fan_out(ids, n_deg)
+    deg_years = np.repeat(grad_years, n_deg) + np.concatenate([np.arange(k) * 2 for k in n_deg])
+    degree = pd.DataFrame({
+        "DEGREEID": np.arange(next_ids["DEGREE"], next_ids["DEGREE"] + len(deg_alumni)),
+        "ALUMNIID": deg_alumni,
+        "MAJOR": _pick(rng, MAJORS, len(deg_alumni)),
+        "MINOR": _pick(rng, MINORS, len(deg_alumni)),
+        "SCHOOL": "Howard University School of Business",
+        "HONORS": _pick(rng, HONORS, len(deg_alumni)),
+        "GRADMONTH": np.where(rng.random(len(deg_alumni)) < 0.85, "May", "December"),
+        "GRADYEAR": deg_years,
+    })
+
+    n_emp = rng.choice([0, 1, 2, 3, 4, 5], size, p=[0.1, 0.3, 0.3, 0.15, 0.1, 0.05])
+    emp_alumni = _fan_out(ids, n_emp)
+    employer_idx = rng.integers(0, len(EMPLOYERS), len(emp_alumni))
+    city_idx = rng.integers(0, len(CITIES), len(emp_alumni))
+    employment = pd.DataFrame({
+        "EMPLOYMENTID": np.arange(
+            next_ids["EMPLOYMENT"], next_ids["EMPLOYMENT"] + len(emp_alumni)
+        ),
+        "ALUMNIID": emp_alumni,
+        "EMPLOYERNAME": [EMPLOYERS[i][0] for i in employer_idx],
+        "TITLE": _pick(rng, TITLES, len(emp_alumni)),
+        "INDUSTRY": [EMPLOYERS[i][1] for i in employer_idx],
+        "CITY": [CITIES[i][0] for i in city_idx],
+        "STATE": [CITIES[i][1] for i in city_idx],
+        "STARTYEAR": np.repeat(grad_years, n_emp) + rng.integers(0, 15, len(emp_alumni)),
+    })
+
+    n_mem = rng.choice([0, 1, 2], size, p=[0.75, 0.2, 0.05])
+    mem_alumni = _fan_out(ids, n_mem)
+    mem_start = np.repeat(grad_years, n_mem) + rng.integers(0, 10, len(mem_alumni))
+    membership = pd.DataFrame({
+        "MEMBERSHIPID": np.arange(
+            next_ids["ALUMNI_MEMBERSHIP"], next_ids["ALUMNI_MEMBERSHIP"] + len(mem_alumni)
+        ),
+        "ALUMNIID": mem_alumni,
+        "ORGNAME": _pick(rng, ORGS, len(mem_alumni)),
+        "ROLE": _pick(rng, ROLES, len(mem_alumni)),
+        "STARTYEAR": mem_start,
+        "ENDYEAR": np.where(
+            rng.random(len(mem_alumni)) < 0.6,
+            None,
+            mem_start + rng.integers(1, 6, len(mem_alumni)),
+        ),
+    })
+
+    # Giving is long-tailed: most alumni give rarely, a few give every year.
+    n_gifts = np.minimum(rng.negative_binomial(1, 0.3, size), 40)
+    gift_alumni = _fan_out(ids, n_gifts)
+    n = len(gift_alumni)
+    days = rng.integers(0, 365 * 20, n)
+    contribution = pd.DataFrame({
+        "CONTRIBUTIONID": np.arange(next_ids["CONTRIBUTION"], next_ids["CONTRIBUTION"] + n),
+        "ALUMNIID": gift_alumni,
+        "CAMPAIGNID": 5001 + rng.integers(0, CAMPAIGNS, n),
+        "CONTRIBUTIONDATE": (np.datetime64("2005-01-01") + days.astype("timedelta64[D]")).astype(str),
+        "AMOUNT": np.round(rng.lognormal(4.5, 1.1, n), 2),
+    })
+
+    for table, frame in (("DEGREE", degree), ("EMPLOYMENT", employment),
+                         ("ALUMNI_MEMBERSHIP", membership), ("CONTRIBUTION", contribution)):
+        next_ids[table] += len(frame)
+
+    return {
+        "ALUMNI": alumni,
+        "DEGREE": degree,
+        "EMPLOYMENT": employment,
+        "ALUMNI_MEMBERSHIP": membership,
+        "CONTRIBUTION": contribution,
+    }
+
+
+def _insert(conn, table, frame):
+    cols = list(frame.columns)
+    sql = f"INSERT INTO {table} ({', '.join(cols)}) VALUES ({', '.join(':' + c for c in cols)})"
+    rows = frame.astype(object).where(frame.notna(), None).to_dict("records")
+    conn.execute(text(sql), rows)
+
+
+def generate_frames(alumni: int, seed: int = 42) -> Iterator[dict]:
+    """
+    The rows ``generate`` inserts, as dicts of table -> DataFrame: the
+    campaigns first, then one dict per chunk of alumni. Tests compare
+    helper output against these same frames.
+    """
+    rng = np.random.default_rng(seed)
+    next_ids = {"DEGREE": 1, "EMPLOYMENT": 1, "ALUMNI_MEMBERSHIP": 1, "CONTRIBUTION": 1}
+
+    yield {
+        "CAMPAIGN": pd.DataFrame({
+            "CAMPAIGNID": np.arange(5001, 5001 + CAMPAIGNS),
+            "CAMPAIGNNAME": [f"Campaign {i + 1:02d}" for i in range(CAMPAIGNS)],
+            "GOALAMOUNT": rng.choice(
+                [25_000, 50_000, 100_000, 250_000, 1_000_000], CAMPAIGNS
+            ).astype(float),
+            "STATUS": np.where(rng.random(CAMPAIGNS) < 0.6, "Active", "Closed"),
+        })
+    }
+    for start in range(0, alumni, CHUNK):
+        size = min(CHUNK, alumni - start)
+        yield generate_chunk(rng, 100_001 + start, size, next_ids)
+
+
+def generate(alumni: int, seed: int = 42) -> dict:
+    """
+    Fill the configured database (which must not hold data yet)
+    and return the row count per table.
+    """
+    import db
+
+    db.migrate()
+    counts = dict.fromkeys(
+        ["ALUMNI", "DEGREE", "EMPLOYMENT", "ALUMNI_MEMBERSHIP", "CAMPAIGN", "CONTRIBUTION"], 0
+    )
+    with db.deferred_maintenance():
+        for frames in generate_frames(alumni, seed):
+            with db.engine.begin() as conn:
+                for table, frame in frames.items():
+                    _insert(conn, table, frame)
+                    counts[table] += len(frame)
+    return counts
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Generate a synthetic alumni database")
+    parser.add_argument("--alumni", type=int, default=10_000, help="number of alumni (10k-5M)")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--db", default="bench_alumni.db", help="database file to create")
+    parser.add_argument("--url", help="empty database to fill instead, as a SQLAlchemy URL")
+    args = parser.parse_args()
+
+    if args.url:
+        os.environ["ALUMNI_DB_URL"] = args.url
+    elif os.path.exists(args.db):
+        parser.error(f"{args.db} already exists; generate into a fresh file")
+    else:
+        os.environ["ALUMNI_DB_PATH"] = args.db
+
+    started = time.perf_counter()
+    counts = generate(args.alumni, args.seed)
+    elapsed = time.perf_counter() - started
+    for table, n in counts.items():
+        print(f"{table:<18} {n:>12,}")
+    print(f"generated in {elapsed:.1f} s")
+
+
+if __name__ == "__main__":
+    main()
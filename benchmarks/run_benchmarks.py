@@ -0,0 +1,201 @@
+"""
+Time every public db.py helper against a generated database.
+
+Each helper is called --iterations times with the query cache cleared
+before every call, so the figures are the cost of the SQL and DataFrame
+work rather than of a cache hit. p50/p95 latency and the peak Python
+allocation of one extra traced call are written to a JSON file; pass
+--compare with an earlier file to flag regressions.
+
+Run from the repository root against a file from generate_data:
+
+    python -m benchmarks.run_benchmarks --db bench_alumni.db --output baseline.json
+    python -m benchmarks.run_benchmarks --db bench_alumni.db --compare baseline.json
+    python -m benchmarks.run_benchmarks --url postgresql+psycopg2://localhost/bench
+
+Write helpers insert and update rows, so use a scratch database.
+"""
+
+import argparse
+import datetime
+import fnmatch
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+import tracemalloc
+import uuid
+
+
+def _cases(db) -> dict:
+    with db.engine.connect() as conn:
+        ids = [
+            row[0]
+            for row in conn.exec_driver_sql(
+                "SELECT ALUMNIID FROM ALUMNI ORDER BY ALUMNIID LIMIT 1000"
+            )
+        ]
+        campaign_id = conn.exec_driver_sql("SELECT MIN(CAMPAIGNID) FROM CAMPAIGN").scalar()
+        year = conn.exec_driver_sql(
+            "SELECT ALUM_GRADYEAR FROM ALUMNI WHERE ALUM_GRADYEAR IS NOT NULL LIMIT 1"
+        ).scalar()
+    if not ids or campaign_id is None:
+        raise SystemExit("The benchmark database has no alumni or campaigns; run generate_data first")
+
+    pick = iter(ids * 1000).__next__
+
+    return {
+        "get_alumni": lambda: db.get_alumni(),
+        "get_alumni_page": lambda: db.get_alumni_page(name="jo", page_size=50),
+        "get_alumni_page_deep": lambda: db.get_alumni_page(after_id=ids[len(ids) // 2]),
+        "get_alumni_grad_years": lambda: db.get_alumni_grad_years(),
+        "search_alumni": lambda: db.search_alumni("maya fin"),
+        "get_alumni_by_id": lambda: db.get_alumni_by_id(pick()),
+        "get_degrees_for_alumni": lambda: db.get_degrees_for_alumni(pick()),
+        "get_employment_for_alumni": lambda: db.get_employment_for_alumni(pick()),
+        "get_memberships_for_alumni": lambda: db.get_memberships_for_alumni(pick()),
+        "get_contributions_for_alumni": lambda: db.get_contributions_for_alumni(pick()),
+        "load_alumni_profile": lambda: db.load_alumni_profile(pick()),
+        "get_campaigns": lambda: db.get_campaigns(),
+        "get_campaign_progress": lambda: db.get_campaign_progress(),
+        "get_all_contributions": lambda: db.get_all_contributions(),
+        "get_contribution_trend": lambda: db.get_contribution_trend("daily"),
+        "get_employer_summary": lambda: db.get_employer_summary(),
+        "get_summary_stats": lambda: db.get_summary_stats(),
+        "get_mailing_list_preview": lambda: db.get_mailing_list_preview(grad_year=year),
+        "iter_mailing_list_csv": lambda: sum(len(c) for c in db.iter_mailing_list_csv(grad_year=year)),
+        "update_alumni_contact": lambda: db.update_alumni_contact(
+            pick(), "bench@example.edu", "202-555-0000", "Yes"
+        ),
+        "create_contribution": lambda: db.create_contribution(
+            pick(), campaign_id, 25.0, datetime.date.today().isoformat(), uuid.uuid4().hex
+        ),
+    }
+
+
+def _percentile(samples: list[float], pct: float) -> float:
+    ordered = sorted(samples)
+    k = (len(ordered) - 1) * pct
+    lo, hi = int(k), min(int(k) + 1, len(ordered) - 1)
+    return ordered[lo] + (ordered[hi] - ordered[lo]) * (k - lo)
+
+
+def run(db, iterations: int, patterns: list[str]) -> dict:
+    results = {}
+    for name, fn in _cases(db).items():
+        if patterns and not any(fnmatch.fnmatch(name, p) for p in patterns):
+            continue
+
+        db.clear_query_cache()
+        fn()  # warm-up: connection pool, SQLite page cache
+
+        samples = []
+        for _ in range(iterations):
+            db.clear_query_cache()
+            started = time.perf_counter()
+            fn()
+            samples.append((time.perf_counter() - started) * 1000)
+
+        db.clear_query_cache()
+        tracemalloc.start()
+        fn()
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        results[name] = {
+            "iterations": iterations,
+            "p50_ms": round(_percentile(samples, 0.50), 3),
+            "p95_ms": round(_percentile(samples, 0.95), 3),
+            "mean_ms": round(statistics.fmean(samples), 3),
+            "peak_kib": round(peak / 1024, 1),
+        }
+        r = results[name]
+        print(
+            f"{name:<30} p50 {r['p50_ms']:>10.2f} ms  p95 {r['p95_ms']:>10.2f} ms  "
+            f"peak {r['peak_kib']:>12,.0f} KiB",
+            flush=True,
+        )
+    return results
+
+
+def compare(current: dict, baseline: dict, tolerance: float) -> list[str]:
+    """Names whose p50 or peak memory grew by more than ``tolerance``."""
+    regressions = []
+    print(f"\n{'helper':<30} {'p50 before':>12} {'p50 now':>12} {'change':>8}")
+    for name, now in current.items():
+        before = baseline.get(name)
+        if before is None:
+            continue
+        change = (now["p50_ms"] - before["p50_ms"]) / max(before["p50_ms"], 1e-6)
+        mem_change = (now["peak_kib"] - before["peak_kib"]) / max(before["peak_kib"], 1e-6)
+        flag = ""
+        if change > tolerance or mem_change > tolerance:
+            flag = "  REGRESSION"
+            regressions.append(name)
+        print(
+            f"{name:<30} {before['p50_ms']:>12.2f} {now['p50_ms']:>12.2f} {change:>+8.0%}{flag}"
+        )
+    return regressions
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark the db.py helpers")
+    parser.add_argument("--db", default="bench_alumni.db", help="generated database file")
+    parser.add_argument("--url", help="generated database as a SQLAlchemy URL, instead of --db")
+    parser.add_argument("--iterations", type=int, default=20)
+    parser.add_argument("--only", nargs="*", default=[], help="glob patterns of helpers to run")
+    parser.add_argument("--output", help="write results to this JSON file")
+    parser.add_argument("--compare", help="baseline JSON file to compare against")
+    parser.add_argument(
+        "--tolerance", type=float, default=0.25, help="allowed relative slowdown (default 25%%)"
+    )
+    args = parser.parse_args()
+
+    if args.url:
+        os.environ["ALUMNI_DB_URL"] = args.url
+    elif not os.path.exists(args.db):
+        parser.error(f"{args.db} does not exist; create it with benchmarks.generate_data")
+    else:
+        os.environ["ALUMNI_DB_PATH"] = args.db
+    import db
+
+    db.migrate()
+    with db.engine.connect() as conn:
+        alumni = conn.exec_driver_sql("SELECT COUNT(*) FROM ALUMNI").scalar()
+
+    results = run(db, args.iterations, args.only)
+    report = {
+        "meta": {
+            "created": datetime.datetime.now().isoformat(timespec="seconds"),
+            "alumni": alumni,
+            "backend": db.engine.dialect.name,
+            "schema_version": db.get_schema_version(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+        },
+        "results": results,
+    }
+
+    if args.output:
+        with open(args.output, "w") as fh:
+            json.dump(report, fh, indent=2)
+        print(f"\nwrote {args.output}")
+
+    if args.compare:
+        with open(args.compare) as fh:
+            baseline = json.load(fh)
+        if baseline["meta"].get("alumni") != alumni:
+            print(
+                f"\nwarning: baseline has {baseline['meta'].get('alumni'):,} alumni, "
+                f"this database has {alumni:,}"
+            )
+        regressions = compare(results, baseline["results"], args.tolerance)
+        if regressions:
+            print(f"\n{len(regressions)} regression(s): {', '.join(regressions)}")
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,125 +1,1101 @@
+import csv
+import functools
+import hashlib
+import io
+import logging
+import os
+import re
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from contextvars import ContextVar
+from inspect import signature
 from pathlib import Path
+from types import MappingProxyType
+from typing import Iterator, Mapping, NamedTuple
 
+import numpy as np
 import pandas as pd
-from sqlalchemy import create_engine, text
+from sqlalchemy import create_engine, event, inspect, make_url, text
+
+import query_stats
+from trigram import TrigramIndex
 
 # ---------------------------------------------
 # Database setup
 # ---------------------------------------------
 
-DB_PATH = Path("alumni_v2.db")
-engine = create_engine(f"sqlite:///{DB_PATH}", echo=False, future=True)
+DB_PATH = Path(os.environ.get("ALUMNI_DB_PATH", "alumni_v2.db"))
+
+# Any SQLAlchemy URL, e.g. postgresql+psycopg2://portal@db-host/alumni to
+# share one database between several app replicas. Defaults to the SQLite
+# file at ALUMNI_DB_PATH.
+DB_URL = make_url(os.environ.get("ALUMNI_DB_URL") or f"sqlite:///{DB_PATH}")
+IS_SQLITE = DB_URL.get_backend_name() == "sqlite"
+
+
+def engine_options(url=DB_URL) -> dict:
+    """
+    create_engine() keyword arguments for ``url``: connection pool sizing
+    from ALUMNI_DB_POOL_SIZE, ALUMNI_DB_MAX_OVERFLOW, ALUMNI_DB_POOL_TIMEOUT
+    (seconds) and ALUMNI_DB_POOL_RECYCLE (seconds, -1 = never), plus
+    pre-ping for server databases, whose connections can be dropped
+    while idle in the pool.
+    """
+    options = {
+        "echo": False,
+        "future": True,
+        "pool_size": int(os.environ.get("ALUMNI_DB_POOL_SIZE", "5")),
+        "max_overflow": int(os.environ.get("ALUMNI_DB_MAX_OVERFLOW", "10")),
+        "pool_timeout": float(os.environ.get("ALUMNI_DB_POOL_TIMEOUT", "30")),
+        "pool_recycle": int(os.environ.get("ALUMNI_DB_POOL_RECYCLE", "-1")),
+    }
+    if url.get_backend_name() == "sqlite":
+        if url.database in (None, "", ":memory:"):
+            # In-memory databases live in a single connection; no pool to size.
+            return {"echo": False, "future": True}
+        # The counting connection lets query_stats see SELECT row counts.
+        if query_stats.ENABLED:
+            options["connect_args"] = {"factory": query_stats.CountingConnection}
+    else:
+        options["pool_pre_ping"] = os.environ.get(
+            "ALUMNI_DB_POOL_PRE_PING", "1"
+        ).lower() in ("1", "true", "yes", "on")
+        if url.get_driver_name() == "psycopg2":
+            # Batch executemany (bulk import, data generator) into few round trips.
+            options["executemany_mode"] = "values_plus_batch"
+    return options
+
+
+engine = create_engine(DB_URL, **engine_options())
+if query_stats.ENABLED:
+    query_stats.instrument(engine)
+
+logger = logging.getLogger(__name__)
+
+# Connection pragmas applied to every new SQLite connection. "read-heavy"
+# is the default: WAL lets readers run alongside the single writer,
+# synchronous=NORMAL drops the per-commit fsync (safe in WAL, a crash can
+# only lose the last commits), and busy_timeout makes writers queue
+# instead of failing with "database is locked".
+# Pick a profile with ALUMNI_DB_PROFILE and override single pragmas with
+# ALUMNI_SQLITE_<PRAGMA>, e.g. ALUMNI_SQLITE_MMAP_SIZE=0.
+SQLITE_PROFILES = {
+    "read-heavy": {
+        "journal_mode": "WAL",
+        "synchronous": "NORMAL",
+        "mmap_size": 256 * 1024 * 1024,
+        "cache_size": -64 * 1024,  # negative = KiB, i.e. 64 MiB per connection
+        "busy_timeout": 10_000,
+        "temp_store": "MEMORY",
+    },
+    "durable": {
+        "journal_mode": "WAL",
+        "synchronous": "FULL",
+        "busy_timeout": 10_000,
+    },
+    # SQLite defaults, as the app ran before connection tuning.
+    "legacy": {},
+}
+
+
+def sqlite_pragmas() -> dict:
+    """The pragmas the current environment asks for, in application order."""
+    profile = os.environ.get("ALUMNI_DB_PROFILE", "read-heavy")
+    if profile not in SQLITE_PROFILES:
+        raise ValueError(
+            f"Unknown ALUMNI_DB_PROFILE {profile!r}; "
+            f"expected one of {', '.join(SQLITE_PROFILES)}"
+        )
+    pragmas = dict(SQLITE_PROFILES[profile])
+    for name in SQLITE_PROFILES["read-heavy"]:
+        override = os.environ.get(f"ALUMNI_SQLITE_{name.upper()}")
+        if override is not None:
+            pragmas[name] = override
+    return pragmas
+
+
+_SQLITE_PRAGMAS = sqlite_pragmas() if IS_SQLITE else {}
+
+
+def _apply_sqlite_pragmas(dbapi_connection, connection_record) -> None:
+    cursor = dbapi_connection.cursor()
+    try:
+        for name, value in _SQLITE_PRAGMAS.items():
+            cursor.execute(f"PRAGMA {name} = {value}")
+    finally:
+        cursor.close()
+
+
+if IS_SQLITE:
+    event.listen(engine, "connect", _apply_sqlite_pragmas)
 
 
 # ---------------------------------------------
-# Schema + initialisation
+# Frame column types
 # ---------------------------------------------
 
+# Column types of the frames the helpers return, per table. They are
+# applied by column name to every query result, so joins and aliases of
+# these columns get the same types. Low-cardinality text is categorical,
+# ids are int32, years int16, dates datetime64 and the Yes/No opt-in a
+# boolean; columns not listed keep what pd.read_sql infers.
+TABLE_DTYPES = {
+    "ALUMNI": {
+        "ALUMNIID": "id",
+        "GRAD_MAJOR": "category",
+        "ALUM_GRADYEAR": "year",
+        "MAILING_LIST": "yes_no",
+    },
+    "DEGREE": {
+        "DEGREEID": "id",
+        "ALUMNIID": "id",
+        "MAJOR": "category",
+        "MINOR": "category",
+        "SCHOOL": "category",
+        "HONORS": "category",
+        "GRADMONTH": "category",
+        "GRADYEAR": "year",
+    },
+    "EMPLOYMENT": {
+        "EMPLOYMENTID": "id",
+        "ALUMNIID": "id",
+        "INDUSTRY": "category",
+        "CITY": "category",
+        "STATE": "category",
+        "STARTYEAR": "year",
+    },
+    "ALUMNI_MEMBERSHIP": {
+        "MEMBERSHIPID": "id",
+        "ALUMNIID": "id",
+        "ORGNAME": "category",
+        "ROLE": "category",
+        "STARTYEAR": "year",
+        "ENDYEAR": "year",
+    },
+    "CAMPAIGN": {
+        "CAMPAIGNID": "id",
+        "CAMPAIGNNAME": "category",
+        "STATUS": "category",
+    },
+    "CONTRIBUTION": {
+        "CONTRIBUTIONID": "id",
+        "ALUMNIID": "id",
+        "CAMPAIGNID": "id",
+        "CONTRIBUTIONDATE": "date",
+    },
+    # Rollup periods are days or months ("2024-03").
+    "CONTRIBUTION_DAILY": {"PERIOD": "date"},
+    "CONTRIBUTION_MONTHLY": {"PERIOD": "date"},
+    "CONTRIBUTION_CAMPAIGN": {"LAST_GIFT_DATE": "date"},
+}
+COLUMN_DTYPES = {
+    column: kind for columns in TABLE_DTYPES.values() for column, kind in columns.items()
+}
 
-def init_db() -> None:
+
+def _as_int(series: pd.Series, dtype: str) -> pd.Series:
+    # Narrow only when every value fits; astype would wrap the others.
+    limits = np.iinfo(dtype)
+    if len(series) and (series.min() < limits.min or series.max() > limits.max):
+        dtype = "int64"
+    # The nullable variant only when NULLs (e.g. from outer joins) occur.
+    if series.isna().any():
+        return series.astype(dtype.capitalize())
+    return series.astype(dtype)
+
+
+_CONVERTERS = {
+    "id": lambda s: _as_int(s, "int32"),
+    "year": lambda s: _as_int(s, "int16"),
+    "category": lambda s: s.astype("category"),
+    "date": lambda s: pd.to_datetime(s, format="ISO8601", errors="coerce"),
+    "yes_no": lambda s: s.eq("Yes"),
+}
+
+
+def apply_dtypes(df: pd.DataFrame) -> pd.DataFrame:
+    """``df`` with COLUMN_DTYPES applied to the columns it has."""
+    for column in df.columns.intersection(list(COLUMN_DTYPES)):
+        df[column] = _CONVERTERS[COLUMN_DTYPES[column]](df[column])
+    return df
+
+
+# ---------------------------------------------
+# Portable SQL
+# ---------------------------------------------
+
+# The schema and queries run unchanged on SQLite and PostgreSQL; the few
+# spots where the two differ go through the names below. PostgreSQL folds
+# unquoted identifiers to lower case, so catalogue lookups use lower-case
+# names (case-insensitive to SQLAlchemy) and result columns are upper-cased.
+_REAL = "REAL" if IS_SQLITE else "DOUBLE PRECISION"
+# Database-assigned ids: SQLite's INTEGER PRIMARY KEY is the rowid.
+_AUTO_ID = (
+    "INTEGER PRIMARY KEY"
+    if IS_SQLITE
+    else "INTEGER GENERATED BY DEFAULT AS IDENTITY PRIMARY KEY"
+)
+# Scalar two-argument maximum.
+_GREATEST = "MAX" if IS_SQLITE else "GREATEST"
+
+
+def _has_table(conn, table: str) -> bool:
+    return inspect(conn).has_table(table.lower())
+
+
+def _column_names(conn, table: str) -> set[str]:
+    return {c["name"].upper() for c in inspect(conn).get_columns(table.lower())}
+
+
+def _read_sql(sql, con, **kwargs) -> pd.DataFrame:
     """
-    Create tables if they don't exist and seed demo data once.
-    This function is safe to call multiple times.
+    pd.read_sql() with the upper-case column names SQLite returns and
+    the column types of TABLE_DTYPES.
     """
-    with engine.begin() as conn:
-        # ---------- ALUMNI ----------
+    df = pd.read_sql(sql, con, **kwargs)
+    df.columns = [str(c).upper() for c in df.columns]
+    return apply_dtypes(df)
+
+
+def _create_trigger(conn, name: str, timing: str, body: str) -> None:
+    """
+    Row trigger ``name`` on ``timing`` (e.g. "AFTER INSERT ON ALUMNI")
+    running the statements in ``body``, which refer to new./old. columns.
+    On PostgreSQL the body becomes a plpgsql function ``<name>_FN``.
+    """
+    if IS_SQLITE:
         conn.exec_driver_sql(
-            """
-            CREATE TABLE IF NOT EXISTS ALUMNI (
-                ALUMNIID      INTEGER PRIMARY KEY,
-                FIRSTNAME     TEXT NOT NULL,
-                LASTNAME      TEXT NOT NULL,
-                PRIMARYEMAIL  TEXT NOT NULL,
-                PHONE         TEXT,
-                GRAD_MAJOR    TEXT,
-                ALUM_GRADYEAR INTEGER,
-                MAILING_LIST  TEXT DEFAULT 'Yes',
-                LINKEDIN      TEXT
-            )
-            """
+            f"CREATE TRIGGER IF NOT EXISTS {name} {timing} BEGIN {body} END"
+        )
+        return
+    table = timing.rsplit(" ON ", 1)[1]
+    conn.exec_driver_sql(
+        f"CREATE OR REPLACE FUNCTION {name}_FN() RETURNS trigger "
+        f"LANGUAGE plpgsql AS $$ BEGIN {body} RETURN NULL; END $$"
+    )
+    conn.exec_driver_sql(f"DROP TRIGGER IF EXISTS {name} ON {table}")
+    conn.exec_driver_sql(
+        f"CREATE TRIGGER {name} {timing} FOR EACH ROW EXECUTE FUNCTION {name}_FN()"
+    )
+
+
+def _maintenance_triggers(conn) -> list[tuple[str, str]]:
+    """(name, table) of every TR_* trigger."""
+    if IS_SQLITE:
+        sql = (
+            "SELECT name, tbl_name FROM sqlite_master "
+            "WHERE type = 'trigger' AND name LIKE 'TR!_%' ESCAPE '!'"
+        )
+    else:
+        sql = (
+            "SELECT DISTINCT trigger_name, event_object_table "
+            "FROM information_schema.triggers "
+            "WHERE trigger_schema = current_schema() "
+            "AND UPPER(trigger_name) LIKE 'TR!_%' ESCAPE '!'"
+        )
+    return [(row[0], row[1]) for row in conn.execute(text(sql))]
+
+
+def _drop_trigger(conn, name: str, table: str) -> None:
+    on_table = "" if IS_SQLITE else f" ON {table}"
+    conn.exec_driver_sql(f"DROP TRIGGER IF EXISTS {name}{on_table}")
+
+
+def _sync_id_sequences(conn) -> None:
+    """
+    Move CONTRIBUTION's id sequence past rows inserted with explicit ids
+    (seed data, imports), so database-assigned ids do not collide. SQLite
+    always continues after the largest rowid, so there it is a no-op.
+    """
+    if IS_SQLITE:
+        return
+    conn.exec_driver_sql(
+        "SELECT setval(pg_get_serial_sequence('contribution', 'contributionid'), "
+        "COALESCE((SELECT MAX(CONTRIBUTIONID) FROM CONTRIBUTION), 0) + 1, false)"
+    )
+
+
+# ---------------------------------------------
+# Schema + initialisation
+# ---------------------------------------------
+
+SCHEMA_VERSION_TABLE = "SCHEMA_VERSION"
+
+
+def _migration_001_base_tables(conn) -> None:
+    """Core portal tables as originally shipped."""
+    # ---------- ALUMNI ----------
+    conn.exec_driver_sql(
+        """
+        CREATE TABLE IF NOT EXISTS ALUMNI (
+            ALUMNIID      INTEGER PRIMARY KEY,
+            FIRSTNAME     TEXT NOT NULL,
+            LASTNAME      TEXT NOT NULL,
+            PRIMARYEMAIL  TEXT NOT NULL,
+            PHONE         TEXT,
+            GRAD_MAJOR    TEXT,
+            ALUM_GRADYEAR INTEGER,
+            MAILING_LIST  TEXT DEFAULT 'Yes',
+            LINKEDIN      TEXT
+        )
+        """
+    )
+
+    # ---------- DEGREE ----------
+    conn.exec_driver_sql(
+        """
+        CREATE TABLE IF NOT EXISTS DEGREE (
+            DEGREEID  INTEGER PRIMARY KEY,
+            ALUMNIID  INTEGER NOT NULL,
+            MAJOR     TEXT,
+            MINOR     TEXT,
+            SCHOOL    TEXT,
+            HONORS    TEXT,
+            GRADMONTH TEXT,
+            GRADYEAR  INTEGER,
+            FOREIGN KEY (ALUMNIID) REFERENCES ALUMNI(ALUMNIID)
+        )
+        """
+    )
+
+    # ---------- EMPLOYMENT ----------
+    conn.exec_driver_sql(
+        """
+        CREATE TABLE IF NOT EXISTS EMPLOYMENT (
+            EMPLOYMENTID INTEGER PRIMARY KEY,
+            ALUMNIID     INTEGER NOT NULL,
+            EMPLOYERNAME TEXT,
+            TITLE        TEXT,
+            INDUSTRY     TEXT,
+            CITY         TEXT,
+            STATE        TEXT,
+            STARTYEAR    INTEGER,
+            FOREIGN KEY (ALUMNIID) REFERENCES ALUMNI(ALUMNIID)
+        )
+        """
+    )
+
+    # ---------- ALUMNI_MEMBERSHIP ----------
+    conn.exec_driver_sql(
+        """
+        CREATE TABLE IF NOT EXISTS ALUMNI_MEMBERSHIP (
+            MEMBERSHIPID INTEGER PRIMARY KEY,
+            ALUMNIID     INTEGER NOT NULL,
+            ORGNAME      TEXT,
+            ROLE         TEXT,
+            STARTYEAR    INTEGER,
+            ENDYEAR      INTEGER,
+            FOREIGN KEY (ALUMNIID) REFERENCES ALUMNI(ALUMNIID)
+        )
+        """
+    )
+
+    # ---------- CAMPAIGN ----------
+    conn.exec_driver_sql(
+        f"""
+        CREATE TABLE IF NOT EXISTS CAMPAIGN (
+            CAMPAIGNID   INTEGER PRIMARY KEY,
+            CAMPAIGNNAME TEXT NOT NULL,
+            GOALAMOUNT   {_REAL} NOT NULL,
+            STATUS       TEXT NOT NULL
+        )
+        """
+    )
+
+    # ---------- CONTRIBUTION ----------
+    conn.exec_driver_sql(
+        f"""
+        CREATE TABLE IF NOT EXISTS CONTRIBUTION (
+            CONTRIBUTIONID   {_AUTO_ID},
+            ALUMNIID         INTEGER NOT NULL,
+            CAMPAIGNID       INTEGER NOT NULL,
+            CONTRIBUTIONDATE TEXT NOT NULL,
+            AMOUNT           {_REAL} NOT NULL,
+            FOREIGN KEY (ALUMNIID)  REFERENCES ALUMNI(ALUMNIID),
+            FOREIGN KEY (CAMPAIGNID) REFERENCES CAMPAIGN(CAMPAIGNID)
         )
+        """
+    )
 
-        # ---------- DEGREE ----------
+
+def _migration_002_linkedin_column(conn) -> None:
+    """Older alumni_v2.db files were created before ALUMNI.LINKEDIN existed."""
+    if "LINKEDIN" not in _column_names(conn, "ALUMNI"):
+        conn.exec_driver_sql("ALTER TABLE ALUMNI ADD COLUMN LINKEDIN TEXT")
+
+
+def _migration_003_lookup_indexes(conn) -> None:
+    """
+    Indexes for the per-alumni lookups, the contribution joins and the
+    employer summary. The wider ones cover their queries so SQLite can
+    answer from the index without touching the table rows.
+    """
+    statements = [
+        "CREATE INDEX IF NOT EXISTS IX_DEGREE_ALUMNIID "
+        "ON DEGREE (ALUMNIID)",
+        "CREATE INDEX IF NOT EXISTS IX_EMPLOYMENT_ALUMNIID "
+        "ON EMPLOYMENT (ALUMNIID)",
+        "CREATE INDEX IF NOT EXISTS IX_EMPLOYMENT_EMPLOYER "
+        "ON EMPLOYMENT (EMPLOYERNAME, INDUSTRY, ALUMNIID)",
+        "CREATE INDEX IF NOT EXISTS IX_MEMBERSHIP_ALUMNIID "
+        "ON ALUMNI_MEMBERSHIP (ALUMNIID)",
+        "CREATE INDEX IF NOT EXISTS IX_CONTRIBUTION_ALUMNI_DATE "
+        "ON CONTRIBUTION (ALUMNIID, CONTRIBUTIONDATE, CAMPAIGNID, AMOUNT)",
+        "CREATE INDEX IF NOT EXISTS IX_CONTRIBUTION_CAMPAIGN_DATE "
+        "ON CONTRIBUTION (CAMPAIGNID, CONTRIBUTIONDATE, AMOUNT)",
+        "CREATE INDEX IF NOT EXISTS IX_CONTRIBUTION_DATE "
+        "ON CONTRIBUTION (CONTRIBUTIONDATE, AMOUNT)",
+    ]
+    for stmt in statements:
+        conn.exec_driver_sql(stmt)
+    conn.exec_driver_sql("ANALYZE")
+
+
+def _migration_004_directory_indexes(conn) -> None:
+    """Grad-year filter of the paged directory, walked in ALUMNIID order."""
+    conn.exec_driver_sql(
+        "CREATE INDEX IF NOT EXISTS IX_ALUMNI_GRADYEAR "
+        "ON ALUMNI (ALUM_GRADYEAR, ALUMNIID)"
+    )
+
+
+SEARCH_TABLE = "ALUMNI_SEARCH"
+
+# Row for one alumni in the search index; EMPLOYERS folds in every
+# EMPLOYMENT.EMPLOYERNAME so employer names are searchable too.
+_SEARCH_ROW_SQL = f"""
+    INSERT INTO {SEARCH_TABLE} (rowid, FIRSTNAME, LASTNAME, PRIMARYEMAIL, GRAD_MAJOR, EMPLOYERS)
+    SELECT A.ALUMNIID, A.FIRSTNAME, A.LASTNAME, A.PRIMARYEMAIL, A.GRAD_MAJOR,
+           (SELECT GROUP_CONCAT(E.EMPLOYERNAME, ' ') FROM EMPLOYMENT E
+             WHERE E.ALUMNIID = A.ALUMNIID)
+    FROM ALUMNI A
+    WHERE A.ALUMNIID = {{aid}};
+"""
+
+
+def _search_refresh_sql(aid: str) -> str:
+    return (
+        f"DELETE FROM {SEARCH_TABLE} WHERE rowid = {aid};"
+        + _SEARCH_ROW_SQL.format(aid=aid)
+    )
+
+
+def _migration_005_alumni_search(conn) -> None:
+    """
+    FTS5 index over alumni names, email, major and employers, kept in
+    sync by triggers. Skipped when the SQLite build has no FTS5; the
+    directory then falls back to LIKE filters, as it does on PostgreSQL.
+    """
+    if not IS_SQLITE:
+        logger.info("Alumni search uses LIKE filters on %s", engine.dialect.name)
+        return
+    try:
         conn.exec_driver_sql(
-            """
-            CREATE TABLE IF NOT EXISTS DEGREE (
-                DEGREEID  INTEGER PRIMARY KEY,
-                ALUMNIID  INTEGER NOT NULL,
-                MAJOR     TEXT,
-                MINOR     TEXT,
-                SCHOOL    TEXT,
-                HONORS    TEXT,
-                GRADMONTH TEXT,
-                GRADYEAR  INTEGER,
-                FOREIGN KEY (ALUMNIID) REFERENCES ALUMNI(ALUMNIID)
+            f"""
+            CREATE VIRTUAL TABLE IF NOT EXISTS {SEARCH_TABLE} USING fts5(
+                FIRSTNAME, LASTNAME, PRIMARYEMAIL, GRAD_MAJOR, EMPLOYERS,
+                tokenize = 'unicode61 remove_diacritics 2',
+                prefix = '2 3'
             )
             """
         )
+    except Exception:
+        logger.warning("SQLite FTS5 is unavailable; alumni search uses LIKE")
+        return
+
+    triggers = {
+        "TR_ALUMNI_SEARCH_AI": (
+            "AFTER INSERT ON ALUMNI", _search_refresh_sql("new.ALUMNIID")
+        ),
+        "TR_ALUMNI_SEARCH_AU": (
+            "AFTER UPDATE OF FIRSTNAME, LASTNAME, PRIMARYEMAIL, GRAD_MAJOR ON ALUMNI",
+            _search_refresh_sql("old.ALUMNIID") + _search_refresh_sql("new.ALUMNIID"),
+        ),
+        "TR_ALUMNI_SEARCH_AD": (
+            "AFTER DELETE ON ALUMNI",
+            f"DELETE FROM {SEARCH_TABLE} WHERE rowid = old.ALUMNIID;",
+        ),
+        "TR_EMPLOYMENT_SEARCH_AI": (
+            "AFTER INSERT ON EMPLOYMENT", _search_refresh_sql("new.ALUMNIID")
+        ),
+        "TR_EMPLOYMENT_SEARCH_AU": (
+            "AFTER UPDATE OF ALUMNIID, EMPLOYERNAME ON EMPLOYMENT",
+            _search_refresh_sql("old.ALUMNIID") + _search_refresh_sql("new.ALUMNIID"),
+        ),
+        "TR_EMPLOYMENT_SEARCH_AD": (
+            "AFTER DELETE ON EMPLOYMENT", _search_refresh_sql("old.ALUMNIID")
+        ),
+    }
+    for name, (timing, body) in triggers.items():
+        _create_trigger(conn, name, timing, body)
+
+    # Backfill from scratch so a re-run after a partial upgrade is harmless.
+    conn.exec_driver_sql(f"DELETE FROM {SEARCH_TABLE}")
+    conn.exec_driver_sql(
+        f"""
+        INSERT INTO {SEARCH_TABLE} (rowid, FIRSTNAME, LASTNAME, PRIMARYEMAIL, GRAD_MAJOR, EMPLOYERS)
+        SELECT A.ALUMNIID, A.FIRSTNAME, A.LASTNAME, A.PRIMARYEMAIL, A.GRAD_MAJOR, E.EMPLOYERS
+        FROM ALUMNI A
+        LEFT JOIN (
+            SELECT ALUMNIID, GROUP_CONCAT(EMPLOYERNAME, ' ') AS EMPLOYERS
+            FROM EMPLOYMENT GROUP BY ALUMNIID
+        ) E ON E.ALUMNIID = A.ALUMNIID
+        """
+    )
 
-        # ---------- EMPLOYMENT ----------
+
+def _rebuild_summary_counters(conn) -> None:
+    """Recompute SUMMARY_COUNTERS and EMPLOYER_COUNTS from the base tables."""
+    conn.exec_driver_sql("DELETE FROM SUMMARY_COUNTERS")
+    conn.exec_driver_sql(
+        """
+        INSERT INTO SUMMARY_COUNTERS (NAME, VALUE)
+        SELECT 'alumni', COUNT(*) FROM ALUMNI
+        UNION ALL
+        SELECT 'contribution_amount', COALESCE(SUM(AMOUNT), 0) FROM CONTRIBUTION
+        """
+    )
+    conn.exec_driver_sql("DELETE FROM EMPLOYER_COUNTS")
+    conn.exec_driver_sql(
+        """
+        INSERT INTO EMPLOYER_COUNTS (EMPLOYERNAME, ROWS)
+        SELECT EMPLOYERNAME, COUNT(*) FROM EMPLOYMENT
+        WHERE EMPLOYERNAME IS NOT NULL
+        GROUP BY EMPLOYERNAME
+        """
+    )
+
+
+def _migration_006_summary_counters(conn) -> None:
+    """
+    Trigger-maintained totals for the dashboard KPIs, so they are read
+    in constant time instead of aggregating ALUMNI, CONTRIBUTION and
+    EMPLOYMENT on every load.
+    """
+    conn.exec_driver_sql(
+        f"""
+        CREATE TABLE IF NOT EXISTS SUMMARY_COUNTERS (
+            NAME  TEXT PRIMARY KEY,
+            VALUE {_REAL} NOT NULL
+        )
+        """
+    )
+    conn.exec_driver_sql(
+        """
+        CREATE TABLE IF NOT EXISTS EMPLOYER_COUNTS (
+            EMPLOYERNAME TEXT PRIMARY KEY,
+            ROWS         INTEGER NOT NULL
+        )
+        """
+    )
+
+    # Upsert SET clauses qualify the existing row's columns with the table
+    # name; PostgreSQL rejects the bare name as ambiguous with excluded.
+    employer_added = """
+        INSERT INTO EMPLOYER_COUNTS (EMPLOYERNAME, ROWS)
+        SELECT new.EMPLOYERNAME, 1 WHERE new.EMPLOYERNAME IS NOT NULL
+        ON CONFLICT (EMPLOYERNAME) DO UPDATE SET ROWS = EMPLOYER_COUNTS.ROWS + 1;
+    """
+    employer_removed = """
+        UPDATE EMPLOYER_COUNTS SET ROWS = ROWS - 1
+        WHERE EMPLOYERNAME = old.EMPLOYERNAME;
+        DELETE FROM EMPLOYER_COUNTS
+        WHERE EMPLOYERNAME = old.EMPLOYERNAME AND ROWS <= 0;
+    """
+    triggers = {
+        "TR_SUMMARY_ALUMNI_AI": (
+            "AFTER INSERT ON ALUMNI",
+            "UPDATE SUMMARY_COUNTERS SET VALUE = VALUE + 1 WHERE NAME = 'alumni';",
+        ),
+        "TR_SUMMARY_ALUMNI_AD": (
+            "AFTER DELETE ON ALUMNI",
+            "UPDATE SUMMARY_COUNTERS SET VALUE = VALUE - 1 WHERE NAME = 'alumni';",
+        ),
+        "TR_SUMMARY_CONTRIBUTION_AI": (
+            "AFTER INSERT ON CONTRIBUTION",
+            "UPDATE SUMMARY_COUNTERS SET VALUE = VALUE + new.AMOUNT "
+            "WHERE NAME = 'contribution_amount';",
+        ),
+        "TR_SUMMARY_CONTRIBUTION_AU": (
+            "AFTER UPDATE OF AMOUNT ON CONTRIBUTION",
+            "UPDATE SUMMARY_COUNTERS SET VALUE = VALUE - old.AMOUNT + new.AMOUNT "
+            "WHERE NAME = 'contribution_amount';",
+        ),
+        "TR_SUMMARY_CONTRIBUTION_AD": (
+            "AFTER DELETE ON CONTRIBUTION",
+            "UPDATE SUMMARY_COUNTERS SET VALUE = VALUE - old.AMOUNT "
+            "WHERE NAME = 'contribution_amount';",
+        ),
+        "TR_SUMMARY_EMPLOYMENT_AI": ("AFTER INSERT ON EMPLOYMENT", employer_added),
+        "TR_SUMMARY_EMPLOYMENT_AU": (
+            "AFTER UPDATE OF EMPLOYERNAME ON EMPLOYMENT",
+            employer_removed + employer_added,
+        ),
+        "TR_SUMMARY_EMPLOYMENT_AD": ("AFTER DELETE ON EMPLOYMENT", employer_removed),
+    }
+    for name, (timing, body) in triggers.items():
+        _create_trigger(conn, name, timing, body)
+
+    _rebuild_summary_counters(conn)
+
+
+ROLLUP_GRAINS = {
+    "daily": ("CONTRIBUTION_DAILY", "substr({row}.CONTRIBUTIONDATE, 1, 10)"),
+    "monthly": ("CONTRIBUTION_MONTHLY", "substr({row}.CONTRIBUTIONDATE, 1, 7)"),
+}
+
+
+def _rebuild_contribution_rollups(conn) -> None:
+    """Recompute the contribution rollup tables from CONTRIBUTION."""
+    for table, period in ROLLUP_GRAINS.values():
+        conn.exec_driver_sql(f"DELETE FROM {table}")
         conn.exec_driver_sql(
-            """
-            CREATE TABLE IF NOT EXISTS EMPLOYMENT (
-                EMPLOYMENTID INTEGER PRIMARY KEY,
-                ALUMNIID     INTEGER NOT NULL,
-                EMPLOYERNAME TEXT,
-                TITLE        TEXT,
-                INDUSTRY     TEXT,
-                CITY         TEXT,
-                STATE        TEXT,
-                STARTYEAR    INTEGER,
-                FOREIGN KEY (ALUMNIID) REFERENCES ALUMNI(ALUMNIID)
-            )
+            f"""
+            INSERT INTO {table} (PERIOD, TOTAL_AMOUNT, GIFT_COUNT)
+            SELECT {period.format(row="C")}, SUM(C.AMOUNT), COUNT(*)
+            FROM CONTRIBUTION C
+            GROUP BY 1
             """
         )
+    conn.exec_driver_sql("DELETE FROM CONTRIBUTION_CAMPAIGN")
+    conn.exec_driver_sql(
+        """
+        INSERT INTO CONTRIBUTION_CAMPAIGN (CAMPAIGNID, TOTAL_AMOUNT, GIFT_COUNT, LAST_GIFT_DATE)
+        SELECT CAMPAIGNID, SUM(AMOUNT), COUNT(*), MAX(CONTRIBUTIONDATE)
+        FROM CONTRIBUTION
+        GROUP BY CAMPAIGNID
+        """
+    )
 
-        # ---------- ALUMNI_MEMBERSHIP ----------
+
+def _migration_007_contribution_rollups(conn) -> None:
+    """
+    Daily, monthly and per-campaign contribution totals, maintained by
+    triggers on CONTRIBUTION so the dashboard trend never scans gifts.
+    """
+    for table, _ in ROLLUP_GRAINS.values():
         conn.exec_driver_sql(
-            """
-            CREATE TABLE IF NOT EXISTS ALUMNI_MEMBERSHIP (
-                MEMBERSHIPID INTEGER PRIMARY KEY,
-                ALUMNIID     INTEGER NOT NULL,
-                ORGNAME      TEXT,
-                ROLE         TEXT,
-                STARTYEAR    INTEGER,
-                ENDYEAR      INTEGER,
-                FOREIGN KEY (ALUMNIID) REFERENCES ALUMNI(ALUMNIID)
+            f"""
+            CREATE TABLE IF NOT EXISTS {table} (
+                PERIOD       TEXT PRIMARY KEY,
+                TOTAL_AMOUNT {_REAL} NOT NULL,
+                GIFT_COUNT   INTEGER NOT NULL
             )
             """
         )
+    conn.exec_driver_sql(
+        f"""
+        CREATE TABLE IF NOT EXISTS CONTRIBUTION_CAMPAIGN (
+            CAMPAIGNID     INTEGER PRIMARY KEY,
+            TOTAL_AMOUNT   {_REAL} NOT NULL,
+            GIFT_COUNT     INTEGER NOT NULL,
+            LAST_GIFT_DATE TEXT
+        )
+        """
+    )
+
+    added, removed = "", ""
+    for table, period in ROLLUP_GRAINS.values():
+        added += f"""
+            INSERT INTO {table} (PERIOD, TOTAL_AMOUNT, GIFT_COUNT)
+            VALUES ({period.format(row="new")}, new.AMOUNT, 1)
+            ON CONFLICT (PERIOD) DO UPDATE SET
+                TOTAL_AMOUNT = {table}.TOTAL_AMOUNT + excluded.TOTAL_AMOUNT,
+                GIFT_COUNT   = {table}.GIFT_COUNT + 1;
+        """
+        removed += f"""
+            UPDATE {table}
+            SET TOTAL_AMOUNT = TOTAL_AMOUNT - old.AMOUNT,
+                GIFT_COUNT   = GIFT_COUNT - 1
+            WHERE PERIOD = {period.format(row="old")};
+            DELETE FROM {table}
+            WHERE PERIOD = {period.format(row="old")} AND GIFT_COUNT <= 0;
+        """
+    added += f"""
+        INSERT INTO CONTRIBUTION_CAMPAIGN (CAMPAIGNID, TOTAL_AMOUNT, GIFT_COUNT, LAST_GIFT_DATE)
+        VALUES (new.CAMPAIGNID, new.AMOUNT, 1, new.CONTRIBUTIONDATE)
+        ON CONFLICT (CAMPAIGNID) DO UPDATE SET
+            TOTAL_AMOUNT   = CONTRIBUTION_CAMPAIGN.TOTAL_AMOUNT + excluded.TOTAL_AMOUNT,
+            GIFT_COUNT     = CONTRIBUTION_CAMPAIGN.GIFT_COUNT + 1,
+            LAST_GIFT_DATE = {_GREATEST}(
+                COALESCE(CONTRIBUTION_CAMPAIGN.LAST_GIFT_DATE, ''), excluded.LAST_GIFT_DATE
+            );
+    """
+    removed += """
+        UPDATE CONTRIBUTION_CAMPAIGN
+        SET TOTAL_AMOUNT   = TOTAL_AMOUNT - old.AMOUNT,
+            GIFT_COUNT     = GIFT_COUNT - 1,
+            LAST_GIFT_DATE = (
+                SELECT MAX(CONTRIBUTIONDATE) FROM CONTRIBUTION
+                WHERE CAMPAIGNID = old.CAMPAIGNID
+            )
+        WHERE CAMPAIGNID = old.CAMPAIGNID;
+        DELETE FROM CONTRIBUTION_CAMPAIGN
+        WHERE CAMPAIGNID = old.CAMPAIGNID AND GIFT_COUNT <= 0;
+    """
+
+    triggers = {
+        "TR_ROLLUP_CONTRIBUTION_AI": ("AFTER INSERT ON CONTRIBUTION", added),
+        "TR_ROLLUP_CONTRIBUTION_AU": (
+            "AFTER UPDATE OF CAMPAIGNID, CONTRIBUTIONDATE, AMOUNT ON CONTRIBUTION",
+            removed + added,
+        ),
+        "TR_ROLLUP_CONTRIBUTION_AD": ("AFTER DELETE ON CONTRIBUTION", removed),
+    }
+    for name, (timing, body) in triggers.items():
+        _create_trigger(conn, name, timing, body)
+
+    _rebuild_contribution_rollups(conn)
 
-        # ---------- CAMPAIGN ----------
+
+def _migration_008_contribution_idempotency(conn) -> None:
+    """
+    Per-submission key on CONTRIBUTION so a replayed form submit cannot
+    record the same gift twice. Rows created before this have no key.
+    """
+    if "IDEMPOTENCY_KEY" not in _column_names(conn, "CONTRIBUTION"):
         conn.exec_driver_sql(
-            """
-            CREATE TABLE IF NOT EXISTS CAMPAIGN (
-                CAMPAIGNID   INTEGER PRIMARY KEY,
-                CAMPAIGNNAME TEXT NOT NULL,
-                GOALAMOUNT   REAL NOT NULL,
-                STATUS       TEXT NOT NULL
+            "ALTER TABLE CONTRIBUTION ADD COLUMN IDEMPOTENCY_KEY TEXT"
+        )
+    conn.exec_driver_sql(
+        "CREATE UNIQUE INDEX IF NOT EXISTS UX_CONTRIBUTION_IDEMPOTENCY_KEY "
+        "ON CONTRIBUTION (IDEMPOTENCY_KEY) WHERE IDEMPOTENCY_KEY IS NOT NULL"
+    )
+
+
+def _contribution_hash(alumni_id, campaign_id, amount, date_str) -> str:
+    """Digest of a gift's payload, stored next to its idempotency key."""
+    payload = f"{int(alumni_id)}|{int(campaign_id)}|{str(date_str)[:10]}|{float(amount)!r}"
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+# Base tables whose changes are counted in TABLE_VERSIONS.
+VERSIONED_TABLES = (
+    "ALUMNI", "DEGREE", "EMPLOYMENT", "ALUMNI_MEMBERSHIP", "CAMPAIGN", "CONTRIBUTION"
+)
+
+
+def _migration_009_table_versions(conn) -> None:
+    """
+    Per-table change counters bumped by triggers on every insert, update
+    and delete, so any process can tell whether a table changed since it
+    last looked (HTTP ETags, cross-process cache invalidation). Re-running
+    bumps every counter, as after a bulk load nothing can be assumed.
+    """
+    conn.exec_driver_sql(
+        """
+        CREATE TABLE IF NOT EXISTS TABLE_VERSIONS (
+            TABLE_NAME TEXT PRIMARY KEY,
+            VERSION    INTEGER NOT NULL
+        )
+        """
+    )
+    for table in VERSIONED_TABLES:
+        conn.execute(
+            text(
+                "INSERT INTO TABLE_VERSIONS (TABLE_NAME, VERSION) VALUES (:t, 0) "
+                "ON CONFLICT (TABLE_NAME) DO NOTHING"
+            ),
+            {"t": table},
+        )
+        bump = (
+            "UPDATE TABLE_VERSIONS SET VERSION = VERSION + 1 "
+            f"WHERE TABLE_NAME = '{table}';"
+        )
+        for suffix, action in (("AI", "INSERT"), ("AU", "UPDATE"), ("AD", "DELETE")):
+            _create_trigger(
+                conn, f"TR_VERSION_{table}_{suffix}", f"AFTER {action} ON {table}", bump
             )
-            """
+    conn.exec_driver_sql("UPDATE TABLE_VERSIONS SET VERSION = VERSION + 1")
+
+
+def _rebuild_campaign_donors(conn) -> None:
+    """Recompute CAMPAIGN_DONORS and CAMPAIGN_DONOR_COUNTS from CONTRIBUTION."""
+    conn.exec_driver_sql("DELETE FROM CAMPAIGN_DONORS")
+    conn.exec_driver_sql(
+        """
+        INSERT INTO CAMPAIGN_DONORS (CAMPAIGNID, ALUMNIID, GIFT_COUNT)
+        SELECT CAMPAIGNID, ALUMNIID, COUNT(*)
+        FROM CONTRIBUTION
+        WHERE CAMPAIGNID IS NOT NULL AND ALUMNIID IS NOT NULL
+        GROUP BY CAMPAIGNID, ALUMNIID
+        """
+    )
+    conn.exec_driver_sql("DELETE FROM CAMPAIGN_DONOR_COUNTS")
+    conn.exec_driver_sql(
+        """
+        INSERT INTO CAMPAIGN_DONOR_COUNTS (CAMPAIGNID, DONORS)
+        SELECT CAMPAIGNID, COUNT(*) FROM CAMPAIGN_DONORS GROUP BY CAMPAIGNID
+        """
+    )
+
+
+def _migration_010_campaign_donors(conn) -> None:
+    """
+    Distinct donors per campaign, maintained by triggers on CONTRIBUTION:
+    gifts per (campaign, alumni) pair, and per campaign the number of
+    pairs, which changes only when a donor's first gift arrives or last
+    gift goes. With CONTRIBUTION_CAMPAIGN this makes campaign progress a
+    lookup per campaign however many gifts there are.
+    """
+    conn.exec_driver_sql(
+        """
+        CREATE TABLE IF NOT EXISTS CAMPAIGN_DONORS (
+            CAMPAIGNID INTEGER NOT NULL,
+            ALUMNIID   INTEGER NOT NULL,
+            GIFT_COUNT INTEGER NOT NULL,
+            PRIMARY KEY (CAMPAIGNID, ALUMNIID)
+        )
+        """
+    )
+    conn.exec_driver_sql(
+        """
+        CREATE TABLE IF NOT EXISTS CAMPAIGN_DONOR_COUNTS (
+            CAMPAIGNID INTEGER PRIMARY KEY,
+            DONORS     INTEGER NOT NULL
+        )
+        """
+    )
+
+    # Each trigger only touches its own tables, so the result does not
+    # depend on the order triggers on CONTRIBUTION fire in.
+    pair = "CAMPAIGNID = {row}.CAMPAIGNID AND ALUMNIID = {row}.ALUMNIID"
+    added = f"""
+        INSERT INTO CAMPAIGN_DONORS (CAMPAIGNID, ALUMNIID, GIFT_COUNT)
+        SELECT new.CAMPAIGNID, new.ALUMNIID, 1
+        WHERE new.CAMPAIGNID IS NOT NULL AND new.ALUMNIID IS NOT NULL
+        ON CONFLICT (CAMPAIGNID, ALUMNIID) DO UPDATE SET
+            GIFT_COUNT = CAMPAIGN_DONORS.GIFT_COUNT + 1;
+        INSERT INTO CAMPAIGN_DONOR_COUNTS (CAMPAIGNID, DONORS)
+        SELECT new.CAMPAIGNID, 1
+        WHERE (SELECT GIFT_COUNT FROM CAMPAIGN_DONORS WHERE {pair.format(row="new")}) = 1
+        ON CONFLICT (CAMPAIGNID) DO UPDATE SET
+            DONORS = CAMPAIGN_DONOR_COUNTS.DONORS + 1;
+    """
+    removed = f"""
+        UPDATE CAMPAIGN_DONORS SET GIFT_COUNT = GIFT_COUNT - 1
+        WHERE {pair.format(row="old")};
+        UPDATE CAMPAIGN_DONOR_COUNTS SET DONORS = DONORS - 1
+        WHERE CAMPAIGNID = old.CAMPAIGNID
+          AND (SELECT GIFT_COUNT FROM CAMPAIGN_DONORS WHERE {pair.format(row="old")}) <= 0;
+        DELETE FROM CAMPAIGN_DONORS
+        WHERE {pair.format(row="old")} AND GIFT_COUNT <= 0;
+        DELETE FROM CAMPAIGN_DONOR_COUNTS
+        WHERE CAMPAIGNID = old.CAMPAIGNID AND DONORS <= 0;
+    """
+    triggers = {
+        "TR_DONORS_CONTRIBUTION_AI": ("AFTER INSERT ON CONTRIBUTION", added),
+        "TR_DONORS_CONTRIBUTION_AU": (
+            "AFTER UPDATE OF CAMPAIGNID, ALUMNIID ON CONTRIBUTION",
+            removed + added,
+        ),
+        "TR_DONORS_CONTRIBUTION_AD": ("AFTER DELETE ON CONTRIBUTION", removed),
+    }
+    for name, (timing, body) in triggers.items():
+        _create_trigger(conn, name, timing, body)
+
+    _rebuild_campaign_donors(conn)
+
+
+def _migration_011_contribution_payload_hash(conn) -> None:
+    """
+    IDEMPOTENCY_HASH, the payload digest a keyed gift was recorded with,
+    so a replay with the same key but different details is refused
+    rather than silently answered with the original gift. Backfilled for
+    existing keyed rows.
+    """
+    if "IDEMPOTENCY_HASH" not in _column_names(conn, "CONTRIBUTION"):
+        conn.exec_driver_sql("ALTER TABLE CONTRIBUTION ADD COLUMN IDEMPOTENCY_HASH TEXT")
+    rows = conn.exec_driver_sql(
+        "SELECT CONTRIBUTIONID, ALUMNIID, CAMPAIGNID, AMOUNT, CONTRIBUTIONDATE "
+        "FROM CONTRIBUTION "
+        "WHERE IDEMPOTENCY_KEY IS NOT NULL AND IDEMPOTENCY_HASH IS NULL"
+    ).fetchall()
+    if rows:
+        conn.execute(
+            text("UPDATE CONTRIBUTION SET IDEMPOTENCY_HASH = :hash WHERE CONTRIBUTIONID = :id"),
+            [{"id": row[0], "hash": _contribution_hash(*row[1:])} for row in rows],
         )
 
-        # ---------- CONTRIBUTION ----------
+
+# Ordered (version, description, step). Steps must be idempotent so a
+# half-upgraded file can simply be migrated again. Append only — never
+# renumber or edit a step that has shipped.
+MIGRATIONS = [
+    (1, "base tables", _migration_001_base_tables),
+    (2, "ALUMNI.LINKEDIN column", _migration_002_linkedin_column),
+    (3, "foreign-key and date indexes", _migration_003_lookup_indexes),
+    (4, "directory grad-year index", _migration_004_directory_indexes),
+    (5, "alumni full-text search index", _migration_005_alumni_search),
+    (6, "dashboard summary counters", _migration_006_summary_counters),
+    (7, "contribution rollup tables", _migration_007_contribution_rollups),
+    (8, "contribution idempotency key", _migration_008_contribution_idempotency),
+    (9, "per-table change counters", _migration_009_table_versions),
+    (10, "campaign donor counters", _migration_010_campaign_donors),
+    (11, "contribution payload hash", _migration_011_contribution_payload_hash),
+]
+
+LATEST_SCHEMA_VERSION = MIGRATIONS[-1][0]
+
+
+def get_schema_version() -> int:
+    """Highest migration applied to the database, or 0 for a fresh file."""
+    with engine.connect() as conn:
+        if not _has_table(conn, SCHEMA_VERSION_TABLE):
+            return 0
+        version = conn.exec_driver_sql(
+            f"SELECT MAX(VERSION) FROM {SCHEMA_VERSION_TABLE}"
+        ).scalar()
+    return int(version or 0)
+
+
+def migrate() -> int:
+    """
+    Bring the schema up to LATEST_SCHEMA_VERSION, one transaction per step.
+    Returns the resulting schema version.
+    """
+    global _search_index_available
+
+    with engine.begin() as conn:
         conn.exec_driver_sql(
-            """
-            CREATE TABLE IF NOT EXISTS CONTRIBUTION (
-                CONTRIBUTIONID   INTEGER PRIMARY KEY,
-                ALUMNIID         INTEGER NOT NULL,
-                CAMPAIGNID       INTEGER NOT NULL,
-                CONTRIBUTIONDATE TEXT NOT NULL,
-                AMOUNT           REAL NOT NULL,
-                FOREIGN KEY (ALUMNIID)  REFERENCES ALUMNI(ALUMNIID),
-                FOREIGN KEY (CAMPAIGNID) REFERENCES CAMPAIGN(CAMPAIGNID)
+            f"""
+            CREATE TABLE IF NOT EXISTS {SCHEMA_VERSION_TABLE} (
+                VERSION     INTEGER PRIMARY KEY,
+                DESCRIPTION TEXT NOT NULL,
+                APPLIED_AT  TEXT NOT NULL DEFAULT CURRENT_TIMESTAMP
             )
             """
         )
 
+    current = get_schema_version()
+    for version, description, step in MIGRATIONS:
+        if version <= current:
+            continue
+        with engine.begin() as conn:
+            step(conn)
+            conn.execute(
+                text(
+                    f"INSERT INTO {SCHEMA_VERSION_TABLE} (VERSION, DESCRIPTION) "
+                    "VALUES (:version, :description) ON CONFLICT (VERSION) DO NOTHING"
+                ),
+                {"version": version, "description": description},
+            )
+        current = version
+
+    _search_index_available = None
+    return current
+
+
+def init_db() -> None:
+    """
+    Migrate the schema to the latest version and seed demo data once.
+    This function is safe to call multiple times.
+    """
+    migrate()
+
     # After schema is in place, seed data & LinkedIn demo
     seed_demo_data()
     ensure_linkedin_demo()
 
 
+_bootstrap_lock = threading.Lock()
+_bootstrap_timings: dict = {}
+
+
+def bootstrap() -> dict:
+    """
+    Run init_db() once per process and schema version.
+
+    Streamlit re-executes the app script on every interaction, so the
+    script calls this instead of init_db(); after the first call it only
+    returns the recorded startup timings (in milliseconds).
+    """
+    if LATEST_SCHEMA_VERSION in _bootstrap_timings:
+        return _bootstrap_timings[LATEST_SCHEMA_VERSION]
+
+    with _bootstrap_lock:
+        if LATEST_SCHEMA_VERSION in _bootstrap_timings:
+            return _bootstrap_timings[LATEST_SCHEMA_VERSION]
+
+        started = time.perf_counter()
+        version = migrate()
+        migrated = time.perf_counter()
+        seed_demo_data()
+        ensure_linkedin_demo()
+        finished = time.perf_counter()
+
+        timings = {
+            "schema_version": version,
+            "migrate_ms": (migrated - started) * 1000,
+            "seed_ms": (finished - migrated) * 1000,
+            "total_ms": (finished - started) * 1000,
+        }
+        logger.info(
+            "Database bootstrap finished in %.1f ms (schema v%d)",
+            timings["total_ms"],
+            version,
+        )
+        _bootstrap_timings[LATEST_SCHEMA_VERSION] = timings
+        return timings
+
+
+def rebuild_summaries() -> None:
+    """
+    Recompute every trigger-maintained summary (dashboard counters,
+    contribution rollups and campaign donors) from the base tables. Run
+    after backfills or any load that bypassed the triggers.
+    """
+    with engine.begin() as conn:
+        _rebuild_summary_counters(conn)
+        _rebuild_contribution_rollups(conn)
+        _rebuild_campaign_donors(conn)
+    _bump_tables("ALUMNI", "EMPLOYMENT", "CONTRIBUTION")
+
+
+def sync_id_sequences() -> None:
+    """
+    Let the database continue assigning CONTRIBUTIONIDs after the largest
+    existing one. Needed on PostgreSQL after inserting explicit ids.
+    """
+    with engine.begin() as conn:
+        _sync_id_sequences(conn)
+
+
+# Migrations that install maintenance triggers; each one also backfills
+# what its triggers maintain, so re-running them is a full rebuild.
+_TRIGGER_MIGRATIONS = (
+    _migration_005_alumni_search,
+    _migration_006_summary_counters,
+    _migration_007_contribution_rollups,
+    _migration_009_table_versions,
+    _migration_010_campaign_donors,
+)
+
+
+@contextmanager
+def deferred_maintenance():
+    """
+    Drop the maintenance triggers for the duration of a bulk load, then
+    recreate them and rebuild the search index, counters and rollups in
+    one set-based pass. Per-row trigger work dominates large loads.
+    Run it with the app stopped: other writers' changes would go untracked
+    until the rebuild.
+    """
+    with engine.begin() as conn:
+        for name, table in _maintenance_triggers(conn):
+            _drop_trigger(conn, name, table)
+    try:
+        yield
+    finally:
+        with engine.begin() as conn:
+            for step in _TRIGGER_MIGRATIONS:
+                step(conn)
+            _sync_id_sequences(conn)
+        clear_query_cache()
+
+
 def seed_demo_data() -> None:
     """Insert a small set of demo rows if each table is empty."""
     with engine.begin() as conn:
@@ -216,6 +1192,12 @@ def seed_demo_data() -> None:
                     (9003, 1003, 5002, '2024-05-01', 1000.00)
                 """
             )
+            _sync_id_sequences(conn)
+
+    _bump_tables(
+        "ALUMNI", "DEGREE", "EMPLOYMENT", "ALUMNI_MEMBERSHIP", "CAMPAIGN", "CONTRIBUTION"
+    )
+
 
 def ensure_linkedin_demo() -> None:
     """
@@ -235,38 +1217,560 @@ def ensure_linkedin_demo() -> None:
         except Exception:
             # If the table/column isn't present, just ignore.
             pass
+    _bump_tables("ALUMNI")
+
+
+# ---------------------------------------------
+# Query result cache
+# ---------------------------------------------
+
+# Each table has a generation counter that write helpers bump. Cached
+# results are keyed on the generations of the tables they read, so a
+# write makes every dependent entry unreachable and it ages out of the LRU.
+# Counters are per process: writes made by other processes are not seen.
+QUERY_CACHE_MAX_ENTRIES = 128
+
+_cache_lock = threading.Lock()
+_table_generations: dict = {}
+_query_cache: "OrderedDict[tuple, object]" = OrderedDict()
+_cache_stats = {"hits": 0, "misses": 0, "evictions": 0}
+
+
+def _bump_tables(*tables: str) -> None:
+    """Invalidate cached results that depend on any of ``tables``."""
+    with _cache_lock:
+        for table in tables:
+            _table_generations[table] = _table_generations.get(table, 0) + 1
+
+
+def _copy_result(value):
+    # Callers are free to mutate what they get back (the dashboard adds
+    # columns to contribution frames), so never hand out the cached object.
+    # Frames are copied shallowly: under pandas 3's copy-on-write (hence
+    # pandas>=3 in requirements.txt) the data is shared until someone writes.
+    if isinstance(value, tuple):
+        return tuple(_copy_result(v) for v in value)
+    if isinstance(value, dict):
+        return {k: _copy_result(v) for k, v in value.items()}
+    if isinstance(value, pd.DataFrame):
+        return value.copy(deep=False)
+    if isinstance(value, list):
+        return value.copy()
+    return value
+
+
+def cached_query(*tables: str):
+    """Cache a read helper's result until one of ``tables`` is written."""
+
+    def decorator(func):
+        params = signature(func)
+
+        def lookup(args, kwargs, count_miss):
+            # Positional, keyword and defaulted spellings of a call share a key.
+            bound = params.bind(*args, **kwargs)
+            bound.apply_defaults()
+            arguments = tuple(bound.arguments.items())
+            with _cache_lock:
+                generations = tuple(_table_generations.get(t, 0) for t in tables)
+                key = (func.__name__, arguments, generations)
+                if key in _query_cache:
+                    _query_cache.move_to_end(key)
+                    _cache_stats["hits"] += 1
+                    return key, True, _copy_result(_query_cache[key])
+                if count_miss:
+                    _cache_stats["misses"] += 1
+            return key, False, None
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            key, hit, cached = lookup(args, kwargs, count_miss=True)
+            if hit:
+                return cached
+
+            result = func(*args, **kwargs)
+
+            with _cache_lock:
+                _query_cache[key] = result
+                _query_cache.move_to_end(key)
+                while len(_query_cache) > QUERY_CACHE_MAX_ENTRIES:
+                    _query_cache.popitem(last=False)
+                    _cache_stats["evictions"] += 1
+            return _copy_result(result)
+
+        def cached(*args, **kwargs) -> tuple[bool, object]:
+            """``(True, result)`` on a cache hit, else ``(False, None)``."""
+            _, hit, cached = lookup(args, kwargs, count_miss=False)
+            return hit, cached
+
+        # Lets callers that must first acquire a connection (db_async)
+        # skip that on a hit.
+        wrapper.cached = cached
+        wrapper.tables = tables
+        return wrapper
+
+    return decorator
+
+
+def clear_query_cache() -> None:
+    """Drop every cached result, e.g. after loading data outside db.py."""
+    with _cache_lock:
+        _query_cache.clear()
+        for table in list(_table_generations):
+            _table_generations[table] += 1
+
+
+_seen_table_versions: dict = {}
+
+
+def sync_table_versions() -> dict:
+    """
+    The TABLE_VERSIONS change counters, by table name. Cached results for
+    tables whose counter moved since the previous call are invalidated,
+    so writes made by other processes become visible here too. Returns
+    an empty dict on a database that predates the counters.
+    """
+    with engine.connect() as conn:
+        try:
+            rows = conn.exec_driver_sql(
+                "SELECT TABLE_NAME, VERSION FROM TABLE_VERSIONS"
+            ).fetchall()
+        except Exception:
+            return {}
+    versions = {str(name).upper(): int(version) for name, version in rows}
+    with _cache_lock:
+        changed = [t for t, v in versions.items() if _seen_table_versions.get(t) != v]
+        _seen_table_versions.update(versions)
+    if changed:
+        _bump_tables(*changed)
+    return versions
+
+
+def get_query_cache_stats() -> dict:
+    """Hit/miss/eviction counters plus the current number of entries."""
+    with _cache_lock:
+        return {**_cache_stats, "entries": len(_query_cache)}
+
+
+# ---------------------------------------------
+# Connections for the helpers
+# ---------------------------------------------
+
+# db_async binds a connection of its async engine here and calls the
+# helpers below through run_bound(); each helper then runs its queries on
+# that connection instead of checking one out of ``engine``. A context
+# variable keeps concurrent tasks and threads apart.
+_bound_connection: ContextVar = ContextVar("alumni_db_bound_connection", default=None)
+
+
+@contextmanager
+def _connect(begin: bool = False):
+    """
+    The connection one helper call runs on: the bound one if any, else a
+    pooled connection from ``engine``, in a transaction when ``begin``.
+    """
+    bound = _bound_connection.get()
+    if bound is not None and begin:
+        with bound.begin():
+            yield bound
+    elif bound is not None:
+        yield bound
+    elif begin:
+        with engine.begin() as conn:
+            yield conn
+    else:
+        with engine.connect() as conn:
+            yield conn
+
+
+def run_bound(conn, helper, *args, **kwargs):
+    """
+    Call ``helper`` with every query it issues running on ``conn``, a
+    synchronous Connection outside any transaction; write helpers commit
+    on it before returning.
+    """
+    token = _bound_connection.set(conn)
+    try:
+        return helper(*args, **kwargs)
+    finally:
+        _bound_connection.reset(token)
+
+
+# ---------------------------------------------
+# Shared alumni names
+# ---------------------------------------------
+
+# Every alumni id and name, loaded once per process and shared by every
+# session for the profile picker and typeahead; rebuilt on first use
+# after a write to ALUMNI. Unlike query cache entries it is never evicted.
+class _AlumniData(NamedTuple):
+    generation: int
+    # Every ALUMNIID, ascending.
+    ids: np.ndarray
+    # ALUMNIID -> "First Last", for labelling pickers in O(1) per id.
+    names: Mapping[int, str]
+    # Casefolded "first last" per row position, for the typeahead.
+    search_names: pd.Series
+    # Trigram index of search_names under "FULLNAME", built on first use.
+    indexes: dict
+
+
+_shared_lock = threading.Lock()
+_shared_data: _AlumniData | None = None
+
+
+def _alumni_data() -> _AlumniData:
+    global _shared_data
+    with _cache_lock:
+        generation = _table_generations.get("ALUMNI", 0)
+    current = _shared_data
+    if current is None or current.generation != generation:
+        with _shared_lock:
+            current = _shared_data
+            if current is None or current.generation != generation:
+                with _connect() as conn:
+                    frame = _read_sql(
+                        "SELECT ALUMNIID, FIRSTNAME, LASTNAME FROM ALUMNI ORDER BY ALUMNIID",
+                        conn,
+                    )
+                full_names = (
+                    frame["FIRSTNAME"].fillna("") + " " + frame["LASTNAME"].fillna("")
+                ).str.strip()
+                current = _shared_data = _AlumniData(
+                    generation,
+                    frame["ALUMNIID"].to_numpy(dtype=np.int64),
+                    MappingProxyType(dict(zip(frame["ALUMNIID"].tolist(), full_names))),
+                    full_names.str.casefold(),
+                    {},
+                )
+    return current
+
+
+def _name_index(data: _AlumniData) -> TrigramIndex:
+    """Trigram index of ``data.search_names`` for the typeahead."""
+    index = data.indexes.get("FULLNAME")
+    if index is None:
+        with _shared_lock:
+            index = data.indexes.get("FULLNAME")
+            if index is None:
+                index = data.indexes["FULLNAME"] = TrigramIndex(data.search_names)
+    return index
+
+
+def alumni_names() -> Mapping[int, str]:
+    """Read-only ALUMNIID -> "First Last" index of the shared alumni data."""
+    return _alumni_data().names
+
+
+def suggest_alumni(query: str, limit: int = 20) -> list[int]:
+    """
+    Up to ``limit`` alumni ids for a typeahead, best matches first.
+
+    ``query`` is matched case-insensitively anywhere in "first last";
+    names starting with it rank first, then names with a word starting
+    with it, ties in ALUMNIID order. A numeric query also matches that
+    ALUMNIID exactly. An empty query returns the first ids.
+    """
+    data = _alumni_data()
+    ids = data.ids
+    term = " ".join(query.casefold().split())
+    if not term:
+        return ids[:limit].tolist()
+
+    hits = np.flatnonzero(_name_index(data).match(term))
+    candidates = data.search_names.iloc[hits]
+    rank = np.where(
+        candidates.str.startswith(term).to_numpy(),
+        0,
+        np.where(candidates.str.contains(f" {term}", regex=False).to_numpy(), 1, 2),
+    )
+    best = ids[hits[np.argsort(rank, kind="stable")[:limit]]].tolist()
+    if term.isdigit():
+        position = np.searchsorted(ids, int(term))
+        if position < len(ids) and ids[position] == int(term):
+            best = [int(term)] + [i for i in best if i != int(term)][: limit - 1]
+    return best
+
 
 # ---------------------------------------------
 # Data access helpers used by Streamlit app
 # ---------------------------------------------
 
+@cached_query("ALUMNI")
 def get_alumni() -> pd.DataFrame:
-    return pd.read_sql("SELECT * FROM ALUMNI", engine)
+    with _connect() as conn:
+        return _read_sql("SELECT * FROM ALUMNI", conn)
 
 
-def get_alumni_by_id(alumni_id: int) -> pd.DataFrame:
-    sql = text("SELECT * FROM ALUMNI WHERE ALUMNIID = :aid")
-    return pd.read_sql(sql, engine, params={"aid": alumni_id})
+DIRECTORY_COLUMNS = [
+    "ALUMNIID", "FIRSTNAME", "LASTNAME", "PRIMARYEMAIL", "ALUM_GRADYEAR", "GRAD_MAJOR"
+]
 
 
-def get_degrees_for_alumni(alumni_id: int) -> pd.DataFrame:
-    sql = text("SELECT * FROM DEGREE WHERE ALUMNIID = :aid")
-    return pd.read_sql(sql, engine, params={"aid": alumni_id})
+# Characters in names and majors that FTS5 splits words on; the LIKE
+# fallback turns them into spaces so both backends see the same words.
+_WORD_BREAKS = "-'.,/&()"
 
 
-def get_employment_for_alumni(alumni_id: int) -> pd.DataFrame:
-    sql = text("SELECT * FROM EMPLOYMENT WHERE ALUMNIID = :aid")
-    return pd.read_sql(sql, engine, params={"aid": alumni_id})
+def _word_text(columns: tuple[str, ...]) -> str:
+    """SQL for ``columns`` lowercased and joined, with a space before every word."""
+    expr = " || ' ' || ".join(f"COALESCE(LOWER({c}), '')" for c in columns)
+    for char in _WORD_BREAKS:
+        quoted = char.replace("'", "''")
+        expr = f"REPLACE({expr}, '{quoted}', ' ')"
+    return f"(' ' || {expr})"
 
 
-def get_memberships_for_alumni(alumni_id: int) -> pd.DataFrame:
-    sql = text("SELECT * FROM ALUMNI_MEMBERSHIP WHERE ALUMNIID = :aid")
-    return pd.read_sql(sql, engine, params={"aid": alumni_id})
+def _like_words(term: str, columns: tuple[str, ...], key: str) -> tuple[list[str], dict]:
+    """
+    LIKE clauses matching every word of ``term`` as the prefix of a word
+    in ``columns``, as _fts_terms does with FTS5.
+    """
+    words = re.findall(r"\w+", term.lower())
+    haystack = _word_text(columns)
+    clauses, params = [], {}
+    for i, word in enumerate(words):
+        escaped = word.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+        clauses.append(f"{haystack} LIKE :{key}{i} ESCAPE '\\'")
+        params[f"{key}{i}"] = f"% {escaped}%"
+    return clauses, params
 
 
-def get_contributions_for_alumni(alumni_id: int) -> pd.DataFrame:
+_search_index_available: bool | None = None
+
+
+def _has_search_index() -> bool:
+    global _search_index_available
+    if _search_index_available is None:
+        with _connect() as conn:
+            _search_index_available = _has_table(conn, SEARCH_TABLE)
+    return _search_index_available
+
+
+def _fts_terms(term: str, columns: str | None = None) -> str | None:
+    """
+    Turn free text into an FTS5 query: every word must match as a prefix,
+    optionally restricted to ``columns`` (e.g. "FIRSTNAME LASTNAME").
+    """
+    words = re.findall(r"\w+", term.lower())
+    if not words:
+        return None
+    expr = " ".join(f'"{w}"*' for w in words)
+    return f"{{{columns}}} : ({expr})" if columns else expr
+
+
+def _directory_filters(
+    name: str | None, major: str | None, grad_year: int | None
+) -> tuple[list[str], dict]:
+    """
+    WHERE clauses for the directory and mailing list: every word of
+    ``name`` must start a word of the first or last name, and every word
+    of ``major`` a word of the major, case-insensitively; the same rows
+    whether FTS5 or the LIKE fallback does the matching.
+    """
+    clauses, params = [], {}
+    if _has_search_index():
+        match = [
+            expr
+            for expr in (
+                _fts_terms(name or "", "FIRSTNAME LASTNAME"),
+                _fts_terms(major or "", "GRAD_MAJOR"),
+            )
+            if expr
+        ]
+        if match:
+            clauses.append(
+                f"ALUMNIID IN (SELECT rowid FROM {SEARCH_TABLE} "
+                f"WHERE {SEARCH_TABLE} MATCH :match)"
+            )
+            params["match"] = " AND ".join(match)
+    else:
+        for term, columns, key in (
+            (name, ("FIRSTNAME", "LASTNAME"), "name"),
+            (major, ("GRAD_MAJOR",), "major"),
+        ):
+            like, like_params = _like_words(term or "", columns, key)
+            clauses += like
+            params.update(like_params)
+    if grad_year is not None:
+        clauses.append("ALUM_GRADYEAR = :year")
+        params["year"] = int(grad_year)
+    return clauses, params
+
+
+@cached_query("ALUMNI")
+def get_alumni_page(
+    name: str | None = None,
+    major: str | None = None,
+    grad_year: int | None = None,
+    after_id: int | None = None,
+    page_size: int = 50,
+) -> tuple[pd.DataFrame, int]:
+    """
+    One page of the alumni directory, filtered in SQL.
+
+    Rows come back in ALUMNIID order starting after ``after_id`` (keyset
+    pagination), so every page is an index range scan regardless of depth.
+    Returns the page and the total number of rows matching the filters.
+    """
+    clauses, params = _directory_filters(name, major, grad_year)
+    where = " AND ".join(clauses) or "1 = 1"
+
+    page_clauses = list(clauses)
+    page_params = dict(params, limit=int(page_size))
+    if after_id is not None:
+        page_clauses.append("ALUMNIID > :after")
+        page_params["after"] = int(after_id)
+    page_where = " AND ".join(page_clauses) or "1 = 1"
+
+    with _connect() as conn:
+        total = conn.execute(
+            text(f"SELECT COUNT(*) FROM ALUMNI WHERE {where}"), params
+        ).scalar() or 0
+        page = _read_sql(
+            text(
+                f"SELECT {', '.join(DIRECTORY_COLUMNS)} FROM ALUMNI "
+                f"WHERE {page_where} ORDER BY ALUMNIID LIMIT :limit"
+            ),
+            conn,
+            params=page_params,
+        )
+    return page, int(total)
+
+
+@cached_query("ALUMNI", "EMPLOYMENT")
+def search_alumni(query: str, limit: int = 20) -> pd.DataFrame:
+    """
+    Ranked full-text search over name, email, major and employer.
+    Every word in ``query`` is matched as a prefix; best matches first.
+    """
+    columns = ", ".join(f"A.{c}" for c in DIRECTORY_COLUMNS)
+    if not _has_search_index():
+        clauses, params = _directory_filters(query, None, None)
+        sql = (
+            f"SELECT {columns} FROM ALUMNI A WHERE {' AND '.join(clauses) or '1 = 1'} "
+            "ORDER BY A.LASTNAME, A.FIRSTNAME LIMIT :limit"
+        )
+        with _connect() as conn:
+            return _read_sql(text(sql), conn, params=dict(params, limit=int(limit)))
+
+    match = _fts_terms(query)
+    if match is None:
+        return apply_dtypes(pd.DataFrame(columns=DIRECTORY_COLUMNS))
+    sql = f"""
+        SELECT {columns}
+        FROM {SEARCH_TABLE} S
+        JOIN ALUMNI A ON A.ALUMNIID = S.rowid
+        WHERE {SEARCH_TABLE} MATCH :match
+        ORDER BY S.rank
+        LIMIT :limit
+    """
+    with _connect() as conn:
+        return _read_sql(text(sql), conn, params={"match": match, "limit": int(limit)})
+
+
+@cached_query("ALUMNI")
+def get_alumni_grad_years() -> list[int]:
+    """Distinct graduation years, ascending, for the directory filters."""
+    with _connect() as conn:
+        rows = conn.exec_driver_sql(
+            "SELECT DISTINCT ALUM_GRADYEAR FROM ALUMNI "
+            "WHERE ALUM_GRADYEAR IS NOT NULL ORDER BY ALUM_GRADYEAR"
+        ).fetchall()
+    return [int(r[0]) for r in rows]
+
+
+MAILING_LIST_COLUMNS = [
+    "FIRSTNAME", "LASTNAME", "PRIMARYEMAIL", "ALUM_GRADYEAR", "GRAD_MAJOR", "MAILING_LIST"
+]
+
+
+def _mailing_list_filters(
+    major: str | None, grad_year: int | None, opted_in_only: bool
+) -> tuple[str, dict]:
+    clauses, params = _directory_filters(None, major, grad_year)
+    if opted_in_only:
+        clauses.append("MAILING_LIST = 'Yes'")
+    return " AND ".join(clauses) or "1 = 1", params
+
+
+@cached_query("ALUMNI")
+def get_mailing_list_preview(
+    major: str | None = None,
+    grad_year: int | None = None,
+    opted_in_only: bool = True,
+    limit: int = 100,
+) -> tuple[pd.DataFrame, int]:
+    """First ``limit`` rows of the mailing list and the full row count."""
+    where, params = _mailing_list_filters(major, grad_year, opted_in_only)
+    with _connect() as conn:
+        total = conn.execute(
+            text(f"SELECT COUNT(*) FROM ALUMNI WHERE {where}"), params
+        ).scalar() or 0
+        preview = _read_sql(
+            text(
+                f"SELECT {', '.join(MAILING_LIST_COLUMNS)} FROM ALUMNI "
+                f"WHERE {where} ORDER BY ALUMNIID LIMIT :limit"
+            ),
+            conn,
+            params=dict(params, limit=int(limit)),
+        )
+    return preview, int(total)
+
+
+def iter_mailing_list_csv(
+    major: str | None = None,
+    grad_year: int | None = None,
+    opted_in_only: bool = True,
+    chunk_size: int = 10_000,
+) -> Iterator[bytes]:
+    """
+    Stream the filtered mailing list as UTF-8 CSV, header first.
+
+    Rows are fetched from a server-side cursor ``chunk_size`` at a time and
+    encoded chunk by chunk, so memory stays flat however long the list is.
+    """
+    where, params = _mailing_list_filters(major, grad_year, opted_in_only)
     sql = text(
-        """
+        f"SELECT {', '.join(MAILING_LIST_COLUMNS)} FROM ALUMNI "
+        f"WHERE {where} ORDER BY ALUMNIID"
+    )
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(MAILING_LIST_COLUMNS)
+
+    with engine.connect() as conn:
+        result = conn.execution_options(stream_results=True).execute(sql, params)
+        while True:
+            rows = result.fetchmany(chunk_size)
+            if not rows:
+                break
+            writer.writerows(rows)
+            yield buffer.getvalue().encode("utf-8")
+            buffer.seek(0)
+            buffer.truncate()
+
+    if buffer.tell():
+        yield buffer.getvalue().encode("utf-8")
+
+
+def export_mailing_list(path: Path | str, **filters) -> int:
+    """Write the filtered mailing list CSV to ``path``; returns bytes written."""
+    written = 0
+    with open(path, "wb") as fh:
+        for chunk in iter_mailing_list_csv(**filters):
+            fh.write(chunk)
+            written += len(chunk)
+    return written
+
+
+# Per-alumni queries, shared by the single-table helpers below and by
+# load_alumni_profile().
+_PROFILE_QUERIES = {
+    "alumni": "SELECT * FROM ALUMNI WHERE ALUMNIID = :aid",
+    "degrees": "SELECT * FROM DEGREE WHERE ALUMNIID = :aid",
+    "employment": "SELECT * FROM EMPLOYMENT WHERE ALUMNIID = :aid",
+    "memberships": "SELECT * FROM ALUMNI_MEMBERSHIP WHERE ALUMNIID = :aid",
+    "contributions": """
         SELECT
             C.CONTRIBUTIONDATE,
             C.AMOUNT,
@@ -275,15 +1779,82 @@ def get_contributions_for_alumni(alumni_id: int) -> pd.DataFrame:
         JOIN CAMPAIGN   M ON C.CAMPAIGNID = M.CAMPAIGNID
         WHERE C.ALUMNIID = :aid
         ORDER BY C.CONTRIBUTIONDATE DESC
-        """
-    )
-    return pd.read_sql(sql, engine, params={"aid": alumni_id})
+    """,
+}
+
+
+def get_alumni_by_id(alumni_id: int) -> pd.DataFrame:
+    sql = text(_PROFILE_QUERIES["alumni"])
+    with _connect() as conn:
+        return _read_sql(sql, conn, params={"aid": alumni_id})
+
+
+def get_degrees_for_alumni(alumni_id: int) -> pd.DataFrame:
+    sql = text(_PROFILE_QUERIES["degrees"])
+    with _connect() as conn:
+        return _read_sql(sql, conn, params={"aid": alumni_id})
+
+
+def get_employment_for_alumni(alumni_id: int) -> pd.DataFrame:
+    sql = text(_PROFILE_QUERIES["employment"])
+    with _connect() as conn:
+        return _read_sql(sql, conn, params={"aid": alumni_id})
+
+
+def get_memberships_for_alumni(alumni_id: int) -> pd.DataFrame:
+    sql = text(_PROFILE_QUERIES["memberships"])
+    with _connect() as conn:
+        return _read_sql(sql, conn, params={"aid": alumni_id})
+
+
+def get_contributions_for_alumni(alumni_id: int) -> pd.DataFrame:
+    sql = text(_PROFILE_QUERIES["contributions"])
+    with _connect() as conn:
+        return _read_sql(sql, conn, params={"aid": alumni_id})
+
+
+@contextmanager
+def read_transaction():
+    """
+    Connection inside one read transaction, so several SELECTs see the
+    same snapshot. pysqlite only opens a transaction on its own before
+    DML, so for SQLite the BEGIN is issued explicitly; PostgreSQL needs
+    REPEATABLE READ, as READ COMMITTED snapshots every statement anew.
+    """
+    with _connect() as conn:
+        if IS_SQLITE:
+            conn.exec_driver_sql("BEGIN")
+        else:
+            conn.execution_options(isolation_level="REPEATABLE READ")
+        try:
+            yield conn
+        finally:
+            conn.rollback()
+
+
+@cached_query(
+    "ALUMNI", "DEGREE", "EMPLOYMENT", "ALUMNI_MEMBERSHIP", "CONTRIBUTION", "CAMPAIGN"
+)
+def load_alumni_profile(alumni_id: int) -> dict:
+    """
+    Everything the profile view needs, fetched over one connection.
+
+    Returns a dict with the same frames the single-table helpers return,
+    under the keys "alumni", "degrees", "employment", "memberships" and
+    "contributions". "alumni" is empty when the id does not exist.
+    """
+    params = {"aid": int(alumni_id)}
+    with read_transaction() as conn:
+        return {
+            key: _read_sql(text(sql), conn, params=params)
+            for key, sql in _PROFILE_QUERIES.items()
+        }
 
 
 def update_alumni_contact(
     alumni_id: int, email: str, phone: str, mailing_list: str
 ) -> None:
-    with engine.begin() as conn:
+    with _connect(begin=True) as conn:
         conn.execute(
             text(
                 """
@@ -296,44 +1867,131 @@ def update_alumni_contact(
             ),
             {"email": email, "phone": phone, "ml": mailing_list, "aid": alumni_id},
         )
+    _bump_tables("ALUMNI")
 
 
+@cached_query("CAMPAIGN")
 def get_campaigns() -> pd.DataFrame:
-    return pd.read_sql("SELECT * FROM CAMPAIGN", engine)
+    with _connect() as conn:
+        return _read_sql("SELECT * FROM CAMPAIGN", conn)
+
+
+@cached_query("CAMPAIGN", "CONTRIBUTION")
+def get_campaign_progress() -> pd.DataFrame:
+    """
+    Every campaign with its live progress: CAMPAIGNID, CAMPAIGNNAME,
+    GOALAMOUNT, STATUS, RAISED, DONORS, GIFTS, PERCENT_OF_GOAL (NaN
+    without a goal) and LAST_GIFT_DATE (NaT before the first gift).
+
+    Read from the trigger-maintained per-campaign rollups, one row each;
+    on a database that predates them the same figures are aggregated
+    from CONTRIBUTION instead.
+    """
+    percent = (
+        "CASE WHEN M.GOALAMOUNT > 0 THEN 100.0 * {raised} / M.GOALAMOUNT END AS PERCENT_OF_GOAL"
+    )
+    rollup_sql = f"""
+        SELECT M.CAMPAIGNID, M.CAMPAIGNNAME, M.GOALAMOUNT, M.STATUS,
+               COALESCE(R.TOTAL_AMOUNT, 0) AS RAISED,
+               COALESCE(D.DONORS, 0) AS DONORS,
+               COALESCE(R.GIFT_COUNT, 0) AS GIFTS,
+               {percent.format(raised="COALESCE(R.TOTAL_AMOUNT, 0)")},
+               R.LAST_GIFT_DATE
+        FROM CAMPAIGN M
+        LEFT JOIN CONTRIBUTION_CAMPAIGN R ON R.CAMPAIGNID = M.CAMPAIGNID
+        LEFT JOIN CAMPAIGN_DONOR_COUNTS D ON D.CAMPAIGNID = M.CAMPAIGNID
+        ORDER BY M.CAMPAIGNID
+    """
+    aggregate_sql = f"""
+        SELECT M.CAMPAIGNID, M.CAMPAIGNNAME, M.GOALAMOUNT, M.STATUS,
+               COALESCE(SUM(C.AMOUNT), 0) AS RAISED,
+               COUNT(DISTINCT C.ALUMNIID) AS DONORS,
+               COUNT(C.CONTRIBUTIONID) AS GIFTS,
+               {percent.format(raised="COALESCE(SUM(C.AMOUNT), 0)")},
+               MAX(C.CONTRIBUTIONDATE) AS LAST_GIFT_DATE
+        FROM CAMPAIGN M
+        LEFT JOIN CONTRIBUTION C ON C.CAMPAIGNID = M.CAMPAIGNID
+        GROUP BY M.CAMPAIGNID, M.CAMPAIGNNAME, M.GOALAMOUNT, M.STATUS
+        ORDER BY M.CAMPAIGNID
+    """
+    with _connect() as conn:
+        try:
+            return _read_sql(rollup_sql, conn)
+        except Exception:
+            conn.rollback()
+            return _read_sql(aggregate_sql, conn)
+
+
+class IdempotencyConflict(ValueError):
+    """An idempotency key was replayed with a different gift."""
 
 
 def create_contribution(
-    alumni_id: int, campaign_id: int, amount: float, date_str: str
-) -> None:
-    """Insert a new contribution record."""
-    with engine.begin() as conn:
-        next_id = conn.execute(
-            text(
-                "SELECT COALESCE(MAX(CONTRIBUTIONID), 9000) + 1 AS nid "
-                "FROM CONTRIBUTION"
-            )
-        ).scalar()
+    alumni_id: int,
+    campaign_id: int,
+    amount: float,
+    date_str: str,
+    idempotency_key: str | None = None,
+) -> int:
+    """
+    Insert a new contribution record and return its CONTRIBUTIONID.
 
-        conn.execute(
+    The id is assigned by the database (rowid / identity column), so
+    concurrent sessions never race for it. When ``idempotency_key`` is
+    given and a row with that key already exists, nothing is inserted and
+    the existing id is returned, or IdempotencyConflict is raised if that
+    row was recorded with a different alumni, campaign, amount or date.
+    """
+    params = {
+        "aid": int(alumni_id),
+        "camp": int(campaign_id),
+        "cdate": date_str,
+        "amt": float(amount),
+        "key": idempotency_key,
+        "hash": (
+            _contribution_hash(alumni_id, campaign_id, amount, date_str)
+            if idempotency_key is not None
+            else None
+        ),
+    }
+    with _connect(begin=True) as conn:
+        new_id = conn.execute(
             text(
                 """
                 INSERT INTO CONTRIBUTION (
-                    CONTRIBUTIONID, ALUMNIID, CAMPAIGNID,
-                    CONTRIBUTIONDATE, AMOUNT
+                    ALUMNIID, CAMPAIGNID, CONTRIBUTIONDATE, AMOUNT,
+                    IDEMPOTENCY_KEY, IDEMPOTENCY_HASH
                 )
-                VALUES (:cid, :aid, :camp, :cdate, :amt)
+                VALUES (:aid, :camp, :cdate, :amt, :key, :hash)
+                ON CONFLICT (IDEMPOTENCY_KEY) WHERE IDEMPOTENCY_KEY IS NOT NULL
+                DO NOTHING
+                RETURNING CONTRIBUTIONID
                 """
             ),
-            {
-                "cid": int(next_id),
-                "aid": int(alumni_id),
-                "camp": int(campaign_id),
-                "cdate": date_str,
-                "amt": float(amount),
-            },
-        )
+            params,
+        ).scalar()
 
+        if new_id is None:
+            # Replay of a submission that was already recorded. Imported
+            # keyed rows carry no hash and are taken as matching.
+            existing_id, recorded = conn.execute(
+                text(
+                    "SELECT CONTRIBUTIONID, IDEMPOTENCY_HASH FROM CONTRIBUTION "
+                    "WHERE IDEMPOTENCY_KEY = :key"
+                ),
+                params,
+            ).one()
+            if recorded is not None and recorded != params["hash"]:
+                raise IdempotencyConflict(
+                    f"Idempotency key {idempotency_key!r} was already used for a different gift"
+                )
+            return int(existing_id)
+
+    _bump_tables("CONTRIBUTION")
+    return int(new_id)
 
+
+@cached_query("CONTRIBUTION", "ALUMNI", "CAMPAIGN")
 def get_all_contributions() -> pd.DataFrame:
     sql = """
         SELECT
@@ -347,31 +2005,33 @@ def get_all_contributions() -> pd.DataFrame:
         JOIN CAMPAIGN M ON C.CAMPAIGNID = M.CAMPAIGNID
         ORDER BY C.CONTRIBUTIONDATE DESC
     """
-    return pd.read_sql(sql, engine)
+    with _connect() as conn:
+        return _read_sql(sql, conn)
+
+
+@cached_query("CONTRIBUTION")
+def get_contribution_trend(grain: str = "daily") -> pd.DataFrame:
+    """
+    Contribution totals per day or month from the rollup tables.
+    Columns: PERIOD (datetime), AMOUNT, GIFTS; oldest period first.
+    """
+    table, _ = ROLLUP_GRAINS[grain]
+    with _connect() as conn:
+        return _read_sql(
+            f"SELECT PERIOD, TOTAL_AMOUNT AS AMOUNT, GIFT_COUNT AS GIFTS "
+            f"FROM {table} ORDER BY PERIOD",
+            conn,
+        )
 
+
+@cached_query("EMPLOYMENT")
 def get_employer_summary() -> pd.DataFrame:
     """
     Return a summary of how many alumni work at each employer.
     Defensive: if the EMPLOYMENT table or needed columns are missing,
-    returns an empty DataFrame instead of crashing.
+    the query fails and an empty DataFrame is returned instead of
+    crashing, so no separate existence probe is needed.
     """
-    # Step 1 — Make sure EMPLOYMENT table exists
-    try:
-        with engine.begin() as conn:
-            row = conn.exec_driver_sql(
-                """
-                SELECT name FROM sqlite_master
-                WHERE type='table' AND name='EMPLOYMENT';
-                """
-            ).fetchone()
-
-        if not row:
-            return pd.DataFrame(columns=["EMPLOYERNAME", "INDUSTRY", "NUM_ALUMNI"])
-
-    except Exception:
-        return pd.DataFrame(columns=["EMPLOYERNAME", "INDUSTRY", "NUM_ALUMNI"])
-
-    # Step 2 — Run the summary query
     sql = """
         SELECT
             EMPLOYERNAME,
@@ -382,62 +2042,86 @@ def get_employer_summary() -> pd.DataFrame:
         ORDER BY NUM_ALUMNI DESC;
     """
 
-    try:
-        df = pd.read_sql(sql, engine)
-        return df
-    except Exception:
-        return pd.DataFrame(columns=["EMPLOYERNAME", "INDUSTRY", "NUM_ALUMNI"])
+    with _connect() as conn:
+        try:
+            return _read_sql(sql, conn)
+        except Exception:
+            conn.rollback()
+            empty = pd.DataFrame(columns=["EMPLOYERNAME", "INDUSTRY", "NUM_ALUMNI"])
+            return apply_dtypes(empty)
+
 
+@cached_query("ALUMNI", "CAMPAIGN", "CONTRIBUTION", "EMPLOYMENT")
 def get_summary_stats() -> dict:
     """
-    Aggregates used by the admin dashboard metrics.
-    All queries are wrapped so a missing column/table doesn't crash the app.
+    Aggregates used by the admin dashboard metrics, in one round trip.
+
+    Totals come from the trigger-maintained SUMMARY_COUNTERS and
+    EMPLOYER_COUNTS tables; on a database that predates them the same
+    figures are aggregated from the base tables instead. Anything that
+    still fails yields zeros rather than crashing the app.
+    """
+    counters_sql = """
+        SELECT
+            (SELECT VALUE FROM SUMMARY_COUNTERS WHERE NAME = 'alumni'),
+            (SELECT COUNT(*) FROM EMPLOYER_COUNTS),
+            (SELECT COUNT(*) FROM CAMPAIGN WHERE STATUS = 'Active'),
+            (SELECT VALUE FROM SUMMARY_COUNTERS WHERE NAME = 'contribution_amount')
+    """
+    aggregate_sql = """
+        SELECT
+            (SELECT COUNT(*) FROM ALUMNI),
+            (SELECT COUNT(DISTINCT EMPLOYERNAME) FROM EMPLOYMENT),
+            (SELECT COUNT(*) FROM CAMPAIGN WHERE STATUS = 'Active'),
+            (SELECT COALESCE(SUM(AMOUNT), 0) FROM CONTRIBUTION)
     """
-    with engine.begin() as conn:
-        # Total alumni
-        try:
-            total_alumni = conn.execute(
-                text("SELECT COUNT(*) FROM ALUMNI")
-            ).scalar() or 0
-        except Exception:
-            total_alumni = 0
 
-        # Active campaigns (fallback to all campaigns if STATUS missing)
-        try:
-            active_campaigns = conn.execute(
-                text("SELECT COUNT(*) FROM CAMPAIGN WHERE STATUS = 'Active'")
-            ).scalar() or 0
-        except Exception:
+    row = None
+    with _connect() as conn:
+        for sql in (counters_sql, aggregate_sql):
             try:
-                active_campaigns = conn.execute(
-                    text("SELECT COUNT(*) FROM CAMPAIGN")
-                ).scalar() or 0
+                row = conn.exec_driver_sql(sql).fetchone()
+                break
             except Exception:
-                active_campaigns = 0
-
-        # Total contributions
-        try:
-            total_contributions = conn.execute(
-                text("SELECT COALESCE(SUM(AMOUNT), 0) FROM CONTRIBUTION")
-            ).scalar() or 0.0
-        except Exception:
-            total_contributions = 0.0
-
-    # Employers: count distinct employers, but be defensive
-    try:
-        emp_df = pd.read_sql("SELECT * FROM EMPLOYMENT", engine)
-        if emp_df.empty:
-            total_employers = 0
-        elif "EMPLOYERNAME" in emp_df.columns:
-            total_employers = emp_df["EMPLOYERNAME"].nunique()
-        else:
-            total_employers = emp_df["ALUMNIID"].nunique()
-    except Exception:
-        total_employers = 0
+                conn.rollback()
 
+    total_alumni, total_employers, active_campaigns, total_contributions = (
+        row or (0, 0, 0, 0.0)
+    )
     return {
-        "total_alumni": int(total_alumni),
-        "total_employers": int(total_employers),
-        "total_campaigns": int(active_campaigns),
-        "total_contributions": float(total_contributions),
+        "total_alumni": int(total_alumni or 0),
+        "total_employers": int(total_employers or 0),
+        "total_campaigns": int(active_campaigns or 0),
+        "total_contributions": float(total_contributions or 0.0),
     }
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Alumni portal database maintenance")
+    parser.add_argument(
+        "command",
+        choices=["migrate", "rebuild-summaries", "export-mailing-list"],
+        help="migrate: apply pending schema migrations; "
+        "rebuild-summaries: recompute counters and contribution rollups; "
+        "export-mailing-list: write the filtered mailing list CSV to --out",
+    )
+    parser.add_argument("--out", default="mailing_list.csv", help="mailing list CSV path")
+    parser.add_argument("--major", help="mailing list major filter (word prefixes)")
+    parser.add_argument("--grad-year", type=int, help="mailing list graduation year")
+    parser.add_argument(
+        "--all", action="store_true", help="include alumni who did not opt in"
+    )
+    args = parser.parse_args()
+
+    if args.command == "migrate":
+        print(f"Schema version {migrate()}")
+    elif args.command == "rebuild-summaries":
+        rebuild_summaries()
+        print("Summary counters and contribution rollups rebuilt")
+    elif args.command == "export-mailing-list":
+        size = export_mailing_list(
+            args.out, major=args.major, grad_year=args.grad_year, opted_in_only=not args.all
+        )
+        print(f"Wrote {size:,} bytes to {args.out}")
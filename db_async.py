@@ -0,0 +1,162 @@
+"""
+Asyncio counterparts of the db.py read and write helpers.
+
+Each coroutine runs the db.py helper of the same name on a connection
+from an async engine (aiosqlite for SQLite, asyncpg for PostgreSQL) via
+SQLAlchemy's run_sync, so the SQL, the return shapes and the query cache
+are those of db.py, and the event loop never waits on database I/O.
+Cache hits are answered without checking out a connection at all.
+
+The engine uses the URL and pool settings of db.py, switched to the async
+driver; set ALUMNI_DB_ASYNC_URL to override the URL. Requires the
+aiosqlite (or asyncpg) package and greenlet.
+
+    import db_async
+    profile = await db_async.load_alumni_profile(1001)
+"""
+
+import os
+from typing import Callable
+
+import pandas as pd
+from sqlalchemy import event, make_url
+from sqlalchemy.ext.asyncio import create_async_engine
+
+import db
+import query_stats
+
+ASYNC_DRIVERS = {"sqlite": "aiosqlite", "postgresql": "asyncpg"}
+
+
+def async_url(url=db.DB_URL):
+    """``url`` with its driver replaced by the asyncio one for its backend."""
+    backend = url.get_backend_name()
+    if backend not in ASYNC_DRIVERS:
+        raise ValueError(f"No asyncio driver configured for {backend!r} databases")
+    return url.set(drivername=f"{backend}+{ASYNC_DRIVERS[backend]}")
+
+
+ASYNC_DB_URL = make_url(os.environ.get("ALUMNI_DB_ASYNC_URL") or async_url())
+
+_options = db.engine_options(ASYNC_DB_URL)
+# The counting connection is a sqlite3 factory; aiosqlite manages its own.
+_options.pop("connect_args", None)
+async_engine = create_async_engine(ASYNC_DB_URL, **_options)
+
+if db.IS_SQLITE:
+    event.listen(async_engine.sync_engine, "connect", db._apply_sqlite_pragmas)
+if query_stats.ENABLED:
+    query_stats.instrument(async_engine.sync_engine)
+
+
+async def _call(helper: Callable, *args, **kwargs):
+    """Run a db.py helper on a connection of the async engine."""
+    cached = getattr(helper, "cached", None)
+    if cached is not None:
+        hit, result = cached(*args, **kwargs)
+        if hit:
+            return result
+    async with async_engine.connect() as conn:
+        return await conn.run_sync(db.run_bound, helper, *args, **kwargs)
+
+
+async def get_alumni() -> pd.DataFrame:
+    return await _call(db.get_alumni)
+
+
+async def get_alumni_page(
+    name: str | None = None,
+    major: str | None = None,
+    grad_year: int | None = None,
+    after_id: int | None = None,
+    page_size: int = 50,
+) -> tuple[pd.DataFrame, int]:
+    return await _call(db.get_alumni_page, name, major, grad_year, after_id, page_size)
+
+
+async def search_alumni(query: str, limit: int = 20) -> pd.DataFrame:
+    return await _call(db.search_alumni, query, limit)
+
+
+async def get_alumni_grad_years() -> list[int]:
+    return await _call(db.get_alumni_grad_years)
+
+
+async def get_mailing_list_preview(
+    major: str | None = None,
+    grad_year: int | None = None,
+    opted_in_only: bool = True,
+    limit: int = 100,
+) -> tuple[pd.DataFrame, int]:
+    return await _call(db.get_mailing_list_preview, major, grad_year, opted_in_only, limit)
+
+
+async def get_alumni_by_id(alumni_id: int) -> pd.DataFrame:
+    return await _call(db.get_alumni_by_id, alumni_id)
+
+
+async def get_degrees_for_alumni(alumni_id: int) -> pd.DataFrame:
+    return await _call(db.get_degrees_for_alumni, alumni_id)
+
+
+async def get_employment_for_alumni(alumni_id: int) -> pd.DataFrame:
+    return await _call(db.get_employment_for_alumni, alumni_id)
+
+
+async def get_memberships_for_alumni(alumni_id: int) -> pd.DataFrame:
+    return await _call(db.get_memberships_for_alumni, alumni_id)
+
+
+async def get_contributions_for_alumni(alumni_id: int) -> pd.DataFrame:
+    return await _call(db.get_contributions_for_alumni, alumni_id)
+
+
+async def load_alumni_profile(alumni_id: int) -> dict:
+    return await _call(db.load_alumni_profile, alumni_id)
+
+
+async def update_alumni_contact(
+    alumni_id: int, email: str, phone: str, mailing_list: str
+) -> None:
+    await _call(db.update_alumni_contact, alumni_id, email, phone, mailing_list)
+
+
+async def get_campaigns() -> pd.DataFrame:
+    return await _call(db.get_campaigns)
+
+
+async def get_campaign_progress() -> pd.DataFrame:
+    return await _call(db.get_campaign_progress)
+
+
+async def create_contribution(
+    alumni_id: int,
+    campaign_id: int,
+    amount: float,
+    date_str: str,
+    idempotency_key: str | None = None,
+) -> int:
+    return await _call(
+        db.create_contribution, alumni_id, campaign_id, amount, date_str, idempotency_key
+    )
+
+
+async def get_all_contributions() -> pd.DataFrame:
+    return await _call(db.get_all_contributions)
+
+
+async def get_contribution_trend(grain: str = "daily") -> pd.DataFrame:
+    return await _call(db.get_contribution_trend, grain)
+
+
+async def get_employer_summary() -> pd.DataFrame:
+    return await _call(db.get_employer_summary)
+
+
+async def get_summary_stats() -> dict:
+    return await _call(db.get_summary_stats)
+
+
+async def dispose() -> None:
+    """Close the pooled connections, e.g. on service shutdown."""
+    await async_engine.dispose()
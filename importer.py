@@ -0,0 +1,274 @@
+"""
+Chunked bulk import of registrar and advancement exports.
+
+Reads CSV or Parquet files chunk by chunk, coerces each chunk to the
+column types of the target table, and upserts it with executemany in one
+transaction per chunk, so memory stays bounded however large the file is.
+
+    python importer.py ALUMNI alumni.csv
+    python importer.py CONTRIBUTION gifts.parquet --chunk-size 100000
+"""
+
+import argparse
+import time
+from pathlib import Path
+from typing import Iterator
+
+import pandas as pd
+
+from sqlalchemy import text
+
+from db import clear_query_cache, deferred_maintenance, engine, sync_id_sequences
+
+# Column types per table; the first column is the primary key. Columns in
+# REQUIRED must be present and non-null for a row to be imported.
+TABLE_COLUMNS = {
+    "ALUMNI": {
+        "ALUMNIID": "int",
+        "FIRSTNAME": "str",
+        "LASTNAME": "str",
+        "PRIMARYEMAIL": "str",
+        "PHONE": "str",
+        "GRAD_MAJOR": "str",
+        "ALUM_GRADYEAR": "int",
+        "MAILING_LIST": "yes_no",
+        "LINKEDIN": "str",
+    },
+    "DEGREE": {
+        "DEGREEID": "int",
+        "ALUMNIID": "int",
+        "MAJOR": "str",
+        "MINOR": "str",
+        "SCHOOL": "str",
+        "HONORS": "str",
+        "GRADMONTH": "str",
+        "GRADYEAR": "int",
+    },
+    "EMPLOYMENT": {
+        "EMPLOYMENTID": "int",
+        "ALUMNIID": "int",
+        "EMPLOYERNAME": "str",
+        "TITLE": "str",
+        "INDUSTRY": "str",
+        "CITY": "str",
+        "STATE": "str",
+        "STARTYEAR": "int",
+    },
+    "ALUMNI_MEMBERSHIP": {
+        "MEMBERSHIPID": "int",
+        "ALUMNIID": "int",
+        "ORGNAME": "str",
+        "ROLE": "str",
+        "STARTYEAR": "int",
+        "ENDYEAR": "int",
+    },
+    "CAMPAIGN": {
+        "CAMPAIGNID": "int",
+        "CAMPAIGNNAME": "str",
+        "GOALAMOUNT": "float",
+        "STATUS": "str",
+    },
+    "CONTRIBUTION": {
+        "CONTRIBUTIONID": "int",
+        "ALUMNIID": "int",
+        "CAMPAIGNID": "int",
+        "CONTRIBUTIONDATE": "date",
+        "AMOUNT": "float",
+        "IDEMPOTENCY_KEY": "str",
+    },
+}
+
+REQUIRED = {
+    "ALUMNI": ["ALUMNIID", "FIRSTNAME", "LASTNAME", "PRIMARYEMAIL"],
+    "DEGREE": ["DEGREEID", "ALUMNIID"],
+    "EMPLOYMENT": ["EMPLOYMENTID", "ALUMNIID"],
+    "ALUMNI_MEMBERSHIP": ["MEMBERSHIPID", "ALUMNIID"],
+    "CAMPAIGN": ["CAMPAIGNID", "CAMPAIGNNAME", "GOALAMOUNT", "STATUS"],
+    "CONTRIBUTION": ["ALUMNIID", "CAMPAIGNID", "CONTRIBUTIONDATE", "AMOUNT"],
+}
+
+# Spellings accepted for yes_no columns, stored as exactly "Yes" or "No"
+# because every mailing list filter compares against 'Yes'.
+YES_NO = {
+    "yes": "Yes", "y": "Yes", "true": "Yes", "t": "Yes", "1": "Yes",
+    "no": "No", "n": "No", "false": "No", "f": "No", "0": "No",
+}
+
+DEFAULT_CHUNK_SIZE = 50_000
+
+
+def read_chunks(path: Path, chunk_size: int = DEFAULT_CHUNK_SIZE) -> Iterator[pd.DataFrame]:
+    """Yield DataFrames of at most ``chunk_size`` rows from a CSV or Parquet file."""
+    suffix = path.suffix.lower()
+    if suffix == ".csv":
+        yield from pd.read_csv(path, chunksize=chunk_size, dtype=str, keep_default_na=True)
+    elif suffix in (".parquet", ".pq"):
+        try:
+            import pyarrow.parquet as pq
+        except ImportError as exc:
+            raise RuntimeError("Parquet import requires the pyarrow package") from exc
+        for batch in pq.ParquetFile(path).iter_batches(batch_size=chunk_size):
+            yield batch.to_pandas()
+    else:
+        raise ValueError(f"Unsupported file type {suffix!r}; expected .csv or .parquet")
+
+
+def _exact_int(value):
+    try:
+        number = int(str(value).strip())
+    except ValueError:
+        return pd.NA
+    return number if -(2**63) <= number < 2**63 else pd.NA
+
+
+def _to_int(values: pd.Series) -> pd.Series:
+    """``values`` as Int64; fractions and anything beyond int64 become NA."""
+    numbers = pd.to_numeric(values, errors="coerce")
+    if pd.api.types.is_signed_integer_dtype(numbers.dtype):
+        return numbers.astype("Int64")
+    numbers = numbers.astype("float64")
+    fits = (numbers.abs() < 2.0**63) & (numbers % 1 == 0)
+    result = numbers.where(fits).astype("Int64")
+    # Past 2**53 a float no longer holds every integer, so parse those exactly.
+    large = numbers.abs() >= 2.0**53
+    if large.any():
+        result = result.mask(large, values[large].map(_exact_int).astype("Int64"))
+    return result
+
+
+def coerce_chunk(table: str, chunk: pd.DataFrame) -> tuple[pd.DataFrame, int, int]:
+    """
+    Align ``chunk`` to the table's columns and types.
+
+    Headers are matched case-insensitively; unknown columns are dropped.
+    Values that cannot be converted (including non-integral or out of
+    range integers) become NULL, and rows missing a required value are
+    rejected, as are rows with a NULL primary key when the file has that
+    column and rows whose yes/no value is not one of YES_NO. Returns the
+    clean frame, the number of rejected rows and the number of values
+    set to NULL because they could not be converted.
+    """
+    columns = TABLE_COLUMNS[table]
+    chunk = chunk.rename(columns=lambda c: str(c).strip().upper())
+    present = [c for c in columns if c in chunk.columns]
+    missing = [c for c in REQUIRED[table] if c not in present]
+    if missing:
+        raise ValueError(f"{table} import is missing required columns: {', '.join(missing)}")
+
+    # A NULL id would not fall back to the generated one; it is simply bad.
+    required = list(REQUIRED[table])
+    pk = next(iter(columns))
+    if pk in present and pk not in required:
+        required.append(pk)
+
+    out = pd.DataFrame(index=chunk.index)
+    valid = pd.Series(True, index=chunk.index)
+    nulled = 0
+    for col in present:
+        kind = columns[col]
+        values = chunk[col]
+        if kind in ("int", "float", "date"):
+            if kind == "int":
+                out[col] = _to_int(values)
+            elif kind == "float":
+                out[col] = pd.to_numeric(values, errors="coerce")
+            else:
+                out[col] = pd.to_datetime(values, errors="coerce").dt.strftime("%Y-%m-%d")
+            given = values.notna() & values.astype("string").str.strip().ne("")
+            nulled += int((given & out[col].isna()).sum())
+        elif kind == "yes_no":
+            out[col] = values.astype("string").str.strip().str.lower().map(YES_NO)
+            valid &= out[col].notna()
+        else:
+            out[col] = values.astype("string").str.strip().replace("", pd.NA)
+
+    valid &= out[required].notna().all(axis=1)
+    return out[valid], int((~valid).sum()), nulled
+
+
+def _upsert_sql(table: str, cols: list[str]) -> str:
+    pk = next(iter(TABLE_COLUMNS[table]))
+    placeholders = ", ".join(f":{c}" for c in cols)
+    sql = f"INSERT INTO {table} ({', '.join(cols)}) VALUES ({placeholders})"
+    if pk in cols:
+        updates = ", ".join(f"{c} = excluded.{c}" for c in cols if c != pk)
+        sql += f" ON CONFLICT ({pk}) DO " + (f"UPDATE SET {updates}" if updates else "NOTHING")
+    elif "IDEMPOTENCY_KEY" in cols:
+        # Gift exports without our ids: the submission key keeps reruns from
+        # recording the same gift twice.
+        sql += " ON CONFLICT (IDEMPOTENCY_KEY) WHERE IDEMPOTENCY_KEY IS NOT NULL DO NOTHING"
+    return sql
+
+
+def import_file(
+    table: str, path: Path | str, chunk_size: int = DEFAULT_CHUNK_SIZE
+) -> dict:
+    """
+    Stream ``path`` into ``table``, upserting on the primary key.
+
+    Each chunk is written in its own transaction, so an interrupted import
+    keeps the chunks already committed and can simply be rerun. Files
+    without the primary-key column are appended with database-assigned
+    ids (contributions are then deduplicated on IDEMPOTENCY_KEY, if the
+    file has one). Returns row counts, the number of values set to NULL,
+    elapsed seconds and rows per second.
+    """
+    table = table.upper()
+    if table not in TABLE_COLUMNS:
+        raise ValueError(f"Unknown table {table!r}; expected one of {', '.join(TABLE_COLUMNS)}")
+
+    read = written = rejected = nulled = 0
+    started = time.perf_counter()
+    for chunk in read_chunks(Path(path), chunk_size):
+        clean, bad, unconverted = coerce_chunk(table, chunk)
+        read += len(chunk)
+        rejected += bad
+        nulled += unconverted
+        if clean.empty:
+            continue
+
+        cols = list(clean.columns)
+        rows = clean.astype(object).where(clean.notna(), None).to_dict("records")
+        with engine.begin() as conn:
+            conn.execute(text(_upsert_sql(table, cols)), rows)
+        written += len(rows)
+
+    if table == "CONTRIBUTION":
+        sync_id_sequences()
+    elapsed = time.perf_counter() - started
+    clear_query_cache()
+    return {
+        "table": table,
+        "rows_read": read,
+        "rows_written": written,
+        "rows_rejected": rejected,
+        "values_nulled": nulled,
+        "seconds": elapsed,
+        "rows_per_sec": written / elapsed if elapsed else 0.0,
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Bulk import CSV/Parquet into the alumni database")
+    parser.add_argument("table", choices=sorted(TABLE_COLUMNS), type=str.upper)
+    parser.add_argument("path", type=Path)
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE)
+    parser.add_argument(
+        "--defer-triggers",
+        action="store_true",
+        help="drop maintenance triggers during the load and rebuild once at the end "
+        "(faster for large files; stop the app first)",
+    )
+    args = parser.parse_args()
+
+    if args.defer_triggers:
+        with deferred_maintenance():
+            result = import_file(args.table, args.path, args.chunk_size)
+    else:
+        result = import_file(args.table, args.path, args.chunk_size)
+    print(
+        f"{result['table']}: {result['rows_written']:,} rows written, "
+        f"{result['rows_rejected']:,} rejected, "
+        f"{result['values_nulled']:,} unconvertible values set to NULL, "
+        f"{result['seconds']:.1f} s ({result['rows_per_sec']:,.0f} rows/sec)"
+    )
@@ -0,0 +1,80 @@
+"""
+Concurrent loading of independent page panels.
+
+A PanelLoad starts every loader of a page at once on a shared, bounded
+thread pool, so the page waits for its slowest query rather than for the
+sum of all of them. The script then collects each panel where it renders
+it; a panel whose loader fails or misses its timeout comes back as an
+error message and the rest of the page renders normally.
+
+Loaders run on pool threads, so they must only fetch data (db.py helpers)
+and never call Streamlit. A timed-out loader cannot be interrupted: it
+keeps its worker until the query returns, and its result is discarded.
+Pool size and the default timeout come from ALUMNI_PANEL_WORKERS
+(default 4) and ALUMNI_PANEL_TIMEOUT_S (default 10).
+"""
+
+import logging
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeout
+from typing import Callable
+
+import profiling
+import query_stats
+
+PANEL_WORKERS = int(os.environ.get("ALUMNI_PANEL_WORKERS", "4"))
+PANEL_TIMEOUT_S = float(os.environ.get("ALUMNI_PANEL_TIMEOUT_S", "10"))
+
+logger = logging.getLogger(__name__)
+
+# One pool per process, shared by every session, so concurrent reruns
+# cannot open more than PANEL_WORKERS extra connections between them.
+_executor = ThreadPoolExecutor(max_workers=PANEL_WORKERS, thread_name_prefix="panel")
+
+
+def _run(loader: Callable[[], object], owner: int):
+    # Statements are recorded against the rerun's thread, so they still
+    # show up in that rerun's query list on the Performance page.
+    with query_stats.on_behalf_of(owner):
+        return loader()
+
+
+class PanelLoad:
+    """The loaders of one page, started together; collect each with result()."""
+
+    def __init__(
+        self,
+        loaders: dict[str, Callable[[], object]],
+        timeouts: dict[str, float] | None = None,
+    ) -> None:
+        started = time.monotonic()
+        owner = threading.get_ident()
+        timeouts = timeouts or {}
+        self._deadlines = {
+            name: started + timeouts.get(name, PANEL_TIMEOUT_S) for name in loaders
+        }
+        self._futures = {
+            name: _executor.submit(_run, loader, owner) for name, loader in loaders.items()
+        }
+
+    def result(self, name: str) -> tuple[object, str | None]:
+        """
+        ``(value, None)`` once the panel's loader has finished, or
+        ``(None, message)`` if it raised or missed its deadline. Time spent
+        blocked here counts as database time of the current rerun.
+        """
+        started = time.perf_counter()
+        try:
+            remaining = max(0.0, self._deadlines[name] - time.monotonic())
+            return self._futures[name].result(timeout=remaining), None
+        except FutureTimeout:
+            logger.warning("Panel %r missed its deadline", name)
+            return None, "took too long to load"
+        except Exception as exc:
+            logger.exception("Panel %r failed to load", name)
+            return None, f"failed to load ({type(exc).__name__})"
+        finally:
+            profiling.add_db_time((time.perf_counter() - started) * 1000)
@@ -0,0 +1,151 @@
+"""
+Lightweight rerun profiling for the Streamlit app.
+
+A RerunProfiler measures the wall time of one script rerun, of the page
+it rendered and of named sections inside it, and splits each figure into
+database time and render time. Database time is the time a pooled
+connection was checked out by the rerun's thread, which covers executing
+and fetching as well as building the DataFrame while the connection is
+held; cached results therefore count as render time.
+
+Reruns slower than ALUMNI_SLOW_RERUN_MS (default 500) are written as one
+JSON line each to ALUMNI_SLOW_RERUN_LOG (default slow_reruns.log),
+rotated at 5 MB with three backups, and the most recent ones are kept in
+memory for the Performance page.
+"""
+
+import json
+import logging
+import os
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from logging.handlers import RotatingFileHandler
+
+from sqlalchemy import event
+
+SLOW_RERUN_MS = float(os.environ.get("ALUMNI_SLOW_RERUN_MS", "500"))
+SLOW_RERUN_LOG = os.environ.get("ALUMNI_SLOW_RERUN_LOG", "slow_reruns.log")
+
+_local = threading.local()
+_recent_slow: deque = deque(maxlen=200)
+_recent_lock = threading.Lock()
+
+slow_rerun_logger = logging.getLogger("alumni_portal.slow_reruns")
+slow_rerun_logger.propagate = False
+
+
+def _ensure_log_handler() -> None:
+    if not slow_rerun_logger.handlers:
+        handler = RotatingFileHandler(
+            SLOW_RERUN_LOG, maxBytes=5 * 1024 * 1024, backupCount=3, encoding="utf-8"
+        )
+        handler.setFormatter(logging.Formatter("%(message)s"))
+        slow_rerun_logger.addHandler(handler)
+        slow_rerun_logger.setLevel(logging.INFO)
+
+
+def _on_checkout(dbapi_connection, connection_record, connection_proxy):
+    depth = getattr(_local, "depth", 0)
+    if depth == 0:
+        _local.checked_out_at = time.perf_counter()
+    _local.depth = depth + 1
+
+
+def _on_checkin(dbapi_connection, connection_record):
+    depth = getattr(_local, "depth", 0)
+    if depth == 0:
+        # Returned from another thread (e.g. garbage collection); not ours.
+        return
+    _local.depth = depth - 1
+    if depth == 1:
+        _local.db_ms = db_time_ms() + (time.perf_counter() - _local.checked_out_at) * 1000
+
+
+def instrument(engine) -> None:
+    """Track per-thread connection checkout time on ``engine`` (idempotent)."""
+    if not event.contains(engine, "checkout", _on_checkout):
+        event.listen(engine, "checkout", _on_checkout)
+        event.listen(engine, "checkin", _on_checkin)
+
+
+def db_time_ms() -> float:
+    """Database time accumulated by the current thread so far."""
+    return getattr(_local, "db_ms", 0.0)
+
+
+def add_db_time(ms: float) -> None:
+    """
+    Count ``ms`` as database time of the current thread, e.g. time spent
+    waiting for data loaded on another thread.
+    """
+    _local.db_ms = db_time_ms() + ms
+
+
+class RerunProfiler:
+    """Timings for one Streamlit rerun; create one at the top of the script."""
+
+    def __init__(self) -> None:
+        self.started = time.perf_counter()
+        self.db_started = db_time_ms()
+        self.page = None
+        self.page_started = None
+        self.page_db_started = None
+        self.sections = []
+
+    def start_page(self, page: str) -> None:
+        self.page = page
+        self.page_started = time.perf_counter()
+        self.page_db_started = db_time_ms()
+
+    @contextmanager
+    def section(self, name: str):
+        started, db_started = time.perf_counter(), db_time_ms()
+        try:
+            yield
+        finally:
+            wall = (time.perf_counter() - started) * 1000
+            db_ms = db_time_ms() - db_started
+            self.sections.append(
+                {
+                    "name": name,
+                    "wall_ms": round(wall, 2),
+                    "db_ms": round(db_ms, 2),
+                    "render_ms": round(wall - db_ms, 2),
+                }
+            )
+
+    def finish(self, **context) -> dict:
+        """
+        Close the rerun and return its record; slow reruns are also logged.
+        ``context`` (e.g. the user's role) is added to the record as is.
+        """
+        now, db_now = time.perf_counter(), db_time_ms()
+        total = (now - self.started) * 1000
+        db_total = db_now - self.db_started
+        record = {
+            "ts": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "page": self.page,
+            "total_ms": round(total, 2),
+            "db_ms": round(db_total, 2),
+            "render_ms": round(total - db_total, 2),
+            "sections": self.sections,
+            **context,
+        }
+        if self.page_started is not None:
+            record["page_ms"] = round((now - self.page_started) * 1000, 2)
+            record["page_db_ms"] = round(db_now - self.page_db_started, 2)
+
+        if total >= SLOW_RERUN_MS:
+            with _recent_lock:
+                _ensure_log_handler()
+                _recent_slow.append(record)
+            slow_rerun_logger.info(json.dumps(record))
+        return record
+
+
+def recent_slow_reruns() -> list[dict]:
+    """Slow reruns logged by this process, newest first."""
+    with _recent_lock:
+        return list(reversed(_recent_slow))
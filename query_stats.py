@@ -0,0 +1,215 @@
+"""
+Opt-in per-query latency instrumentation for the SQLAlchemy engine.
+
+Set ALUMNI_QUERY_STATS=1 and db.py attaches before/after cursor-execute
+hooks to its engine. Every statement is recorded with its fingerprint
+(whitespace collapsed, literals replaced by ?), duration, row count, the
+db.py helper that issued it and the thread that ran it. The latest
+records are kept in a ring buffer and every fingerprint keeps a running
+latency histogram; both are process-wide.
+"""
+
+import os
+import re
+import sqlite3
+import sys
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from itertools import count
+
+from sqlalchemy import event
+
+ENABLED = os.environ.get("ALUMNI_QUERY_STATS", "").lower() in ("1", "true", "yes", "on")
+RING_SIZE = int(os.environ.get("ALUMNI_QUERY_STATS_RING", "5000"))
+
+# Upper bounds of the histogram buckets, in milliseconds; the last bucket
+# collects everything slower.
+BUCKETS_MS = (1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000)
+
+# Frames from these modules are skipped when looking for the calling helper.
+_LIBRARY_MODULES = ("sqlalchemy", "pandas", "numpy", "contextlib", "functools", __name__)
+
+_lock = threading.Lock()
+_attribution = threading.local()
+_records: deque = deque(maxlen=RING_SIZE)
+_histograms: dict = {}
+_sequence = count(1)
+
+_LITERALS = re.compile(r"'(?:[^']|'')*'|\b\d+(?:\.\d+)?\b")
+_IN_LISTS = re.compile(r"\(\s*\?(?:\s*,\s*\?)+\s*\)")
+_WHITESPACE = re.compile(r"\s+")
+
+
+def fingerprint(statement: str) -> str:
+    """Normalise SQL so executions of the same statement group together."""
+    sql = _LITERALS.sub("?", statement)
+    sql = _IN_LISTS.sub("(...)", sql)
+    return _WHITESPACE.sub(" ", sql).strip()
+
+
+def _calling_helper() -> str:
+    """
+    The nearest public function outside the libraries, e.g.
+    "db.load_alumni_profile" rather than its comprehension or a private
+    helper it calls; falls back to the nearest non-library frame.
+    """
+    fallback = None
+    frame = sys._getframe(2)
+    while frame is not None:
+        module = frame.f_globals.get("__name__", "")
+        if not module.startswith(_LIBRARY_MODULES):
+            name = frame.f_code.co_name
+            if not name.startswith(("_", "<")):
+                return f"{module}.{name}"
+            fallback = fallback or f"{module}.{name}"
+        frame = frame.f_back
+    return fallback or "?"
+
+
+class CountingCursor(sqlite3.Cursor):
+    """sqlite3 cursor that counts fetched rows into the current record."""
+
+    stats_record = None
+
+    def _count(self, rows):
+        if self.stats_record is not None:
+            self.stats_record["rows"] = (self.stats_record["rows"] or 0) + len(rows)
+        return rows
+
+    def fetchone(self):
+        row = super().fetchone()
+        if row is not None:
+            self._count((row,))
+        return row
+
+    def fetchmany(self, size=None):
+        return self._count(super().fetchmany(self.arraysize if size is None else size))
+
+    def fetchall(self):
+        return self._count(super().fetchall())
+
+
+class CountingConnection(sqlite3.Connection):
+    """Pass as the sqlite3 connection factory so SELECT row counts are known."""
+
+    def cursor(self, factory=CountingCursor):
+        return super().cursor(factory)
+
+
+def _before_execute(conn, cursor, statement, parameters, context, executemany):
+    context._query_stats_started = time.perf_counter()
+
+
+def _after_execute(conn, cursor, statement, parameters, context, executemany):
+    started = getattr(context, "_query_stats_started", None)
+    if started is None:
+        return
+    duration_ms = (time.perf_counter() - started) * 1000
+
+    # SQLite reports rowcount -1 for SELECT; the counting cursor fills the
+    # count in as rows are fetched after this hook returns.
+    rowcount = cursor.rowcount if cursor.rowcount is not None and cursor.rowcount >= 0 else None
+    record = {
+        "seq": next(_sequence),
+        "at": time.time(),
+        "thread": getattr(_attribution, "thread", None) or threading.get_ident(),
+        "fingerprint": fingerprint(statement),
+        "helper": _calling_helper(),
+        "duration_ms": duration_ms,
+        "rows": rowcount,
+        "executemany": bool(executemany),
+    }
+    if rowcount is None and isinstance(cursor, CountingCursor):
+        cursor.stats_record = record
+
+    bucket = next((i for i, b in enumerate(BUCKETS_MS) if duration_ms <= b), len(BUCKETS_MS))
+    with _lock:
+        _records.append(record)
+        hist = _histograms.get(record["fingerprint"])
+        if hist is None:
+            hist = _histograms[record["fingerprint"]] = {
+                "fingerprint": record["fingerprint"],
+                "helpers": set(),
+                "calls": 0,
+                "total_ms": 0.0,
+                "max_ms": 0.0,
+                "buckets": [0] * (len(BUCKETS_MS) + 1),
+            }
+        hist["helpers"].add(record["helper"])
+        hist["calls"] += 1
+        hist["total_ms"] += duration_ms
+        hist["max_ms"] = max(hist["max_ms"], duration_ms)
+        hist["buckets"][bucket] += 1
+
+
+@contextmanager
+def on_behalf_of(thread: int):
+    """Record statements run inside the block as if ``thread`` had run them."""
+    previous = getattr(_attribution, "thread", None)
+    _attribution.thread = thread
+    try:
+        yield
+    finally:
+        _attribution.thread = previous
+
+
+def instrument(engine) -> None:
+    """Attach the recording hooks to ``engine`` (idempotent)."""
+    if not event.contains(engine, "before_cursor_execute", _before_execute):
+        event.listen(engine, "before_cursor_execute", _before_execute)
+        event.listen(engine, "after_cursor_execute", _after_execute)
+
+
+def mark() -> int:
+    """Sequence number to pass to records_since() later."""
+    with _lock:
+        return _records[-1]["seq"] if _records else 0
+
+
+def records_since(seq: int, thread: int | None = None) -> list[dict]:
+    """Records newer than ``seq``, optionally only those run on ``thread``."""
+    with _lock:
+        return [
+            dict(r)
+            for r in _records
+            if r["seq"] > seq and (thread is None or r["thread"] == thread)
+        ]
+
+
+def _bucket_percentile(buckets: list[int], calls: int, pct: float) -> float:
+    target = pct * calls
+    seen = 0
+    for i, n in enumerate(buckets):
+        seen += n
+        if seen >= target:
+            return float(BUCKETS_MS[i]) if i < len(BUCKETS_MS) else float("inf")
+    return float("inf")
+
+
+def statement_summary() -> list[dict]:
+    """
+    One row per fingerprint with call count, mean/max latency and the
+    histogram's p95 bucket bound, slowest mean first.
+    """
+    with _lock:
+        rows = [
+            {
+                "fingerprint": h["fingerprint"],
+                "helpers": ", ".join(sorted(h["helpers"])),
+                "calls": h["calls"],
+                "mean_ms": h["total_ms"] / h["calls"],
+                "p95_le_ms": _bucket_percentile(h["buckets"], h["calls"], 0.95),
+                "max_ms": h["max_ms"],
+                "total_ms": h["total_ms"],
+            }
+            for h in _histograms.values()
+        ]
+    return sorted(rows, key=lambda r: r["mean_ms"], reverse=True)
+
+
+def reset() -> None:
+    with _lock:
+        _records.clear()
+        _histograms.clear()
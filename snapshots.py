@@ -0,0 +1,405 @@
+"""
+Columnar Parquet snapshots of the tables the analytic reports read.
+
+The export job copies ALUMNI, EMPLOYMENT, CAMPAIGN and CONTRIBUTION from
+one read transaction into Parquet, contributions partitioned by year
+(``contribution/YEAR=2024/part-0.parquet``). Rows are streamed from the
+database in chunks, so memory stays bounded however large the tables
+are. Each export goes to a new directory that is switched in atomically
+through the CURRENT file, so readers never see a half-written snapshot;
+older snapshots beyond ``keep`` are removed.
+
+The report functions read the current snapshot memory-mapped, fetching
+only the columns they use and pushing filters down to the partition and
+row-group level, so heavy reporting stays off the transactional database.
+Their frames have the shapes and column types of the db.py helpers.
+Requires the pyarrow package; schedule the export (e.g. from cron) as
+often as the reports need to be fresh:
+
+    python snapshots.py export
+    python snapshots.py info
+"""
+
+import argparse
+import datetime
+import functools
+import importlib.util
+import json
+import os
+import shutil
+import time
+from pathlib import Path
+
+import pandas as pd
+
+import db
+
+SNAPSHOT_DIR = Path(os.environ.get("ALUMNI_SNAPSHOT_DIR", "snapshots"))
+DEFAULT_CHUNK_SIZE = 50_000
+DEFAULT_KEEP = 2
+
+# Exported columns and their Arrow types per table, with the ORDER BY of
+# the export. Dates are stored as date32; columns no report needs
+# (IDEMPOTENCY_KEY, IDEMPOTENCY_HASH) are left out.
+SNAPSHOT_TABLES = {
+    "ALUMNI": (
+        {
+            "ALUMNIID": "int64",
+            "FIRSTNAME": "string",
+            "LASTNAME": "string",
+            "PRIMARYEMAIL": "string",
+            "PHONE": "string",
+            "GRAD_MAJOR": "string",
+            "ALUM_GRADYEAR": "int64",
+            "MAILING_LIST": "string",
+            "LINKEDIN": "string",
+        },
+        "ALUMNIID",
+    ),
+    "EMPLOYMENT": (
+        {
+            "EMPLOYMENTID": "int64",
+            "ALUMNIID": "int64",
+            "EMPLOYERNAME": "string",
+            "TITLE": "string",
+            "INDUSTRY": "string",
+            "CITY": "string",
+            "STATE": "string",
+            "STARTYEAR": "int64",
+        },
+        "EMPLOYMENTID",
+    ),
+    "CAMPAIGN": (
+        {
+            "CAMPAIGNID": "int64",
+            "CAMPAIGNNAME": "string",
+            "GOALAMOUNT": "float64",
+            "STATUS": "string",
+        },
+        "CAMPAIGNID",
+    ),
+    # Date order keeps each row group's date range narrow, so date
+    # filters within a year skip most of them.
+    "CONTRIBUTION": (
+        {
+            "CONTRIBUTIONID": "int64",
+            "ALUMNIID": "int64",
+            "CAMPAIGNID": "int64",
+            "CONTRIBUTIONDATE": "date32",
+            "AMOUNT": "float64",
+        },
+        "CONTRIBUTIONDATE, CONTRIBUTIONID",
+    ),
+}
+PARTITIONED_TABLES = {"CONTRIBUTION": "YEAR"}
+
+_CURRENT = "CURRENT"
+_MANIFEST = "manifest.json"
+
+
+def _pyarrow():
+    try:
+        import pyarrow as pa
+        import pyarrow.compute as pc
+        import pyarrow.dataset as ds
+        import pyarrow.fs as pafs
+    except ImportError as exc:
+        raise RuntimeError("Parquet snapshots require the pyarrow package") from exc
+    return pa, pc, ds, pafs
+
+
+def _schema(table: str):
+    pa = _pyarrow()[0]
+    columns, _ = SNAPSHOT_TABLES[table]
+    return pa.schema([(name, getattr(pa, kind)()) for name, kind in columns.items()])
+
+
+# ---------------------------------------------
+# Export
+# ---------------------------------------------
+def _to_batch(rows: list, schema):
+    """Database rows as a record batch of ``schema``."""
+    pa, pc, _, _ = _pyarrow()
+    arrays = []
+    for field, values in zip(schema, zip(*rows)):
+        if field.type == pa.date32():
+            # Stored as ISO text; anything unparseable becomes null.
+            raw = pa.array(values)
+            if pa.types.is_string(raw.type):
+                raw = pc.strptime(raw, format="%Y-%m-%d", unit="s", error_is_null=True)
+            arrays.append(raw.cast(pa.date32()))
+        else:
+            arrays.append(pa.array(values, type=field.type))
+    return pa.RecordBatch.from_arrays(arrays, schema=schema)
+
+
+def _batches(conn, table: str, chunk_size: int):
+    """Record batches of ``table``, plus the partition column if it has one."""
+    pa, pc, _, _ = _pyarrow()
+    columns, order = SNAPSHOT_TABLES[table]
+    schema = _schema(table)
+    partition = PARTITIONED_TABLES.get(table)
+    result = conn.execution_options(stream_results=True, yield_per=chunk_size).exec_driver_sql(
+        f"SELECT {', '.join(columns)} FROM {table} ORDER BY {order}"
+    )
+    for rows in result.partitions(chunk_size):
+        batch = _to_batch(rows, schema)
+        if partition:
+            year = pc.year(batch.column("CONTRIBUTIONDATE")).cast(pa.int32())
+            batch = batch.append_column(pa.field(partition, pa.int32()), year)
+        yield batch
+
+
+def _export_table(conn, table: str, target: Path, chunk_size: int) -> int:
+    pa, _, ds, _ = _pyarrow()
+    schema = _schema(table)
+    partitioning = None
+    partition = PARTITIONED_TABLES.get(table)
+    if partition:
+        schema = schema.append(pa.field(partition, pa.int32()))
+        partitioning = ds.partitioning(pa.schema([(partition, pa.int32())]), flavor="hive")
+
+    rows = 0
+
+    def counted():
+        nonlocal rows
+        for batch in _batches(conn, table, chunk_size):
+            rows += batch.num_rows
+            yield batch
+
+    ds.write_dataset(
+        pa.RecordBatchReader.from_batches(schema, counted()),
+        target,
+        format="parquet",
+        partitioning=partitioning,
+        basename_template="part-{i}.parquet",
+        max_rows_per_group=chunk_size,
+        existing_data_behavior="error",
+    )
+    return rows
+
+
+def export_snapshot(
+    directory: Path | str | None = None,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    keep: int = DEFAULT_KEEP,
+) -> dict:
+    """
+    Write a new snapshot under ``directory`` and make it the current one.
+
+    All tables are read in one transaction, so the snapshot is consistent
+    across them. Returns the snapshot's manifest: its path, creation time,
+    row counts per table, the TABLE_VERSIONS counters it reflects and the
+    elapsed seconds.
+    """
+    root = Path(directory or SNAPSHOT_DIR)
+    root.mkdir(parents=True, exist_ok=True)
+    created = datetime.datetime.now()
+    name = created.strftime("%Y%m%dT%H%M%S%f")
+    staging = root / f".{name}.tmp"
+    started = time.perf_counter()
+    try:
+        # Empty tables write no files, so the directory may not appear otherwise.
+        staging.mkdir()
+        # Read first: a write landing before the transaction starts makes
+        # the snapshot newer than its recorded versions, never older.
+        versions = db.sync_table_versions()
+        with db.read_transaction() as conn:
+            rows = {
+                table: _export_table(conn, table, staging / table.lower(), chunk_size)
+                for table in SNAPSHOT_TABLES
+            }
+        manifest = {
+            "created": created.isoformat(timespec="seconds"),
+            "rows": rows,
+            "table_versions": {t: versions[t] for t in SNAPSHOT_TABLES if t in versions},
+            "seconds": round(time.perf_counter() - started, 3),
+        }
+        (staging / _MANIFEST).write_text(json.dumps(manifest, indent=2))
+        staging.rename(root / name)
+    except BaseException:
+        shutil.rmtree(staging, ignore_errors=True)
+        raise
+
+    # Readers resolve CURRENT once per call, so swapping it is atomic.
+    pointer = root / f".{_CURRENT}.tmp"
+    pointer.write_text(name)
+    os.replace(pointer, root / _CURRENT)
+    _prune(root, keep)
+    return {"path": str(root / name), **manifest}
+
+
+def _prune(root: Path, keep: int) -> None:
+    snapshots = sorted(
+        p for p in root.iterdir() if p.is_dir() and not p.name.startswith(".")
+    )
+    for old in snapshots[: max(0, len(snapshots) - max(keep, 1))]:
+        shutil.rmtree(old, ignore_errors=True)
+
+
+# ---------------------------------------------
+# Reading
+# ---------------------------------------------
+def current_snapshot(directory: Path | str | None = None) -> Path | None:
+    """Directory of the current snapshot, or None if none was exported."""
+    root = Path(directory or SNAPSHOT_DIR)
+    try:
+        name = (root / _CURRENT).read_text().strip()
+    except OSError:
+        return None
+    path = root / name
+    return path if name and path.is_dir() else None
+
+
+def available(directory: Path | str | None = None) -> bool:
+    """Whether reports can be served from a snapshot here."""
+    return (
+        importlib.util.find_spec("pyarrow") is not None
+        and current_snapshot(directory) is not None
+    )
+
+
+def snapshot_info(directory: Path | str | None = None) -> dict | None:
+    """Manifest of the current snapshot (see export_snapshot), or None."""
+    path = current_snapshot(directory)
+    if path is None:
+        return None
+    try:
+        manifest = json.loads((path / _MANIFEST).read_text())
+    except (OSError, ValueError):
+        return None
+    return {"path": str(path), **manifest}
+
+
+@functools.lru_cache(maxsize=16)
+def _dataset(path: str, table: str):
+    # Snapshot directories never change once published, so the file
+    # listing can be kept for the life of the process.
+    pa, _, ds, pafs = _pyarrow()
+    schema = _schema(table)
+    partition = PARTITIONED_TABLES.get(table)
+    if partition:
+        schema = schema.append(pa.field(partition, pa.int32()))
+    if not os.path.isdir(path):
+        # write_dataset writes no files for a table that was empty.
+        return ds.dataset(schema.empty_table())
+    return ds.dataset(
+        path,
+        schema=schema,
+        format="parquet",
+        filesystem=pafs.LocalFileSystem(use_mmap=True),
+        partitioning=(
+            ds.partitioning(pa.schema([(partition, pa.int32())]), flavor="hive")
+            if partition
+            else None
+        ),
+    )
+
+
+def read_table(
+    table: str,
+    columns: list[str] | None = None,
+    filter=None,
+    directory: Path | str | None = None,
+):
+    """
+    ``table`` from the current snapshot as a pyarrow Table, memory-mapped.
+
+    Only ``columns`` are read; ``filter`` (a pyarrow.compute expression)
+    prunes partitions and row groups before rows are decoded. Raises
+    FileNotFoundError when no snapshot has been exported.
+    """
+    table = table.upper()
+    if table not in SNAPSHOT_TABLES:
+        raise ValueError(f"{table!r} is not part of the snapshot")
+    path = current_snapshot(directory)
+    if path is None:
+        raise FileNotFoundError("No snapshot has been exported; run `python snapshots.py export`")
+    return _dataset(str(path / table.lower()), table).to_table(columns=columns, filter=filter)
+
+
+def _year_filter(year: int | None):
+    if year is None:
+        return None
+    pc = _pyarrow()[1]
+    return pc.field("YEAR") == int(year)
+
+
+def contribution_years(directory: Path | str | None = None) -> list[int]:
+    """Years with contributions in the snapshot, newest first."""
+    pc = _pyarrow()[1]
+    years = pc.unique(read_table("CONTRIBUTION", ["YEAR"], directory=directory)["YEAR"])
+    return sorted((y for y in years.to_pylist() if y is not None), reverse=True)
+
+
+def contribution_report(
+    year: int | None = None, directory: Path | str | None = None
+) -> pd.DataFrame:
+    """
+    The rows of db.get_all_contributions, from the snapshot and optionally
+    for one year: CONTRIBUTIONDATE (datetime), FIRSTNAME, LASTNAME,
+    CAMPAIGNNAME, AMOUNT, newest first.
+    """
+    pc = _pyarrow()[1]
+    gifts = read_table(
+        "CONTRIBUTION",
+        ["ALUMNIID", "CAMPAIGNID", "CONTRIBUTIONDATE", "AMOUNT"],
+        filter=_year_filter(year),
+        directory=directory,
+    )
+    donors = read_table(
+        "ALUMNI",
+        ["ALUMNIID", "FIRSTNAME", "LASTNAME"],
+        filter=pc.field("ALUMNIID").isin(pc.unique(gifts["ALUMNIID"])),
+        directory=directory,
+    )
+    campaigns = read_table("CAMPAIGN", ["CAMPAIGNID", "CAMPAIGNNAME"], directory=directory)
+    report = (
+        gifts.join(donors, "ALUMNIID")
+        .join(campaigns, "CAMPAIGNID")
+        .sort_by([("CONTRIBUTIONDATE", "descending")])
+        .select(["CONTRIBUTIONDATE", "FIRSTNAME", "LASTNAME", "CAMPAIGNNAME", "AMOUNT"])
+    )
+    return db.apply_dtypes(report.to_pandas(date_as_object=False))
+
+
+def campaign_totals(
+    year: int | None = None, directory: Path | str | None = None
+) -> pd.DataFrame:
+    """
+    Every campaign with what it raised, optionally in one year only:
+    CAMPAIGNID, CAMPAIGNNAME, GOALAMOUNT, STATUS, RAISED, GIFTS.
+    """
+    gifts = read_table(
+        "CONTRIBUTION", ["CAMPAIGNID", "AMOUNT"], filter=_year_filter(year), directory=directory
+    )
+    totals = gifts.group_by("CAMPAIGNID").aggregate([("AMOUNT", "sum"), ("AMOUNT", "count")])
+    totals = totals.rename_columns(["CAMPAIGNID", "RAISED", "GIFTS"])
+    campaigns = read_table("CAMPAIGN", directory=directory)
+    report = campaigns.join(totals, "CAMPAIGNID", join_type="left outer").sort_by("CAMPAIGNID")
+    df = report.to_pandas()
+    df["RAISED"] = df["RAISED"].fillna(0.0)
+    df["GIFTS"] = df["GIFTS"].fillna(0).astype("int64")
+    return db.apply_dtypes(df)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Parquet snapshots for the analytic reports")
+    parser.add_argument("command", choices=["export", "info"])
+    parser.add_argument("--dir", type=Path, default=SNAPSHOT_DIR, help="snapshot root directory")
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE)
+    parser.add_argument("--keep", type=int, default=DEFAULT_KEEP, help="snapshots to retain")
+    args = parser.parse_args()
+
+    if args.command == "export":
+        db.migrate()
+        info = export_snapshot(args.dir, args.chunk_size, args.keep)
+    else:
+        info = snapshot_info(args.dir)
+        if info is None:
+            parser.exit(1, f"No snapshot in {args.dir}\n")
+    print(f"{info['path']} (created {info['created']})")
+    for table, count in info["rows"].items():
+        print(f"  {table:<14} {count:>12,} rows")
+    if args.command == "export":
+        print(f"  exported in {info['seconds']:.1f} s")
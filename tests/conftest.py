@@ -0,0 +1,87 @@
+"""
+Shared fixtures: one generated database per test session.
+
+The database is a fresh SQLite file, or the empty database named by
+ALUMNI_DB_URL (e.g. a PostgreSQL scratch database). db.py binds its
+engine when first imported, so every test module shares this one.
+"""
+
+import itertools
+import os
+
+import pandas as pd
+import pytest
+from sqlalchemy import text
+
+from benchmarks.generate_data import generate, generate_frames
+
+ALUMNI = 400
+SEED = 7
+
+# Ids far above the generated ones, for rows a single test creates.
+_scratch_ids = itertools.count(1)
+
+
+@pytest.fixture(scope="session")
+def db(tmp_path_factory):
+    with pytest.MonkeyPatch.context() as mp:
+        if not os.environ.get("ALUMNI_DB_URL"):
+            mp.setenv("ALUMNI_DB_PATH", str(tmp_path_factory.mktemp("db") / "alumni.db"))
+        import db
+
+        db.migrate()
+        with db.engine.connect() as conn:
+            if conn.exec_driver_sql("SELECT COUNT(*) FROM ALUMNI").scalar():
+                pytest.fail(f"{db.engine.url} already holds data; use an empty scratch database")
+        generate(ALUMNI, SEED)
+        # Every call reaches the database; cache behaviour is tested separately.
+        mp.setattr(db, "QUERY_CACHE_MAX_ENTRIES", 0)
+        yield db
+
+
+@pytest.fixture(scope="session")
+def rows() -> dict:
+    """The generated rows per table, in primary-key order."""
+    chunks = {}
+    for frames in generate_frames(ALUMNI, SEED):
+        for table, frame in frames.items():
+            chunks.setdefault(table, []).append(frame)
+    return {table: pd.concat(frames, ignore_index=True) for table, frames in chunks.items()}
+
+
+@pytest.fixture
+def scratch(db):
+    """
+    A campaign and an alumni record of the test's own (``campaign_id``,
+    ``alumni_id``), removed afterwards with every gift made to or by them,
+    so write tests leave the generated rows as they found them.
+    """
+    n = next(_scratch_ids)
+    ids = {"campaign_id": 90_000 + n, "alumni_id": 9_000_000 + n}
+    with db.engine.begin() as conn:
+        conn.execute(
+            text(
+                "INSERT INTO CAMPAIGN (CAMPAIGNID, CAMPAIGNNAME, GOALAMOUNT, STATUS) "
+                "VALUES (:campaign_id, 'Scratch', 1000, 'Closed')"
+            ),
+            ids,
+        )
+        conn.execute(
+            text(
+                "INSERT INTO ALUMNI (ALUMNIID, FIRSTNAME, LASTNAME, PRIMARYEMAIL, MAILING_LIST) "
+                "VALUES (:alumni_id, 'Scratch', 'Alumnus', 'scratch@example.edu', 'Yes')"
+            ),
+            ids,
+        )
+    yield ids
+    with db.engine.begin() as conn:
+        conn.execute(
+            text(
+                "DELETE FROM CONTRIBUTION "
+                "WHERE CAMPAIGNID = :campaign_id OR ALUMNIID = :alumni_id"
+            ),
+            ids,
+        )
+        conn.execute(text("DELETE FROM ALUMNI WHERE ALUMNIID = :alumni_id"), ids)
+        conn.execute(text("DELETE FROM CAMPAIGN WHERE CAMPAIGNID = :campaign_id"), ids)
+    db.clear_query_cache()
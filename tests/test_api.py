@@ -0,0 +1,81 @@
+"""The JSON API, served from a background thread on the test database."""
+
+import base64
+import json
+import threading
+import urllib.error
+import urllib.request
+from http.server import ThreadingHTTPServer
+
+import pytest
+
+
+@pytest.fixture(scope="module")
+def base_url(db):
+    import api
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), api.ApiHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+    server.server_close()
+
+
+def _get(url: str, headers: dict | None = None) -> tuple[int, dict]:
+    request = urllib.request.Request(url, headers=headers or {})
+    try:
+        with urllib.request.urlopen(request) as response:
+            return response.status, json.load(response)
+    except urllib.error.HTTPError as exc:
+        return exc.code, json.load(exc)
+
+
+def _cursor(payload) -> str:
+    return base64.urlsafe_b64encode(json.dumps(payload).encode()).decode()
+
+
+def test_alumni_pages_follow_the_cursor(base_url, rows):
+    expected = rows["ALUMNI"]["ALUMNIID"].tolist()
+    status, first = _get(f"{base_url}/alumni?limit=3")
+    assert status == 200
+    assert [item["ALUMNIID"] for item in first["items"]] == expected[:3]
+    assert "PRIMARYEMAIL" not in first["items"][0]
+
+    status, second = _get(f"{base_url}/alumni?limit=3&cursor={first['next_cursor']}")
+    assert [item["ALUMNIID"] for item in second["items"]] == expected[3:6]
+
+
+@pytest.mark.parametrize(
+    "cursor",
+    [
+        _cursor({"after": 1e400}),
+        _cursor({"after": 1.5}),
+        _cursor({"after": True}),
+        _cursor({"after": "12"}),
+        _cursor({"after": 2**63}),
+        _cursor({"before": 1}),
+        _cursor([1]),
+        "not-base64!",
+    ],
+)
+def test_invalid_cursor_is_rejected(base_url, cursor):
+    status, body = _get(f"{base_url}/alumni?cursor={cursor}")
+    assert (status, body) == (400, {"error": "invalid cursor"})
+
+
+def test_out_of_range_ids(base_url):
+    assert _get(f"{base_url}/alumni/{2**63}")[0] == 404
+    assert _get(f"{base_url}/alumni?grad_year={2**63}")[0] == 400
+    assert _get(f"{base_url}/alumni?limit=many")[0] == 400
+
+
+def test_token_guards_every_route(base_url, monkeypatch):
+    import api
+
+    monkeypatch.setattr(api, "API_TOKEN", "s3cret")
+    assert _get(f"{base_url}/stats")[0] == 401
+    assert _get(f"{base_url}/stats", {"Authorization": "Bearer wrong"})[0] == 401
+    status, body = _get(f"{base_url}/alumni?limit=1", {"Authorization": "Bearer s3cret"})
+    assert status == 200
+    assert "PRIMARYEMAIL" in body["items"][0]
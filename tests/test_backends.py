@@ -0,0 +1,255 @@
+"""
+Helper results on a generated database, checked against the generated rows.
+
+Every expectation is computed in pandas from benchmarks.generate_data's
+frames, never from the database, so a backend that stores, types or
+names anything differently fails here. Runs on a fresh SQLite file by
+default; point ALUMNI_DB_URL at an empty scratch database to run the
+same assertions on PostgreSQL (see conftest.py):
+
+    python -m pytest tests
+    createdb alumni_test
+    ALUMNI_DB_URL=postgresql+psycopg2:///alumni_test python -m pytest tests
+
+Write tests only touch rows of their own (the ``scratch`` fixture), so
+the tests pass in any order.
+"""
+
+import datetime
+import re
+
+import pandas as pd
+import pytest
+
+from conftest import ALUMNI
+
+
+def _starts_word(series: pd.Series, term: str) -> pd.Series:
+    """Whether ``term`` starts a word of each value, case-insensitively."""
+    pattern = rf"(?<![^\W_]){re.escape(term)}"
+    return series.str.lower().str.contains(pattern, regex=True).fillna(False)
+
+
+@pytest.fixture(params=["fts", "like"])
+def matching(request, db, monkeypatch):
+    """Run a test with FTS5 (where the database has it) and with LIKE."""
+    if request.param == "fts" and not db._has_search_index():
+        pytest.skip("no full-text index on this database")
+    if request.param == "like":
+        monkeypatch.setattr(db, "_search_index_available", False)
+    return request.param
+
+
+def test_schema_is_current(db):
+    assert db.get_schema_version() == db.LATEST_SCHEMA_VERSION
+
+
+def test_alumni_page_filters_and_keyset(db, rows, matching):
+    alumni = rows["ALUMNI"]
+    hit = (
+        _starts_word(alumni["FIRSTNAME"], "jo") | _starts_word(alumni["LASTNAME"], "jo")
+    ) & _starts_word(alumni["GRAD_MAJOR"], "ma")
+    expected = alumni.loc[hit, "ALUMNIID"].tolist()
+
+    page, total = db.get_alumni_page(name="jo", major="ma", page_size=5)
+    assert total == len(expected)
+    assert list(page.columns) == db.DIRECTORY_COLUMNS
+    assert page["ALUMNIID"].tolist() == expected[:5]
+    assert str(page["ALUMNIID"].dtype) == "int32"
+
+    after = int(page["ALUMNIID"].iloc[-1])
+    page, total = db.get_alumni_page(name="jo", major="ma", after_id=after, page_size=5)
+    assert total == len(expected)
+    assert page["ALUMNIID"].tolist() == expected[5:10]
+
+
+@pytest.mark.parametrize(
+    "name, major",
+    [("son", None), (None, "nance"), ("john", "fin"), ("o'", None), ("ann smi", None)],
+)
+def test_filters_match_word_prefixes(db, rows, matching, name, major):
+    """Both backends match word prefixes, never the middle of a word."""
+    alumni = rows["ALUMNI"]
+    hit = pd.Series(True, index=alumni.index)
+    for word in re.findall(r"\w+", (name or "").lower()):
+        hit &= _starts_word(alumni["FIRSTNAME"], word) | _starts_word(alumni["LASTNAME"], word)
+    for word in re.findall(r"\w+", (major or "").lower()):
+        hit &= _starts_word(alumni["GRAD_MAJOR"], word)
+    page, total = db.get_alumni_page(name=name, major=major, page_size=ALUMNI)
+    assert total == int(hit.sum())
+    assert page["ALUMNIID"].tolist() == alumni.loc[hit, "ALUMNIID"].tolist()
+
+
+def test_alumni_page_by_year(db, rows):
+    alumni = rows["ALUMNI"]
+    year = int(alumni["ALUM_GRADYEAR"].iloc[0])
+    page, total = db.get_alumni_page(grad_year=year, page_size=ALUMNI)
+    assert total == int((alumni["ALUM_GRADYEAR"] == year).sum())
+    assert page["ALUMNIID"].tolist() == alumni.loc[alumni["ALUM_GRADYEAR"] == year, "ALUMNIID"].tolist()
+
+
+def test_search_alumni(db, rows):
+    alumni = rows["ALUMNI"]
+    expected = set(alumni.loc[alumni["LASTNAME"] == "Smith", "ALUMNIID"])
+    found = db.search_alumni("smith", limit=ALUMNI)
+    assert set(found["ALUMNIID"]) == expected
+
+
+def test_grad_years(db, rows):
+    assert db.get_alumni_grad_years() == sorted(rows["ALUMNI"]["ALUM_GRADYEAR"].unique().tolist())
+
+
+def test_mailing_list(db, rows, matching):
+    alumni = rows["ALUMNI"]
+    hit = _starts_word(alumni["GRAD_MAJOR"], "market") & (alumni["MAILING_LIST"] == "Yes")
+    preview, total = db.get_mailing_list_preview(major="market", limit=10)
+    assert total == int(hit.sum())
+    assert preview["PRIMARYEMAIL"].tolist() == alumni.loc[hit, "PRIMARYEMAIL"].tolist()[:10]
+    assert preview["MAILING_LIST"].all()
+
+    csv = b"".join(db.iter_mailing_list_csv(major="market", chunk_size=7)).decode()
+    lines = csv.splitlines()
+    assert lines[0] == ",".join(db.MAILING_LIST_COLUMNS)
+    assert len(lines) == total + 1
+
+
+def test_profile(db, rows):
+    alumni_id = int(rows["CONTRIBUTION"]["ALUMNIID"].iloc[0])
+    profile = db.load_alumni_profile(alumni_id)
+    record = rows["ALUMNI"].set_index("ALUMNIID").loc[alumni_id]
+    assert profile["alumni"]["PRIMARYEMAIL"].tolist() == [record["PRIMARYEMAIL"]]
+    for key, table in (
+        ("degrees", "DEGREE"),
+        ("employment", "EMPLOYMENT"),
+        ("memberships", "ALUMNI_MEMBERSHIP"),
+        ("contributions", "CONTRIBUTION"),
+    ):
+        expected = rows[table][rows[table]["ALUMNIID"] == alumni_id]
+        assert len(profile[key]) == len(expected), key
+    gifts = rows["CONTRIBUTION"][rows["CONTRIBUTION"]["ALUMNIID"] == alumni_id]
+    assert profile["contributions"]["AMOUNT"].sum() == pytest.approx(gifts["AMOUNT"].sum())
+
+    assert db.load_alumni_profile(1)["alumni"].empty
+
+
+def test_campaigns(db, rows):
+    campaigns = db.get_campaigns().sort_values("CAMPAIGNID")
+    expected = rows["CAMPAIGN"]
+    assert campaigns["CAMPAIGNID"].tolist() == expected["CAMPAIGNID"].tolist()
+    assert campaigns["GOALAMOUNT"].tolist() == expected["GOALAMOUNT"].tolist()
+    assert campaigns["STATUS"].astype(str).tolist() == expected["STATUS"].tolist()
+
+
+def _campaign_expectations(rows) -> pd.DataFrame:
+    gifts = rows["CONTRIBUTION"].groupby("CAMPAIGNID")
+    return pd.DataFrame({
+        "RAISED": gifts["AMOUNT"].sum(),
+        "DONORS": gifts["ALUMNIID"].nunique(),
+        "GIFTS": gifts.size(),
+        "LAST_GIFT_DATE": pd.to_datetime(gifts["CONTRIBUTIONDATE"].max()),
+    }).reindex(rows["CAMPAIGN"]["CAMPAIGNID"])
+
+
+def test_campaign_progress(db, rows):
+    progress = db.get_campaign_progress().set_index("CAMPAIGNID")
+    expected = _campaign_expectations(rows)
+    assert progress.index.tolist() == expected.index.tolist()
+    assert progress["RAISED"].tolist() == pytest.approx(expected["RAISED"].fillna(0).tolist())
+    assert progress["DONORS"].tolist() == expected["DONORS"].fillna(0).astype(int).tolist()
+    assert progress["GIFTS"].tolist() == expected["GIFTS"].fillna(0).astype(int).tolist()
+    assert progress["LAST_GIFT_DATE"].tolist() == expected["LAST_GIFT_DATE"].tolist()
+    goal = rows["CAMPAIGN"].set_index("CAMPAIGNID")["GOALAMOUNT"]
+    assert progress["PERCENT_OF_GOAL"].tolist() == pytest.approx(
+        (100 * expected["RAISED"].fillna(0) / goal).tolist()
+    )
+
+
+def test_contributions_and_trend(db, rows):
+    gifts = rows["CONTRIBUTION"]
+    report = db.get_all_contributions()
+    assert len(report) == len(gifts)
+    assert report["AMOUNT"].sum() == pytest.approx(gifts["AMOUNT"].sum())
+    assert report["CONTRIBUTIONDATE"].is_monotonic_decreasing
+
+    months = gifts.assign(PERIOD=gifts["CONTRIBUTIONDATE"].str[:7]).groupby("PERIOD")
+    trend = db.get_contribution_trend("monthly")
+    assert trend["PERIOD"].dt.strftime("%Y-%m").tolist() == list(months.groups)
+    assert trend["AMOUNT"].tolist() == pytest.approx(months["AMOUNT"].sum().tolist())
+    assert trend["GIFTS"].tolist() == months.size().tolist()
+
+
+def test_employer_summary(db, rows):
+    expected = rows["EMPLOYMENT"].groupby(["EMPLOYERNAME", "INDUSTRY"])["ALUMNIID"].nunique()
+    summary = db.get_employer_summary()
+    found = summary.set_index(["EMPLOYERNAME", "INDUSTRY"])["NUM_ALUMNI"]
+    found.index = found.index.set_levels([level.astype(str) for level in found.index.levels])
+    assert found.sort_index().to_dict() == expected.sort_index().to_dict()
+    assert summary["NUM_ALUMNI"].is_monotonic_decreasing
+
+
+def test_summary_stats(db, rows):
+    assert db.get_summary_stats() == {
+        "total_alumni": len(rows["ALUMNI"]),
+        "total_employers": rows["EMPLOYMENT"]["EMPLOYERNAME"].nunique(),
+        "total_campaigns": int((rows["CAMPAIGN"]["STATUS"] == "Active").sum()),
+        "total_contributions": pytest.approx(rows["CONTRIBUTION"]["AMOUNT"].sum()),
+    }
+
+
+def test_create_contribution_assigns_ids_and_updates_counters(db, rows, scratch):
+    alumni_id, campaign_id = scratch["alumni_id"], scratch["campaign_id"]
+    stats = db.get_summary_stats()
+
+    today = datetime.date.today().isoformat()
+    key = f"test-{campaign_id}"
+    new_id = db.create_contribution(alumni_id, campaign_id, 12.5, today, key)
+    assert new_id > int(rows["CONTRIBUTION"]["CONTRIBUTIONID"].max())
+    assert db.create_contribution(alumni_id, campaign_id, 12.5, today, key) == new_id
+    with pytest.raises(db.IdempotencyConflict):
+        db.create_contribution(alumni_id, campaign_id, 125.0, today, key)
+    db.create_contribution(alumni_id, campaign_id, 7.5, today)
+
+    progress = db.get_campaign_progress().set_index("CAMPAIGNID").loc[campaign_id]
+    assert progress["RAISED"] == pytest.approx(20.0)
+    assert (progress["GIFTS"], progress["DONORS"]) == (2, 1)
+    assert progress["PERCENT_OF_GOAL"] == pytest.approx(2.0)
+    assert progress["LAST_GIFT_DATE"] == pd.Timestamp(today)
+    assert db.get_summary_stats()["total_contributions"] == pytest.approx(
+        stats["total_contributions"] + 20.0
+    )
+
+
+def test_update_contact(db, scratch):
+    alumni_id = scratch["alumni_id"]
+    db.update_alumni_contact(alumni_id, "new@example.edu", "202-555-9999", "No")
+    record = db.get_alumni_by_id(alumni_id).iloc[0]
+    assert record["PRIMARYEMAIL"] == "new@example.edu"
+    assert not record["MAILING_LIST"]
+
+
+def test_import_upserts(db, scratch, tmp_path):
+    import importer
+
+    existing = scratch["alumni_id"]
+    added = existing + 100_000
+    path = tmp_path / "alumni.csv"
+    path.write_text(
+        "ALUMNIID,FIRSTNAME,LASTNAME,PRIMARYEMAIL,MAILING_LIST\n"
+        f"{existing},Ada,Lovelace,ada@example.edu,n\n"
+        f"{added},Grace,Hopper,grace@example.edu,Y\n"
+        f"{added + 1},Alan,Turing,alan@example.edu,maybe\n"
+    )
+    total = db.get_summary_stats()["total_alumni"]
+    try:
+        result = importer.import_file("ALUMNI", path)
+        assert (result["rows_written"], result["rows_rejected"]) == (2, 1)
+
+        updated = db.get_alumni_by_id(existing).iloc[0]
+        assert (updated["FIRSTNAME"], bool(updated["MAILING_LIST"])) == ("Ada", False)
+        record = db.get_alumni_by_id(added).iloc[0]
+        assert (record["LASTNAME"], bool(record["MAILING_LIST"])) == ("Hopper", True)
+        assert db.get_alumni_by_id(added + 1).empty
+        assert db.get_summary_stats()["total_alumni"] == total + 1
+    finally:
+        with db.engine.begin() as conn:
+            conn.exec_driver_sql(f"DELETE FROM ALUMNI WHERE ALUMNIID = {added}")
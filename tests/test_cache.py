@@ -0,0 +1,42 @@
+"""The query cache shared by db.py's read helpers."""
+
+import pytest
+
+
+@pytest.fixture
+def cache(db, monkeypatch):
+    monkeypatch.setattr(db, "QUERY_CACHE_MAX_ENTRIES", 100)
+    db.clear_query_cache()
+    yield db
+    db.clear_query_cache()
+
+
+def test_call_spellings_share_an_entry(cache):
+    db = cache
+    page, total = db.get_alumni_page(major="fin", page_size=10)
+    before = db.get_query_cache_stats()
+
+    for call in (
+        lambda: db.get_alumni_page(None, "fin", None, None, 10),
+        lambda: db.get_alumni_page(name=None, major="fin", page_size=10, after_id=None),
+        lambda: db.get_alumni_page(None, major="fin", grad_year=None, page_size=10),
+    ):
+        hit_page, hit_total = call()
+        assert hit_total == total
+        assert hit_page.equals(page)
+    assert db.get_alumni_page.cached(None, "fin", None, None, 10)[0]
+
+    after = db.get_query_cache_stats()
+    assert (after["hits"] - before["hits"], after["misses"] - before["misses"]) == (4, 0)
+    assert after["entries"] == before["entries"]
+
+
+def test_writes_invalidate(cache, scratch):
+    db = cache
+    stats = db.get_summary_stats()
+    assert db.get_summary_stats.cached()[0]
+    db.create_contribution(scratch["alumni_id"], scratch["campaign_id"], 5.0, "2024-01-02")
+    assert not db.get_summary_stats.cached()[0]
+    assert db.get_summary_stats()["total_contributions"] == pytest.approx(
+        stats["total_contributions"] + 5.0
+    )
@@ -0,0 +1,58 @@
+"""Type coercion and upserts in importer.py."""
+
+import pandas as pd
+
+
+def _alumni(**columns) -> pd.DataFrame:
+    n = len(next(iter(columns.values())))
+    base = {
+        "ALUMNIID": [str(i + 1) for i in range(n)],
+        "FIRSTNAME": ["Ada"] * n,
+        "LASTNAME": ["Lovelace"] * n,
+        "PRIMARYEMAIL": ["ada@example.edu"] * n,
+    }
+    return pd.DataFrame({**base, **columns})
+
+
+def test_unconvertible_integers_become_null(db):
+    import importer
+
+    chunk = _alumni(ALUM_GRADYEAR=["1e30", "12.7", "2001", "13.0", "", None, "soon"])
+    clean, rejected, nulled = importer.coerce_chunk("ALUMNI", chunk)
+    assert rejected == 0
+    assert nulled == 3
+    assert clean["ALUM_GRADYEAR"].tolist() == [pd.NA, pd.NA, 2001, 13, pd.NA, pd.NA, pd.NA]
+
+
+def test_out_of_range_primary_key_is_rejected(db):
+    import importer
+
+    chunk = _alumni(ALUMNIID=["1", "99999999999999999999", str(2**63 - 1), "-1e19"])
+    clean, rejected, nulled = importer.coerce_chunk("ALUMNI", chunk)
+    assert clean["ALUMNIID"].tolist() == [1, 2**63 - 1]
+    assert (rejected, nulled) == (2, 2)
+
+
+def test_numeric_input_keeps_its_values(db):
+    import importer
+
+    chunk = _alumni(ALUMNIID=[1, 2**62], ALUM_GRADYEAR=[1.5, 2000.0])
+    clean, rejected, nulled = importer.coerce_chunk("ALUMNI", chunk)
+    assert clean["ALUMNIID"].tolist() == [1, 2**62]
+    assert clean["ALUM_GRADYEAR"].tolist() == [pd.NA, 2000]
+    assert (rejected, nulled) == (0, 1)
+
+
+def test_import_counts_unconvertible_values(db, scratch, tmp_path):
+    import importer
+
+    existing = scratch["alumni_id"]
+    path = tmp_path / "alumni.csv"
+    path.write_text(
+        "ALUMNIID,FIRSTNAME,LASTNAME,PRIMARYEMAIL,ALUM_GRADYEAR\n"
+        f"{existing},Ada,Lovelace,ada@example.edu,1e30\n"
+        "12345678901234567890123,Grace,Hopper,grace@example.edu,1990\n"
+    )
+    result = importer.import_file("ALUMNI", path)
+    assert (result["rows_written"], result["rows_rejected"], result["values_nulled"]) == (1, 1, 2)
+    assert pd.isna(db.get_alumni_by_id(existing).iloc[0]["ALUM_GRADYEAR"])
@@ -0,0 +1,85 @@
+"""Upgrading a database created by the first schema version."""
+
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+from benchmarks.generate_data import generate_frames
+from conftest import SEED
+
+ROOT = Path(__file__).resolve().parent.parent
+
+# Creates a version 1 database holding generated rows, then migrates it
+# to the latest version and prints what the helpers report.
+UPGRADE = """
+import json
+from sqlalchemy import inspect
+import db
+from benchmarks.generate_data import _insert, generate_frames
+
+latest = db.MIGRATIONS
+db.MIGRATIONS = latest[:1]
+assert db.migrate() == 1
+with db.engine.begin() as conn:
+    for frames in generate_frames({alumni}, {seed}):
+        for table, frame in frames.items():
+            columns = {{c["name"].upper() for c in inspect(conn).get_columns(table)}}
+            _insert(conn, table, frame[[c for c in frame.columns if c in columns]])
+
+db.MIGRATIONS = latest
+db._search_index_available = None
+version = db.migrate()
+progress = db.get_campaign_progress()
+print(json.dumps({{
+    "version": version,
+    "stats": db.get_summary_stats(),
+    "raised": progress["RAISED"].tolist(),
+    "donors": progress["DONORS"].tolist(),
+    "campaigns": progress["CAMPAIGNID"].tolist(),
+    "months": len(db.get_contribution_trend("monthly")),
+    "search": len(db.search_alumni("smith", limit=1000)),
+}}))
+"""
+
+
+@pytest.fixture(scope="module")
+def upgraded(tmp_path_factory) -> dict:
+    env = dict(os.environ, ALUMNI_DB_PATH=str(tmp_path_factory.mktemp("v1") / "v1.db"))
+    env.pop("ALUMNI_DB_URL", None)
+    result = subprocess.run(
+        [sys.executable, "-c", UPGRADE.format(alumni=100, seed=SEED)],
+        cwd=ROOT,
+        env=env,
+        check=True,
+        capture_output=True,
+        text=True,
+    )
+    return json.loads(result.stdout.splitlines()[-1])
+
+
+def test_upgrade_reaches_the_latest_version(db, upgraded):
+    assert upgraded["version"] == db.LATEST_SCHEMA_VERSION
+
+
+def test_upgrade_backfills_counters_and_indexes(upgraded):
+    frames = list(generate_frames(100, SEED))
+    alumni = pd.concat(f["ALUMNI"] for f in frames if "ALUMNI" in f)
+    gifts = pd.concat(f["CONTRIBUTION"] for f in frames if "CONTRIBUTION" in f)
+    campaigns = pd.concat(f["CAMPAIGN"] for f in frames if "CAMPAIGN" in f)
+
+    by_campaign = gifts.groupby("CAMPAIGNID")
+    raised = by_campaign["AMOUNT"].sum().reindex(upgraded["campaigns"]).fillna(0)
+    donors = by_campaign["ALUMNIID"].nunique().reindex(upgraded["campaigns"]).fillna(0)
+
+    assert upgraded["campaigns"] == sorted(campaigns["CAMPAIGNID"].tolist())
+    assert upgraded["raised"] == pytest.approx(raised.tolist())
+    assert upgraded["donors"] == donors.astype(int).tolist()
+    assert upgraded["stats"]["total_alumni"] == len(alumni)
+    assert upgraded["stats"]["total_contributions"] == pytest.approx(gifts["AMOUNT"].sum())
+    assert upgraded["months"] == gifts["CONTRIBUTIONDATE"].str[:7].nunique()
+    assert upgraded["search"] == int((alumni["LASTNAME"] == "Smith").sum())
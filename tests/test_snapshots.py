@@ -0,0 +1,61 @@
+"""Parquet snapshot export and the report readers."""
+
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+pytest.importorskip("pyarrow")
+
+ROOT = Path(__file__).resolve().parent.parent
+
+
+@pytest.fixture(scope="module")
+def snapshot(db, tmp_path_factory):
+    import snapshots
+
+    directory = tmp_path_factory.mktemp("snapshots")
+    snapshots.export_snapshot(directory)
+    return directory
+
+
+def test_reports_match_the_database(db, rows, snapshot):
+    import snapshots
+
+    gifts = rows["CONTRIBUTION"]
+    report = snapshots.contribution_report(directory=snapshot)
+    assert len(report) == len(gifts)
+    assert report["AMOUNT"].sum() == pytest.approx(gifts["AMOUNT"].sum())
+
+    years = sorted({int(d[:4]) for d in gifts["CONTRIBUTIONDATE"]}, reverse=True)
+    assert snapshots.contribution_years(directory=snapshot) == years
+
+    totals = snapshots.campaign_totals(years[0], directory=snapshot).set_index("CAMPAIGNID")
+    in_year = gifts[gifts["CONTRIBUTIONDATE"].str.startswith(str(years[0]))]
+    expected = in_year.groupby("CAMPAIGNID")["AMOUNT"].sum()
+    assert totals["RAISED"].sum() == pytest.approx(expected.sum())
+    assert len(totals) == len(rows["CAMPAIGN"])
+
+
+def test_empty_tables(db, tmp_path):
+    """A snapshot of a fresh install has no files for its empty tables."""
+    import snapshots
+
+    env = dict(os.environ, ALUMNI_DB_PATH=str(tmp_path / "empty.db"))
+    env.pop("ALUMNI_DB_URL", None)
+    directory = tmp_path / "snapshots"
+    subprocess.run(
+        [sys.executable, "snapshots.py", "export", "--dir", str(directory)],
+        cwd=ROOT,
+        env=env,
+        check=True,
+        capture_output=True,
+    )
+
+    assert snapshots.snapshot_info(directory)["rows"]["CONTRIBUTION"] == 0
+    assert snapshots.contribution_years(directory=directory) == []
+    assert snapshots.contribution_report(directory=directory).empty
+    assert snapshots.contribution_report(2024, directory=directory).empty
+    assert snapshots.campaign_totals(directory=directory).empty
@@ -0,0 +1,41 @@
+"""TrigramIndex against pandas substring matching, and the typeahead."""
+
+import pandas as pd
+import pytest
+
+from trigram import TrigramIndex
+
+VALUES = pd.Series(
+    ["Johnson", "Jo", None, "Ann-Marie", "JOHANSSON", "Søren", "", "Mason", "johnson", "Zoë"]
+)
+
+
+@pytest.mark.parametrize("term", ["", "j", "jo", "son", "SON", "ohns", "n-m", "ør", "zoë", "xyz"])
+def test_match_is_casefolded_contains(term):
+    expected = VALUES.fillna("").str.casefold().str.contains(term.casefold(), regex=False)
+    assert TrigramIndex(VALUES).match(term).tolist() == expected.tolist()
+
+
+def test_empty_column():
+    index = TrigramIndex(pd.Series([], dtype="str"))
+    assert len(index) == 0
+    assert index.match("son").tolist() == []
+    assert index.match("").tolist() == []
+
+
+def test_suggest_alumni(db, rows):
+    alumni = rows["ALUMNI"]
+    ids = alumni["ALUMNIID"].tolist()
+    full = (alumni["FIRSTNAME"] + " " + alumni["LASTNAME"]).str.casefold()
+
+    assert db.suggest_alumni("", 5) == ids[:5]
+    assert db.suggest_alumni(str(ids[3]), 5)[0] == ids[3]
+
+    first = alumni["FIRSTNAME"].iloc[0]
+    found = db.suggest_alumni(first, len(ids))
+    hits = full.str.contains(first.casefold(), regex=False)
+    assert sorted(found) == sorted(alumni.loc[hits, "ALUMNIID"].tolist())
+    starts = full.str.startswith(first.casefold())
+    assert set(found[: int(starts.sum())]) == set(alumni.loc[starts, "ALUMNIID"])
+
+    assert db.alumni_names()[ids[0]] == f"{alumni['FIRSTNAME'].iloc[0]} {alumni['LASTNAME'].iloc[0]}"
@@ -0,0 +1,98 @@
+"""
+Casefolded trigram index for substring filters over in-memory columns.
+
+Built once per data version over a column's distinct values: every value
+is cut into overlapping three-character windows, and each trigram keeps a
+sorted NumPy array of the values containing it (its posting list). A
+substring query intersects the posting lists of its own trigrams,
+confirms the few surviving values with an exact check and maps them to
+rows through the column's value codes, so no row is rescanned per query.
+Terms shorter than three characters scan the distinct values instead,
+which are still far fewer than the rows.
+
+    index = TrigramIndex(frame["LASTNAME"])
+    mask = index.match("son")  # same as .str.casefold().str.contains("son")
+"""
+
+import numpy as np
+import pandas as pd
+
+# Unicode code points fit in 21 bits, so a trigram packs into one uint64.
+_BITS = 21
+
+
+def _pack(chars: np.ndarray) -> np.ndarray:
+    """Trigram keys of every window of a (values, width) code point array."""
+    chars = chars.astype(np.uint64)
+    return (chars[:, :-2] << 2 * _BITS) | (chars[:, 1:-1] << _BITS) | chars[:, 2:]
+
+
+class TrigramIndex:
+    """Substring lookups over one column; see the module docstring."""
+
+    def __init__(self, values: pd.Series) -> None:
+        folded = values.astype("string").fillna("").str.casefold()
+        codes, uniques = pd.factorize(folded)
+        self._codes = codes.astype(np.int32)
+        self._values = pd.Series(uniques, dtype="str")
+
+        lengths = self._values.str.len()
+        width = max(3, int(lengths.max())) if len(lengths) else 3
+        chars = (
+            np.array(self._values.tolist(), dtype=f"<U{width}")
+            .view(np.uint32)
+            .reshape(len(self._values), width)
+        )
+        keys = _pack(chars)
+        # Windows running into the NUL padding are past the value's end.
+        inside = chars[:, 2:] != 0
+        value_ids = np.broadcast_to(
+            np.arange(len(self._values), dtype=np.int32)[:, None], keys.shape
+        )[inside]
+        keys = keys[inside]
+
+        order = np.lexsort((value_ids, keys))
+        keys, value_ids = keys[order], value_ids[order]
+        first = np.ones(len(keys), dtype=bool)
+        first[1:] = (keys[1:] != keys[:-1]) | (value_ids[1:] != value_ids[:-1])
+        keys, value_ids = keys[first], value_ids[first]
+
+        self._keys, starts = np.unique(keys, return_index=True)
+        self._offsets = np.append(starts, len(keys))
+        self._postings = value_ids
+
+    def __len__(self) -> int:
+        return len(self._codes)
+
+    def _posting(self, key: np.uint64) -> np.ndarray:
+        i = np.searchsorted(self._keys, key)
+        if i == len(self._keys) or self._keys[i] != key:
+            return self._postings[:0]
+        return self._postings[self._offsets[i] : self._offsets[i + 1]]
+
+    def matching_values(self, term: str) -> np.ndarray:
+        """Ids of the distinct values containing ``term`` (casefolded)."""
+        term = term.casefold()
+        if len(term) < 3:
+            candidates = np.arange(len(self._values))
+        else:
+            chars = np.array([term], dtype=f"<U{len(term)}").view(np.uint32)
+            postings = sorted(
+                (self._posting(key) for key in np.unique(_pack(chars.reshape(1, -1)))),
+                key=len,
+            )
+            candidates = postings[0]
+            for posting in postings[1:]:
+                if not len(candidates):
+                    break
+                candidates = np.intersect1d(candidates, posting, assume_unique=True)
+            if len(term) == 3:
+                return candidates
+        found = self._values.iloc[candidates].str.contains(term, regex=False).to_numpy()
+        return candidates[found]
+
+    def match(self, term: str) -> np.ndarray:
+        """Boolean row mask of the rows whose value contains ``term``."""
+        hit = np.zeros(len(self._values), dtype=bool)
+        hit[self.matching_values(term)] = True
+        return hit[self._codes]